@@ -0,0 +1,104 @@
+"""
+Benchmark of `Codecs.decode` on a synthetic KWIC-like frame, vectorized lookup vs per-row `apply`.
+
+    python -m benchmarks.bench_codecs --n_rows 1000000
+"""
+
+from __future__ import annotations
+
+import timeit
+
+import click
+import numpy as np
+import pandas as pd
+
+from swedeb_demo.api.westac.riksprot.parlaclarin import codecs as md
+
+
+def create_codecs(n_persons: int) -> md.PersonCodecs:
+    person_codecs: md.PersonCodecs = md.PersonCodecs()
+    person_codecs.gender = pd.DataFrame(
+        {"gender": ["unknown", "man", "woman"]},
+        index=pd.Index([0, 1, 2], name="gender_id"),
+    )
+    person_codecs.party = pd.DataFrame(
+        {"party_abbrev": ["?"] + [f"P{i}" for i in range(1, 30)]},
+        index=pd.Index(range(30), name="party_id"),
+    )
+    person_codecs.office_type = pd.DataFrame(
+        {"office": ["unknown", "Ledamot", "Minister"]},
+        index=pd.Index([0, 1, 2], name="office_type_id"),
+    )
+    person_codecs.sub_office_type = pd.DataFrame(
+        {"description": ["unknown"]}, index=pd.Index([0], name="sub_office_type_id")
+    )
+    person_codecs.persons_of_interest = pd.DataFrame(
+        {
+            "pid": range(n_persons + 1),
+            "name": [f"Person {i}" for i in range(n_persons)] + [""],
+        },
+        index=pd.Index(
+            [f"Q{i}" for i in range(n_persons)] + ["unknown"], name="person_id"
+        ),
+    )
+    return person_codecs
+
+
+def create_frame(n_rows: int, n_persons: int) -> pd.DataFrame:
+    rng: np.random.Generator = np.random.default_rng(42)
+    return pd.DataFrame(
+        {
+            "person_id": np.array([f"Q{i}" for i in range(n_persons)], dtype=object)[
+                rng.integers(0, n_persons, n_rows)
+            ],
+            "gender_id": rng.integers(0, 3, n_rows),
+            "party_id": rng.integers(0, 30, n_rows),
+        }
+    )
+
+
+def decode_with_apply(person_codecs: md.PersonCodecs, df: pd.DataFrame) -> pd.DataFrame:
+    """The previous implementation (one Python call per row and codec)"""
+    for codec in person_codecs.decoders:
+        if codec.from_column in df.columns and codec.to_column not in df:
+            df[codec.to_column] = df[codec.from_column].apply(codec.fx)
+    return df
+
+
+@click.command()
+@click.option("--n_rows", default=1_000_000, help="Number of rows in frame")
+@click.option("--n_persons", default=20_000, help="Number of distinct speakers")
+@click.option("--repeat", default=3, help="Number of timed runs (best is reported)")
+def main(n_rows: int, n_persons: int, repeat: int) -> None:
+    person_codecs: md.PersonCodecs = create_codecs(n_persons)
+    df: pd.DataFrame = create_frame(n_rows, n_persons)
+
+    vectorized: pd.DataFrame = person_codecs.decode(df.copy(), drop=False)
+    baseline: pd.DataFrame = decode_with_apply(person_codecs, df.copy())
+    for column in ["name", "gender", "party_abbrev"]:
+        assert (vectorized[column].astype(object) == baseline[column]).all(), column
+
+    timings: dict[str, float] = {
+        "apply": min(
+            timeit.repeat(
+                lambda: decode_with_apply(person_codecs, df.copy()),
+                number=1,
+                repeat=repeat,
+            )
+        ),
+        "vectorized": min(
+            timeit.repeat(
+                lambda: person_codecs.decode(df.copy(), drop=False),
+                number=1,
+                repeat=repeat,
+            )
+        ),
+    }
+    print(f"decode {n_rows} rows ({n_persons} persons)")
+    for key, elapsed in timings.items():
+        print(f"  {key:<12}{elapsed:8.3f}s")
+    print(f"  speedup     {timings['apply'] / timings['vectorized']:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,90 @@
+"""
+Benchmark of KWIC/speech list post-processing (year, decode, speaker link), vectorized vs row-wise `apply`.
+
+    python -m benchmarks.bench_kwic_display --n_rows 200000
+"""
+
+from __future__ import annotations
+
+import timeit
+
+import click
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_codecs import create_codecs
+from swedeb_demo.api.dummy_api import ADummyApi
+
+
+def create_api(n_persons: int) -> ADummyApi:
+    api: ADummyApi = ADummyApi.__new__(ADummyApi)
+    api.person_codecs = create_codecs(n_persons)
+    return api
+
+
+def create_concordance(n_rows: int, n_persons: int) -> pd.DataFrame:
+    rng: np.random.Generator = np.random.default_rng(42)
+    dates: np.ndarray = (
+        pd.date_range("1920-01-01", "2020-12-31", freq="7D").strftime("%Y-%m-%d").values
+    )
+    person_ids: np.ndarray = np.array(
+        [f"Q{i}" for i in range(n_persons)] + ["unknown"], dtype=object
+    )
+    return pd.DataFrame(
+        {
+            "person_id": person_ids[rng.integers(0, n_persons + 1, n_rows)],
+            "gender_id": rng.integers(0, 3, n_rows),
+            "party_id": rng.integers(0, 30, n_rows),
+            "speech_date": dates[rng.integers(0, len(dates), n_rows)],
+        }
+    )
+
+
+def post_process_with_apply(api: ADummyApi, data: pd.DataFrame) -> pd.DataFrame:
+    """The previous implementation (two row-wise passes)"""
+    data["year"] = data.apply(lambda x: int(x["speech_date"].split("-")[0]), axis=1)
+    data = api.person_codecs.decode(data, drop=False)
+    data["link"] = data.apply(lambda x: api.get_link(x["person_id"], x["name"]), axis=1)
+    return data
+
+
+def post_process(api: ADummyApi, data: pd.DataFrame) -> pd.DataFrame:
+    data["year"] = api.get_years(data["speech_date"])
+    return api.decode_speakers(data)
+
+
+@click.command()
+@click.option("--n_rows", default=200_000, help="Number of concordance lines")
+@click.option("--n_persons", default=20_000, help="Number of distinct speakers")
+@click.option("--repeat", default=3, help="Number of timed runs (best is reported)")
+def main(n_rows: int, n_persons: int, repeat: int) -> None:
+    api: ADummyApi = create_api(n_persons)
+    data: pd.DataFrame = create_concordance(n_rows, n_persons)
+
+    expected: pd.DataFrame = post_process_with_apply(api, data.copy())
+    result: pd.DataFrame = post_process(api, data.copy())
+    assert (expected["year"] == result["year"]).all()
+    assert (expected["link"] == result["link"].astype(object)).all()
+
+    timings: dict[str, float] = {
+        "apply": min(
+            timeit.repeat(
+                lambda: post_process_with_apply(api, data.copy()),
+                number=1,
+                repeat=repeat,
+            )
+        ),
+        "vectorized": min(
+            timeit.repeat(
+                lambda: post_process(api, data.copy()), number=1, repeat=repeat
+            )
+        ),
+    }
+    print(f"post-process {n_rows} concordance lines ({n_persons} persons)")
+    for key, elapsed in timings.items():
+        print(f"  {key:<12}{elapsed:8.3f}s")
+    print(f"  speedup     {timings['apply'] / timings['vectorized']:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
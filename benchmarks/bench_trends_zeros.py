@@ -0,0 +1,114 @@
+"""
+Benchmark of zero-filling of word trends for 1, 2 and 3 pivot keys, dense array scatter vs merge with full product.
+
+    python -m benchmarks.bench_trends_zeros --n_persons 500
+"""
+
+from __future__ import annotations
+
+import timeit
+
+import click
+import numpy as np
+import pandas as pd
+
+from swedeb_demo.api.dummy_api import ADummyApi
+
+WORDS: list[str] = ["skola", "arbete", "skatt", "försvar", "miljö"]
+PIVOT_KEYS: list[list[str]] = [
+    ["party_id"],
+    ["party_id", "gender_id"],
+    ["party_id", "gender_id", "who"],
+]
+
+
+def create_trends(n_documents: int, n_persons: int, keys: list[str]) -> pd.DataFrame:
+    """Returns word counts per (year, *keys) for synthetic speeches (speakers have fixed gender and party)"""
+    rng: np.random.Generator = np.random.default_rng(42)
+    who: np.ndarray = rng.integers(0, n_persons, n_documents)
+    documents: pd.DataFrame = pd.DataFrame(
+        {
+            "year": rng.integers(1920, 2021, n_documents).astype(np.int16),
+            "party_id": (rng.integers(1, 30, n_persons)[who]).astype(np.int8),
+            "gender_id": (rng.integers(1, 3, n_persons)[who]).astype(np.int8),
+            "who": np.array([f"Q{i}" for i in range(n_persons)], dtype=object)[who],
+        }
+    )
+    for word in WORDS:
+        documents[word] = rng.poisson(0.3, n_documents)
+    trends: pd.DataFrame = documents.groupby(["year"] + keys, as_index=False)[
+        WORDS
+    ].sum()
+    return trends[trends[WORDS].sum(axis=1) > 0].reset_index(drop=True)
+
+
+def add_zeros_with_merge(original_df: pd.DataFrame, pivot_keys: list[str]):
+    """The previous implementation (left merge on the full year x pivot values product)"""
+    product = [range(original_df["year"].min(), original_df["year"].max() + 1)]
+    for pivot_key in pivot_keys:
+        product.append(original_df[pivot_key].unique())
+    all_combos = pd.MultiIndex.from_product(product, names=["year"] + pivot_keys)
+    merged_df = pd.merge(
+        pd.DataFrame(index=all_combos).reset_index(),
+        original_df,
+        on=["year"] + pivot_keys,
+        how="left",
+    )
+    merged_df.fillna(0, inplace=True)
+    for col in merged_df.select_dtypes(include=["float"]).columns.tolist():
+        merged_df[col] = merged_df[col].astype(int)
+    return merged_df
+
+
+def assert_same_trends(
+    expected: pd.DataFrame, result: pd.DataFrame, keys: list[str]
+) -> None:
+    """Result must equal merge result for combinations that occur (other rows are all zero)"""
+    combos: pd.MultiIndex = pd.MultiIndex.from_frame(result[keys[1:]])
+    occurs: np.ndarray = pd.MultiIndex.from_frame(expected[keys[1:]]).isin(combos)
+    assert (expected.loc[~occurs, WORDS] == 0).all().all()
+    expected = expected[occurs].sort_values(keys).reset_index(drop=True)
+    result = result.sort_values(keys).reset_index(drop=True)
+    assert (expected[keys + WORDS].values == result[keys + WORDS].values).all()
+    assert all(pd.api.types.is_integer_dtype(result[word]) for word in WORDS)
+
+
+@click.command()
+@click.option("--n_documents", default=500_000, help="Number of speeches")
+@click.option("--n_persons", default=500, help="Number of distinct speakers")
+@click.option("--repeat", default=3, help="Number of timed runs (best is reported)")
+def main(n_documents: int, n_persons: int, repeat: int) -> None:
+    api: ADummyApi = ADummyApi.__new__(ADummyApi)
+    for pivot_keys in PIVOT_KEYS:
+        trends: pd.DataFrame = create_trends(n_documents, n_persons, pivot_keys)
+
+        assert_same_trends(
+            add_zeros_with_merge(trends, pivot_keys),
+            api.add_zeros_for_non_result_years(trends, pivot_keys),
+            ["year"] + pivot_keys,
+        )
+
+        timings: dict[str, float] = {
+            "merge": min(
+                timeit.repeat(
+                    lambda: add_zeros_with_merge(trends, pivot_keys),
+                    number=1,
+                    repeat=repeat,
+                )
+            ),
+            "dense": min(
+                timeit.repeat(
+                    lambda: api.add_zeros_for_non_result_years(trends, pivot_keys),
+                    number=1,
+                    repeat=repeat,
+                )
+            ),
+        }
+        print(f"zero-fill {len(trends)} trend rows, pivot keys {pivot_keys}")
+        for key, elapsed in timings.items():
+            print(f"  {key:<12}{elapsed:8.3f}s")
+        print(f"  speedup     {timings['merge'] / timings['dense']:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
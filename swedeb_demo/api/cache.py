@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, TypeVar
+
+V = TypeVar("V")
+
+
+class LRUCache(Generic[V]):
+    """Thread-safe least-recently-used cache bounded by number of items and/or total size.
+
+    Args:
+        max_items (int, optional): max number of cached items. Defaults to None (unbounded).
+        max_bytes (int, optional): max total (estimated) size of cached items. Defaults to None (unbounded).
+        sizeof (Callable[[V], int], optional): item size estimator. Defaults to `sys.getsizeof`.
+    """
+
+    def __init__(
+        self,
+        max_items: int = None,
+        max_bytes: int = None,
+        sizeof: Callable[[V], int] = None,
+    ):
+        self.max_items: int = max_items
+        self.max_bytes: int = max_bytes
+        self.sizeof: Callable[[V], int] = sizeof or sys.getsizeof
+        self.items: OrderedDict[Hashable, tuple[V, int]] = OrderedDict()
+        self.nbytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.lock: threading.RLock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.items
+
+    def get(self, key: Hashable, default: Any = None) -> V | Any:
+        with self.lock:
+            if key not in self.items:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self.items.move_to_end(key)
+            return self.items[key][0]
+
+    def put(self, key: Hashable, value: V) -> V:
+        size: int = self.sizeof(value)
+        with self.lock:
+            if key in self.items:
+                self.nbytes -= self.items.pop(key)[1]
+            self.items[key] = (value, size)
+            self.nbytes += size
+            self._evict()
+        return value
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], V]) -> V:
+        """Returns cached value for `key`, or creates (outside of lock) and caches a new value"""
+        value: V | None = self.get(key)
+        if value is None:
+            value = self.put(key, factory())
+        return value
+
+    def _evict(self) -> None:
+        """Drops least recently used items until within bounds (always keeps the latest item)"""
+        while len(self.items) > 1 and (
+            (self.max_items is not None and len(self.items) > self.max_items)
+            or (self.max_bytes is not None and self.nbytes > self.max_bytes)
+        ):
+            _, (_, size) = self.items.popitem(last=False)
+            self.nbytes -= size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self.lock:
+            self.items.clear()
+            self.nbytes = 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            items=len(self.items),
+            nbytes=self.nbytes,
+        )
@@ -1,50 +1,105 @@
 from __future__ import annotations
 
 import os
-from typing import List, Mapping, Union
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import cached_property
+from typing import IO, Callable, Iterable, Iterator, List, Mapping, TypeVar, Union
 
+import numpy as np
 import pandas as pd
 import penelope.utility as pu  # type: ignore
+import scipy.sparse as sp
 from ccc import Corpora, Corpus
 from dotenv import load_dotenv
-from penelope.common.keyness import KeynessMetric  # type: ignore
+from loguru import logger
 from penelope.corpus import VectorizedCorpus  # type: ignore
-from penelope.utility import PropertyValueMaskingOpts  # type: ignore
 
-from swedeb_demo.api.parlaclarin.trends_data import SweDebComputeOpts, SweDebTrendsData
+from swedeb_demo.api.parlaclarin.autocomplete import Autocompleter
+from swedeb_demo.api.parlaclarin.corpus_filter import CorpusFilter
+from swedeb_demo.api.parlaclarin.kwic_cache import KwicResultCache
+from swedeb_demo.api.parlaclarin.kwic_result import KwicResult
+from swedeb_demo.api.parlaclarin.postings import PostingsIndex
+from swedeb_demo.api.parlaclarin.search_query import (
+    canonical_selections,
+    freeze_selections,
+)
+from swedeb_demo.api.parlaclarin.trends_cube import TrendsCube
+from swedeb_demo.api.parlaclarin.vocabulary import VocabularyIndex
+from swedeb_demo.api.parlaclarin.word_vectors import WordVectors
 from swedeb_demo.api.westac.riksprot.parlaclarin import codecs as md
+from swedeb_demo.api.westac.riksprot.parlaclarin import speech_store as ss
 from swedeb_demo.api.westac.riksprot.parlaclarin import speech_text as sr
+from swedeb_demo.api.westac.riksprot.parlaclarin.utility import to_protocol_names
+
+T = TypeVar("T")
 
 
 class ADummyApi:
     """Dummy API for testing and developing the SweDeb GUI"""
 
+    KWIC_CUT_OFF: int = 200000
+
     def __init__(
         self,
         env_file: str = ".env_sample_docker",
         corpus_dir="/usr/local/share/cwb/registry/",
         corpus_name="RIKSPROT_V090_TEST",
+        eager: bool = False,
+        max_workers: int = 4,
     ) -> None:
+        """Loads corpus and metadata concurrently, other components are loaded in background.
+
+        Args:
+            env_file (str, optional): environment file. Defaults to ".env_sample_docker".
+            corpus_dir (str, optional): CWB registry folder. Defaults to "/usr/local/share/cwb/registry/".
+            corpus_name (str, optional): CWB corpus name. Defaults to "RIKSPROT_V090_TEST".
+            eager (bool, optional): wait for all components to be loaded. Defaults to False.
+            max_workers (int, optional): number of loader threads. Defaults to 4.
+        """
         load_dotenv(env_file)
         self.tag: str = os.getenv("TAG")
         self.folder = os.getenv("FOLDER")
-        METADATA_FILENAME = os.getenv("METADATA_FILENAME")
-        TAGGED_CORPUS_FOLDER = os.getenv("TAGGED_CORPUS_FOLDER")
+        self.metadata_filename: str = os.getenv("METADATA_FILENAME")
+        self.tagged_corpus_folder: str = os.getenv("TAGGED_CORPUS_FOLDER")
         self.corpus_dir = corpus_dir
         self.corpus_name = corpus_name
-
-        self.load_corpus()
-        self.data: md.Codecs = md.Codecs().load(source=METADATA_FILENAME)
-
-        self.person_codecs: md.PersonCodecs = md.PersonCodecs().load(
-            source=METADATA_FILENAME
+        self.kwic_shard_years: int = int(os.getenv("KWIC_SHARD_YEARS") or 0)
+        self.kwic_max_workers: int = int(os.getenv("KWIC_MAX_WORKERS") or 4)
+        """Results with at most this many lines (default: one page) are cached at once"""
+        self.kwic_cache_eager_hits: int = int(os.getenv("KWIC_CACHE_EAGER_HITS") or 50)
+        self.kwic_cache: KwicResultCache | None = (
+            KwicResultCache(
+                os.getenv("KWIC_CACHE_FOLDER"),
+                max_bytes=int(os.getenv("KWIC_CACHE_MAX_BYTES") or 1024**3),
+            )
+            if os.getenv("KWIC_CACHE_FOLDER")
+            else None
         )
 
-        self.repository: sr.SpeechTextRepository = sr.SpeechTextRepository(
-            source=TAGGED_CORPUS_FOLDER,
-            person_codecs=self.person_codecs,
-            document_index=self.corpus.document_index,
+        executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="swedeb-api"
         )
+        corpus_loaded: Future = executor.submit(self.timed, "corpus", self.load_corpus)
+        self.person_codecs: md.PersonCodecs = self.timed(
+            "metadata",
+            md.PersonCodecs().load,
+            source=self.metadata_filename,
+        )
+        """Metadata is read once, code tables are shared with person codecs"""
+        self.data: md.Codecs = md.Codecs().load(
+            source={
+                name: getattr(self.person_codecs, name) for name in md.CODE_TABLENAMES
+            }
+        )
+
+        self.background: dict[str, Future] = {
+            "kwic_corpus": executor.submit(
+                self.timed, "kwic corpus", self.load_kwic_corpus
+            ),
+        }
+
+        corpus_loaded.result()
 
         self.gender_to_swedish = {"man": "Man", "woman": "Kvinna", "unknown": "Okänt"}
 
@@ -61,7 +116,6 @@ class ADummyApi:
         self.party_abbrev_to_color = dict(
             zip(self.data.party.party_abbrev, self.data.party.party_color)
         )
-        self.kwic_corpus = self.load_kwic_corpus()
         self.words_per_year = self._set_words_per_year()
 
         self.renamed_columns = {
@@ -75,6 +129,50 @@ class ADummyApi:
             "gender": "Kön",
         }
 
+        self.background["repository"] = executor.submit(
+            self.timed, "speech repository", self.create_repository
+        )
+        executor.shutdown(wait=False)
+
+        if eager:
+            for future in self.background.values():
+                future.result()
+
+    @staticmethod
+    def timed(stage: str, fx: Callable[..., T], *args, **kwargs) -> T:
+        """Calls `fx` and logs elapsed time for the startup `stage`"""
+        start: float = time.perf_counter()
+        try:
+            result: T = fx(*args, **kwargs)
+        except Exception as ex:
+            logger.error(
+                f"ADummyApi: loading {stage} failed after "
+                f"{time.perf_counter() - start:.2f}s: {ex}"
+            )
+            raise
+        logger.info(f"ADummyApi: {stage} loaded in {time.perf_counter() - start:.2f}s")
+        return result
+
+    @cached_property
+    def kwic_corpus(self) -> Corpus:
+        return self.background["kwic_corpus"].result()
+
+    @cached_property
+    def repository(self) -> sr.SpeechTextRepository:
+        return self.background["repository"].result()
+
+    def create_repository(self) -> sr.SpeechTextRepository:
+        return sr.SpeechTextRepository(
+            source=ss.create_loader(
+                self.tagged_corpus_folder,
+                folder=self.folder,
+                tag=self.tag,
+                n_documents=len(self.corpus.document_index),
+            ),
+            person_codecs=self.person_codecs,
+            document_index=self.corpus.document_index,
+        )
+
     def get_only_parties_with_data(self):
         parties_in_data = self.corpus.document_index.party_id.unique()
         return parties_in_data
@@ -95,6 +193,14 @@ class ADummyApi:
 
     def load_corpus(self) -> None:
         self.corpus = VectorizedCorpus.load(folder=self.folder, tag=self.tag)
+        """Protocol names are derived once (shared by speech repository and exports)"""
+        self.corpus.document_index["protocol_name"] = to_protocol_names(
+            self.corpus.document_index["document_name"]
+        )
+        self.corpus_filter = CorpusFilter(self.corpus)
+        self.trends_cube: TrendsCube | None = TrendsCube.load_if_valid(
+            folder=self.folder, tag=self.tag, corpus=self.corpus
+        )
 
     def get_party_specs(self) -> Union[str, Mapping[str, int]]:
         for specification in self.data.property_values_specs:
@@ -106,9 +212,36 @@ class ADummyApi:
                         selected[k] = v
                 return selected
 
+    @cached_property
+    def vocabulary(self) -> VocabularyIndex:
+        return self.timed(
+            "vocabulary",
+            VocabularyIndex.create,
+            self.corpus.token2id,
+            self.corpus.term_frequency,
+        )
+
     def get_word_hits(self, search_term: str, n_hits: int = 5) -> list[str]:
-        search_term = search_term.lower()
-        return self.corpus.find_matching_words({f"{search_term}"}, n_hits)
+        """Returns the `n_hits` most frequent words that matches `search_term` (word, wildcard pattern or |regexp|)"""
+        return self.vocabulary.find(search_term.lower(), n_hits)
+
+    @cached_property
+    def autocompleter(self) -> Autocompleter:
+        return self.timed("autocompleter", Autocompleter, self.vocabulary)
+
+    def get_word_suggestions(self, prefix: str, n_suggestions: int = 10) -> list[str]:
+        """Returns the most frequent completions of `prefix` (or of its longest prefix that has any)"""
+        return self.autocompleter.suggest(prefix.strip().lower(), n_suggestions)
+
+    def get_unknown_words(
+        self, search_terms: list[str], n_suggestions: int = 5
+    ) -> dict[str, list[str]]:
+        """Returns suggestions for each search term that matches no word in the vocabulary"""
+        return {
+            term: self.get_word_suggestions(term, n_suggestions)
+            for term in dict.fromkeys(search_terms)
+            if term and not self.get_word_hits(term, n_hits=1)
+        }
 
     def get_speech(self, document_name: str):  # type: ignore
         return self.repository.speech(speech_name=document_name, mode="dict")
@@ -116,6 +249,33 @@ class ADummyApi:
     def get_speech_text(self, document_name: str):  # type: ignore
         return self.repository.to_text(self.get_speech(document_name))
 
+    def get_speech_texts(
+        self, document_names: Iterable[str]
+    ) -> Iterator[tuple[str, str]]:
+        """Yields (document name, text) for several speeches, each protocol is loaded once
+
+        Args:
+            document_names (Iterable[str]): speech names
+
+        Returns:
+            Iterator[tuple[str, str]]: speech texts, grouped by protocol
+        """
+        return self.repository.speeches_by_name(document_names, mode="text")
+
+    def write_speech_texts(
+        self, document_names: Iterable[str], target: str | IO[bytes]
+    ) -> int:
+        """Writes speech texts to a zip archive (one `<document name>.txt` per speech)
+
+        Args:
+            document_names (Iterable[str]): speech names
+            target (str | IO[bytes]): zip filename or writable binary stream
+
+        Returns:
+            int: number of speeches written
+        """
+        return self.repository.write_speeches(document_names, target)
+
     def get_speaker_note(self, document_name: str) -> str:
         speech = self.get_speech(document_name)
         if "speaker_note_id" not in speech:
@@ -125,34 +285,52 @@ class ADummyApi:
         else:
             return speech["speaker_note"]
 
-    def get_word_vectors(
-        self, words: list[str], corpus: VectorizedCorpus = None
-    ) -> dict:
-        """Returns individual corpus columns vectors for each search term
+    def get_speaker_notes(self, document_names: list[str]) -> dict[str, str]:
+        """Returns speaker notes of several speeches (e.g. for exports) in one lookup
+
+        Args:
+            document_names (list[str]): speech names
+
+        Returns:
+            dict[str, str]: speaker note by speech name
+        """
+        return self.repository.get_speaker_notes(document_names)
+
+    @cached_property
+    def word_vectors(self) -> WordVectors:
+        return WordVectors(self.corpus)
+
+    def get_word_vectors(self, words: list[str]) -> sp.csc_matrix:
+        """Returns corpus column vectors for all search terms (in a single sparse slice)
 
         Args:
             words: list of strings (search terms)
-            corpus (VectorizedCorpus, optional): current corpus in None.
-            Defaults to None.
 
         Returns:
-            dict: key: search term, value: corpus column vector
+            sp.csc_matrix: (documents x words) counts, zeros for unknown words
         """
-        vectors = {}
-        if corpus is None:
-            corpus = self.corpus
+        return self.word_vectors.vectors(words)
+
+    @cached_property
+    def postings(self) -> PostingsIndex:
+        """Stored postings index if valid, otherwise computed from the corpus"""
+        postings: PostingsIndex | None = PostingsIndex.load_if_valid(
+            folder=self.folder, tag=self.tag, corpus=self.corpus
+        )
+        if postings is None:
+            postings = self.timed("postings", PostingsIndex.compute, self.corpus)
+        return postings
 
-        for word in words:
-            vectors[word] = corpus.get_word_vector(word)
-        return vectors
+    def get_corpus_filter(self, corpus: VectorizedCorpus = None) -> CorpusFilter:
+        if corpus is None or corpus is self.corpus:
+            return self.corpus_filter
+        return CorpusFilter(corpus)
 
     def filter_corpus(
         self, filter_dict: dict, corpus: VectorizedCorpus
     ) -> VectorizedCorpus:
-        if filter_dict is not None:
-            for key in filter_dict:
-                corpus = corpus.filter(lambda row: row[key] in filter_dict[key])
-        return corpus
+        """Returns documents in `corpus` that matches all selections in `filter_dict`"""
+        return self.get_corpus_filter(corpus).filter(filter_dict)
 
     def get_anforanden(
         self,
@@ -172,8 +350,9 @@ class ADummyApi:
             DatFrame: DataFrame with speeches for selected years and filter.
         """
         if di_selected is None:
-            filtered_corpus = self.filter_corpus(selections, self.corpus)
-            di_selected = filtered_corpus.document_index
+            di_selected = self.corpus_filter.filter_document_index(
+                canonical_selections(selections)
+            )
         di_selected = di_selected[di_selected["year"].between(from_year, to_year)]
 
         return self.prepare_anforande_display(di_selected)
@@ -183,6 +362,43 @@ class ADummyApi:
             return "Okänd"
         return f"[{name}](https://www.wikidata.org/wiki/{person_id})"
 
+    def get_links(self, person_ids: pd.Series, names: pd.Series) -> pd.Series:
+        """Vectorized `get_link`: one link is created per distinct speaker (categorical result).
+
+        Args:
+            person_ids (pd.Series): speaker IDs
+            names (pd.Series): speaker names (decoded from `person_ids`)
+
+        Returns:
+            pd.Series: links to speakers' Wikidata pages ("Okänd" if name is unknown)
+        """
+        """Missing IDs are kept as a distinct value (the NA sentinel -1 would break `positions`)"""
+        codes, uniques = pd.factorize(person_ids, use_na_sentinel=False)
+        """Name of first occurrence of each distinct speaker"""
+        positions: np.ndarray = np.zeros(len(uniques), dtype=np.int64)
+        positions[codes[::-1]] = np.arange(len(codes) - 1, -1, -1)
+        unique_names: np.ndarray = np.asarray(names, dtype=object).take(positions)
+        links: list[str] = [
+            "Okänd" if pd.isna(name) or name == "" else self.get_link(person_id, name)
+            for person_id, name in zip(uniques, unique_names)
+        ]
+        return pd.Series(
+            pd.Categorical(links).take(codes, allow_fill=True), index=person_ids.index
+        )
+
+    @staticmethod
+    def get_years(dates: pd.Series) -> pd.Series:
+        """Returns year of ISO dates ("YYYY-MM-DD"), each distinct date is parsed once"""
+        codes, uniques = pd.factorize(dates)
+        years: np.ndarray = uniques.str.slice(0, 4).astype(int).values
+        return pd.Series(years.take(codes), index=dates.index)
+
+    def decode_speakers(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Decodes speaker attributes (name, gender, party) and adds speaker link column"""
+        data = self.person_codecs.decode(data, drop=False)
+        data["link"] = self.get_links(data["person_id"], data["name"])
+        return data
+
     def prepare_anforande_display(
         self, anforanden_doc_index: pd.DataFrame
     ) -> pd.DataFrame:
@@ -190,10 +406,7 @@ class ADummyApi:
             ["who", "year", "document_name", "gender_id", "party_id"]
         ]
         adi = anforanden_doc_index.rename(columns={"who": "person_id"})
-        self.person_codecs.decode(adi, drop=False)
-        adi["link"] = adi.apply(
-            lambda x: self.get_link(x["person_id"], x["name"]), axis=1
-        )
+        adi = self.decode_speakers(adi)
         adi.drop(columns=["person_id", "gender_id", "party_id"], inplace=True)
 
         # to sort unknowns to the end of the results
@@ -225,11 +438,50 @@ class ADummyApi:
 
         return query[1:]
 
-    def get_query(self, search_terms, selection, lemmatized, prefix):
+    @cached_property
+    def kwic_s_attributes(self) -> set[str]:
+        """Names of the structural attributes available in the KWIC (CWB) corpus"""
+        try:
+            attributes: pd.DataFrame = self.kwic_corpus.attributes_available
+            return set(attributes[attributes["type"] == "s-Att"]["attribute"])
+        except Exception:  # pylint: disable=broad-except
+            return set()
+
+    def get_year_constraint(self, from_year: int, to_year: int, prefix: str) -> str:
+        """Returns CQP constraint that restricts matches to speeches in the year range.
+
+        Uses the `speech_year` s-attribute if it exists, otherwise matches the year part of
+        `speech_date`. Returns an empty string if the range covers all years in the corpus,
+        or if neither attribute exists (results are then filtered on year afterwards).
+
+        Args:
+            from_year (int): first year
+            to_year (int): last year
+            prefix (str): query label of the matched token
+
+        Returns:
+            str: CQP global constraint, e.g. `(a.speech_date="(1960|1961)-.*")`
+        """
+        years: pd.Series = self.corpus.document_index["year"]
+        if from_year <= years.min() and to_year >= years.max():
+            return ""
+        pattern: str = "|".join(str(year) for year in range(from_year, to_year + 1))
+        if "speech_year" in self.kwic_s_attributes:
+            return f'({prefix}.speech_year="({pattern})")'
+        if "speech_date" in self.kwic_s_attributes:
+            return f'({prefix}.speech_date="({pattern})-.*")'
+        return ""
+
+    def get_query(self, search_terms, selection, lemmatized, prefix, year_range=None):
         term_query = self.get_search_query_list(search_terms, lemmatized)
+        constraints: list[str] = []
         if selection:
-            q = self.get_query_from_selections(selection, prefix=prefix)
-            query = f"{prefix}:{term_query}::{q}"
+            constraints.append(self.get_query_from_selections(selection, prefix=prefix))
+        if year_range:
+            constraints.append(self.get_year_constraint(*year_range, prefix=prefix))
+        constraints = [c for c in constraints if c]
+        if constraints:
+            query = f"{prefix}:{term_query}::{'&'.join(constraints)}"
             return query
         return term_query
 
@@ -247,12 +499,9 @@ class ADummyApi:
             "party_id": "speech_party_id",
             "who": "speech_who",
         }
-        for key, value in renames.items():
-            if key in selections:
-                selections[value] = selections.pop(key)
-        return selections
+        return {renames.get(key, key): value for key, value in selections.items()}
 
-    def get_kwic_results_for_search_hits(
+    def query_kwic_corpus(
         self,
         search_hits: List[str],
         from_year: int,
@@ -261,13 +510,131 @@ class ADummyApi:
         words_before: int,
         words_after: int,
         lemmatized: bool,
-    ) -> pd.DataFrame:
-        selections = self.rename_selection_keys(selections)
-        query_str = self.get_query(search_hits, selections, lemmatized, prefix="a")
-        subcorpus = self.kwic_corpus.query(
+    ) -> Corpus:
+        """Runs the KWIC (CQP) query, returns the matches as a subcorpus"""
+        query_str = self.get_kwic_query(
+            search_hits, from_year, to_year, selections, lemmatized
+        )
+        return self.kwic_corpus.query(
             query_str, context_left=words_before, context_right=words_after
         )
 
+    def get_kwic_query(
+        self,
+        search_hits: List[str],
+        from_year: int,
+        to_year: int,
+        selections: dict,
+        lemmatized: bool,
+    ) -> str:
+        """Returns the CQP query for KWIC search (equivalent selections give identical queries)"""
+        selections = self.rename_selection_keys(canonical_selections(selections))
+        return self.get_query(
+            search_hits,
+            selections,
+            lemmatized,
+            prefix="a",
+            year_range=(from_year, to_year),
+        )
+
+    @cached_property
+    def kwic_corpus_version(self) -> list:
+        """Modification times of the CWB registry file and the metadata database"""
+        return [
+            int(os.path.getmtime(filename)) if os.path.isfile(filename) else None
+            for filename in [
+                os.path.join(self.corpus_dir, self.corpus_name.lower()),
+                self.metadata_filename,
+            ]
+        ]
+
+    def get_kwic_cache_key(
+        self,
+        search_hits: List[str],
+        from_year: int,
+        to_year: int,
+        selections: dict,
+        words_before: int,
+        words_after: int,
+        lemmatized: bool,
+    ) -> str:
+        return KwicResultCache.key(
+            query=self.get_kwic_query(
+                search_hits, from_year, to_year, selections, lemmatized
+            ),
+            corpus=self.corpus_name,
+            corpus_version=self.kwic_corpus_version,
+            years=[from_year, to_year],
+            context=[words_before, words_after],
+            cut_off=self.KWIC_CUT_OFF,
+        )
+
+    def get_year_shards(self, from_year: int, to_year: int) -> list[tuple[int, int]]:
+        """Splits year range (clipped to corpus years) into shards of `kwic_shard_years` years
+        (aligned on multiples of it). The range is returned as is if it has no corpus years.
+        """
+        years: pd.Series = self.corpus.document_index["year"]
+        first_year: int = int(max(from_year, years.min()))
+        last_year: int = int(min(to_year, years.max()))
+        if first_year > last_year:
+            return [(from_year, to_year)]
+        n: int = self.kwic_shard_years
+        if n <= 0:
+            return [(first_year, last_year)]
+        return [
+            (max(start, first_year), min(start + n - 1, last_year))
+            for start in range(first_year - first_year % n, last_year + 1, n)
+        ]
+
+    def query_kwic_shards(
+        self,
+        search_hits: List[str],
+        from_year: int,
+        to_year: int,
+        selections: dict,
+        words_before: int,
+        words_after: int,
+        lemmatized: bool,
+    ) -> list[Corpus]:
+        """Runs the KWIC query concurrently on year shards, returns subcorpora in year order.
+
+        Each CQP query runs in a process of its own, so shards are queried from a thread pool.
+        A single query is run if sharding is disabled (KWIC_SHARD_YEARS), or if the year range
+        can't be applied in the query.
+        """
+        shards: list[tuple[int, int]] = self.get_year_shards(from_year, to_year)
+        if len(shards) == 1 or not self.kwic_s_attributes & {
+            "speech_year",
+            "speech_date",
+        }:
+            shards = [(from_year, to_year)]
+        with ThreadPoolExecutor(
+            max_workers=min(self.kwic_max_workers, len(shards)),
+            thread_name_prefix="swedeb-kwic",
+        ) as executor:
+            return list(
+                executor.map(
+                    lambda shard: self.query_kwic_corpus(
+                        search_hits,
+                        shard[0],
+                        shard[1],
+                        selections,
+                        words_before,
+                        words_after,
+                        lemmatized,
+                    ),
+                    shards,
+                )
+            )
+
+    def get_concordance(
+        self,
+        subcorpus: Corpus,
+        from_year: int,
+        to_year: int,
+        matches: List[int] = None,
+    ) -> pd.DataFrame:
+        """Materializes concordance lines (for `matches`, or all matches up to cut-off)"""
         data: pd.DataFrame = subcorpus.concordance(
             # form='dataframe'
             form="kwic",  # 'simple', 'dataframes',...
@@ -280,8 +647,8 @@ class ADummyApi:
                 "speech_title",
             ],
             order="first",
-            cut_off=200000,
-            matches=None,
+            cut_off=self.KWIC_CUT_OFF,
+            matches=matches,
             slots=None,
             cwb_ids=False,
         )
@@ -300,14 +667,12 @@ class ADummyApi:
         data.rename(columns=renamed_selections, inplace=True)
 
         data = data.astype({"gender_id": int, "party_id": int})
-        data["year"] = data.apply(lambda x: int(x["speech_date"].split("-")[0]), axis=1)
+        data["year"] = self.get_years(data["speech_date"])
 
+        # no-op if the year range was applied in the query (fallback otherwise)
         data = data[data["year"].between(from_year, to_year)]
 
-        data = self.person_codecs.decode(data, drop=False)
-        data["link"] = data.apply(
-            lambda x: self.get_link(x["person_id"], x["name"]), axis=1
-        )
+        data = self.decode_speakers(data)
 
         data.rename(columns=self.renamed_columns, inplace=True)
 
@@ -326,6 +691,174 @@ class ADummyApi:
             ]
         ]
 
+    def get_kwic_results_for_search_hits(
+        self,
+        search_hits: List[str],
+        from_year: int,
+        to_year: int,
+        selections: dict,
+        words_before: int,
+        words_after: int,
+        lemmatized: bool,
+    ) -> pd.DataFrame:
+        """Returns all concordance lines, via the KWIC result cache if configured (or if sharded)"""
+        if self.kwic_cache is not None or self.kwic_shard_years > 0:
+            return self.get_paged_kwic_results(
+                search_hits,
+                from_year,
+                to_year,
+                selections,
+                words_before,
+                words_after,
+                lemmatized,
+            ).to_frame()
+        subcorpus: Corpus = self.query_kwic_corpus(
+            search_hits,
+            from_year,
+            to_year,
+            selections,
+            words_before,
+            words_after,
+            lemmatized,
+        )
+        return self.get_concordance(subcorpus, from_year, to_year)
+
+    def get_paged_kwic_results(
+        self,
+        search_hits: List[str],
+        from_year: int,
+        to_year: int,
+        selections: dict,
+        words_before: int,
+        words_after: int,
+        lemmatized: bool,
+    ) -> KwicResult:
+        """Runs KWIC query once (per year shard), concordance lines are materialized lazily per page.
+
+        If the year range can't be applied in the query (see `get_year_constraint`), all lines
+        are materialized at once, since the number of hits isn't known until filtered on year.
+        If a KWIC result cache is configured (KWIC_CACHE_FOLDER), materialized results are stored
+        in, and returned from, the cache.
+
+        Args:
+            search_hits (List[str]): search terms
+            from_year (int): first year
+            to_year (int): last year
+            selections (dict): selected filters, i.e. genders, parties, and, speakers
+            words_before (int): number of words before search term(s)
+            words_after (int): number of words after search term(s)
+            lemmatized (bool): search on lemmas (otherwise on words)
+
+        Returns:
+            KwicResult: number of hits and lazily materialized concordance lines
+        """
+        key: str | None = None
+        if self.kwic_cache is not None:
+            key = self.get_kwic_cache_key(
+                search_hits,
+                from_year,
+                to_year,
+                selections,
+                words_before,
+                words_after,
+                lemmatized,
+            )
+            cached: pd.DataFrame | None = self.kwic_cache.get(key)
+            if cached is not None:
+                return KwicResult.from_frame(cached)
+
+        result: KwicResult = self.query_paged_kwic_results(
+            search_hits,
+            from_year,
+            to_year,
+            selections,
+            words_before,
+            words_after,
+            lemmatized,
+        )
+        if key is not None:
+            """Results are stored when materialized, small results are materialized at once"""
+            if result.is_materialized:
+                self.kwic_cache.put(key, result.to_frame())
+            else:
+                result.on_materialized = lambda data: self.kwic_cache.put(key, data)
+                if len(result) <= self.kwic_cache_eager_hits:
+                    result.to_frame()
+        return result
+
+    def query_paged_kwic_results(
+        self,
+        search_hits: List[str],
+        from_year: int,
+        to_year: int,
+        selections: dict,
+        words_before: int,
+        words_after: int,
+        lemmatized: bool,
+    ) -> KwicResult:
+        """Runs KWIC query (see `get_paged_kwic_results`), bypassing the result cache"""
+        subcorpora: list[Corpus] = self.query_kwic_shards(
+            search_hits,
+            from_year,
+            to_year,
+            selections,
+            words_before,
+            words_after,
+            lemmatized,
+        )
+        if not self.kwic_s_attributes & {"speech_year", "speech_date"}:
+            return KwicResult.from_frame(
+                self.get_concordance(subcorpora[0], from_year, to_year)
+            )
+
+        shard_matches: list[np.ndarray] = []
+        n_hits: int = 0
+        for subcorpus in subcorpora:
+            matches: np.ndarray = subcorpus.df.index.get_level_values("match").values
+            shard_matches.append(matches[: self.KWIC_CUT_OFF - n_hits])
+            n_hits += len(shard_matches[-1])
+        offsets: np.ndarray = np.cumsum([0] + [len(m) for m in shard_matches])
+
+        def fetch(start: int, stop: int) -> pd.DataFrame:
+            """Materializes lines `start` to `stop`, (concurrently) from the shards they span"""
+            parts: list[tuple[Corpus, list[int]]] = [
+                (
+                    subcorpus,
+                    matches[
+                        max(start - offset, 0) : max(
+                            min(stop - offset, len(matches)), 0
+                        )
+                    ].tolist(),
+                )
+                for subcorpus, matches, offset in zip(
+                    subcorpora, shard_matches, offsets
+                )
+            ]
+            parts = [(subcorpus, matches) for subcorpus, matches in parts if matches]
+            if len(parts) == 0:
+                return pd.DataFrame()
+            with ThreadPoolExecutor(
+                max_workers=min(self.kwic_max_workers, len(parts)),
+                thread_name_prefix="swedeb-kwic",
+            ) as executor:
+                frames: list[pd.DataFrame] = list(
+                    executor.map(
+                        lambda part: self.get_concordance(
+                            part[0], from_year, to_year, matches=part[1]
+                        ),
+                        parts,
+                    )
+                )
+            if len(frames) == 1:
+                return frames[0]
+            data: pd.DataFrame = pd.concat(frames, ignore_index=True)
+            """Categories differ between shards (concatenated as object)"""
+            for column in frames[0].select_dtypes("category").columns:
+                data[column] = data[column].astype("category")
+            return data
+
+        return KwicResult(n_hits=n_hits, fetch=fetch)
+
     def get_property_specs(self) -> list:
         return self.data.property_values_specs
 
@@ -336,34 +869,22 @@ class ADummyApi:
         start_year: int,
         end_year: int,
     ) -> pd.DataFrame:
-        search_terms = [x.lower() for x in search_terms if x in self.corpus.vocabulary]
+        search_terms = [x.lower() for x in search_terms if x in self.corpus.token2id]
 
         if not search_terms:
             return pd.DataFrame()
 
-        trends_data: SweDebTrendsData = SweDebTrendsData(
-            corpus=self.corpus, person_codecs=self.person_codecs, n_top=1000000
-        )
-        pivot_keys = list(filter_opts.keys()) if filter_opts else []
-
-        opts: SweDebComputeOpts = SweDebComputeOpts(
-            fill_gaps=False,
-            keyness=KeynessMetric.TF,
-            normalize=False,
-            pivot_keys_id_names=pivot_keys,
-            filter_opts=PropertyValueMaskingOpts(**filter_opts),
-            smooth=False,
-            temporal_key="year",
-            top_count=100000,
-            unstack_tabular=False,
-            words=search_terms,
-        )
-
-        trends_data.transform(opts)
+        filter_opts = canonical_selections(filter_opts)
+        pivot_keys = list(filter_opts.keys())
 
-        trends: pd.DataFrame = trends_data.extract(
-            indices=trends_data.find_word_indices(opts)
-        )
+        if self.trends_cube is not None and self.trends_cube.can_answer(pivot_keys):
+            trends: pd.DataFrame = self.get_word_trends_from_cube(
+                search_terms, filter_opts, pivot_keys
+            )
+        else:
+            trends: pd.DataFrame = self.get_word_trends_from_corpus(
+                search_terms, filter_opts, pivot_keys
+            )
 
         trends = trends[trends["year"].between(start_year, end_year)]
 
@@ -371,14 +892,14 @@ class ADummyApi:
         trends = self.add_zeros_for_non_result_years(trends, pivot_keys)
 
         trends.rename(columns={"who": "person_id"}, inplace=True)
-        trends_data.person_codecs.decode(trends)
+        self.person_codecs.decode(trends)
         trends["year"] = trends["year"].astype(str)
 
         if not pivot_keys:
-            unstacked_trends = trends.set_index(opts.temporal_key)
+            unstacked_trends = trends.set_index("year")
 
         else:
-            current_pivot_keys = [opts.temporal_key] + [
+            current_pivot_keys = ["year"] + [
                 x for x in trends.columns if x in self.possible_pivots
             ]
             unstacked_trends = pu.unstack_data(trends, current_pivot_keys)
@@ -388,45 +909,85 @@ class ADummyApi:
         unstacked_trends = unstacked_trends.loc[:, (unstacked_trends != 0).any(axis=0)]
         return unstacked_trends
 
-    def add_zeros_for_non_result_years(self, original_df, pivot_keys):
-        min_year = original_df["year"].min()
-        max_year = original_df["year"].max()
+    def get_word_trends_from_corpus(
+        self, search_terms: List[str], filter_opts: dict, pivot_keys: List[str]
+    ) -> pd.DataFrame:
+        """Computes word trends by summing the search term columns on year and pivot keys"""
+        return self.word_vectors.aggregate(
+            self.word_vectors.known_words(search_terms),
+            keys=["year"] + list(pivot_keys),
+            mask=self.corpus_filter.mask(filter_opts),
+            cache_key=freeze_selections(filter_opts),
+        )
 
-        # Generate all combinations of 'Year' and pivot keys
-        product = []
-        product.append(range(min_year, max_year + 1))
-        for pivot_key in pivot_keys:
-            all_keys = original_df[pivot_key].unique()
-            product.append(all_keys)
-        names = ["year"] + pivot_keys
+    def get_word_trends_from_cube(
+        self, search_terms: List[str], filter_opts: dict, pivot_keys: List[str]
+    ) -> pd.DataFrame:
+        """Computes word trends from the precomputed (year, party, gender) cube"""
+        words: List[str] = [
+            w for w in dict.fromkeys(search_terms) if w in self.corpus.token2id
+        ]
+        return self.trends_cube.extract(
+            token_ids=[self.corpus.token2id[w] for w in words],
+            words=words,
+            filter_opts=filter_opts,
+            pivot_keys=pivot_keys,
+        )
+
+    def add_zeros_for_non_result_years(self, original_df, pivot_keys):
+        """Adds zero counts for years (in the result's year range) where an existing pivot combination is missing
 
-        all_combos = pd.MultiIndex.from_product(product, names=names)
+        Counts are scattered into a dense (year x pivot combination x word) array that is zero
+        for missing cells, so only combinations that occur in the result are expanded.
+        """
+        if original_df.empty:
+            return original_df
 
-        # Create a DataFrame with all combinations
-        all_combos_df = pd.DataFrame(index=all_combos).reset_index()
+        keys: list[str] = ["year"] + list(pivot_keys)
+        value_columns: list[str] = [x for x in original_df.columns if x not in keys]
 
-        # Merge with the original DataFrame to fill missing combinations
-        merged_df = pd.merge(
-            all_combos_df, original_df, on=["year"] + pivot_keys, how="left"
-        )
-        merged_df.fillna(0, inplace=True)
-        # Identify columns of type float
-        float_columns = merged_df.select_dtypes(include=["float"]).columns.tolist()
+        years: np.ndarray = original_df["year"].values
+        min_year: int = int(years.min())
+        n_years: int = int(years.max()) - min_year + 1
 
-        # Convert float columns to integers
-        for col in float_columns:
-            merged_df[col] = merged_df[col].astype(int)
+        if pivot_keys:
+            combo_ids: np.ndarray = (
+                original_df.groupby(list(pivot_keys), sort=False).ngroup().values
+            )
+            combos: pd.DataFrame = original_df[list(pivot_keys)].drop_duplicates()
+        else:
+            combo_ids = np.zeros(len(original_df), dtype=np.int64)
+            combos = pd.DataFrame(index=[0])
+        n_combos: int = len(combos)
 
-        return merged_df
+        values: np.ndarray = original_df[value_columns].values
+        dense: np.ndarray = np.zeros(
+            (n_years, n_combos, len(value_columns)), dtype=values.dtype
+        )
+        dense[years - min_year, combo_ids] = values
+
+        data: pd.DataFrame = combos.iloc[np.tile(np.arange(n_combos), n_years)]
+        data = data.reset_index(drop=True)
+        data.insert(
+            0,
+            "year",
+            np.repeat(np.arange(min_year, min_year + n_years), n_combos).astype(
+                years.dtype
+            ),
+        )
+        data[value_columns] = dense.reshape(-1, len(value_columns))
+        return data
 
     def get_anforanden_for_word_trends(
         self, selected_terms, filter_opts, start_year, end_year
     ):
-        filtered_corpus = self.filter_corpus(filter_opts, self.corpus)
-        vectors = self.get_word_vectors(selected_terms, filtered_corpus)
+        """Returns speeches (one row per word and speech) that contain any of `selected_terms`"""
+        di: pd.DataFrame = self.corpus.document_index
+        mask: np.ndarray = self.corpus_filter.mask(canonical_selections(filter_opts))
         hits = []
-        for word, vec in vectors.items():
-            hit_di = filtered_corpus.document_index[vec.astype(bool)]
+        for word in selected_terms:
+            document_ids: np.ndarray = self.postings.documents(word)
+            hit_di = di.iloc[document_ids[mask[document_ids]]]
             anforanden = self.prepare_anforande_display(hit_di)
             anforanden["hit"] = word
             hits.append(anforanden)
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import numpy as np
+
+from swedeb_demo.api.parlaclarin.vocabulary import VocabularyIndex
+
+
+class Autocompleter:
+    """Suggests the most frequent completions of a prefix, with bounded latency.
+
+    Completions of a prefix are a contiguous range in the sorted vocabulary. Ranges of short
+    prefixes (at most `cached_length` characters) are large, so their top `n_cached` words are
+    precomputed (the upper levels of a frequency-ranked trie). Longer prefixes have ranges that
+    are small enough to be ranked when asked for.
+    """
+
+    def __init__(
+        self, vocabulary: VocabularyIndex, cached_length: int = 2, n_cached: int = 10
+    ):
+        self.vocabulary: VocabularyIndex = vocabulary
+        self.cached_length: int = cached_length
+        self.n_cached: int = n_cached
+        self.cache: dict[str, list[str]] = {}
+        for length in range(1, cached_length + 1):
+            prefixes: np.ndarray = np.fromiter(
+                (word[:length] for word in vocabulary.words),
+                dtype=object,
+                count=len(vocabulary),
+            )
+            starts: np.ndarray = np.flatnonzero(
+                np.concatenate([[True], prefixes[1:] != prefixes[:-1]])
+            )
+            for start, stop in zip(starts, np.append(starts[1:], len(prefixes))):
+                if len(prefixes[start]) == length:
+                    self.cache[prefixes[start]] = vocabulary.top(
+                        np.arange(start, stop), n_cached
+                    )
+
+    def complete(self, prefix: str, n: int = 10) -> list[str]:
+        """Returns (at most) `n` words that start with `prefix`, most frequent first"""
+        if not prefix:
+            return []
+        if len(prefix) <= self.cached_length and n <= self.n_cached:
+            return self.cache.get(prefix, [])[:n]
+        return self.vocabulary.top(np.arange(*self.vocabulary.prefix_range(prefix)), n)
+
+    def suggest(self, word: str, n: int = 10) -> list[str]:
+        """Returns completions of `word`, or of its longest prefix that has any (e.g. for misspelled words)"""
+        for length in range(len(word), 0, -1):
+            completions: list[str] = self.complete(word[:length], n)
+            if completions:
+                return completions
+        return []
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+import numpy as np
+import pandas as pd
+from penelope import corpus as pc  # type: ignore
+
+
+class CorpusFilter:
+    """Filters a `VectorizedCorpus` by metadata selections using a single vectorized document mask.
+
+    Selections are dicts such as `{"gender_id": [1, 2], "party_id": [3], "who": ["Q4961902"]}`.
+    All keys are combined (AND) into one boolean mask over the document index, and the DTM is
+    sliced once. Integral ID columns (e.g. `gender_id`, `party_id`) are matched directly, other
+    columns (e.g. `who`) are factorized once into int32 codes and matched via a lookup table.
+    """
+
+    def __init__(self, corpus: pc.VectorizedCorpus):
+        self.corpus: pc.VectorizedCorpus = corpus
+        self._codes: dict[str, tuple[np.ndarray, pd.Index]] = {}
+
+    @property
+    def document_index(self) -> pd.DataFrame:
+        return self.corpus.document_index
+
+    def column_codes(self, key: str) -> tuple[np.ndarray, pd.Index]:
+        """Returns (cached) int32 codes and categories for non-integral column `key`"""
+        if key not in self._codes:
+            codes, categories = pd.factorize(self.document_index[key])
+            self._codes[key] = (codes.astype(np.int32), categories)
+        return self._codes[key]
+
+    def key_mask(self, key: str, values: Any) -> np.ndarray:
+        """Returns mask for documents where column `key` has any of `values`"""
+        values = (
+            list(values)
+            if isinstance(values, Iterable) and not isinstance(values, str)
+            else [values]
+        )
+        column: pd.Series = self.document_index[key]
+
+        if pd.api.types.is_integer_dtype(column.dtype):
+            return np.isin(column.values, np.asarray(values))
+
+        codes, categories = self.column_codes(key)
+        wanted: np.ndarray = categories.get_indexer(values)
+        # extra trailing slot so that missing values (code -1) maps to False
+        lookup: np.ndarray = np.zeros(len(categories) + 1, dtype=bool)
+        lookup[wanted[wanted >= 0]] = True
+        return lookup[codes]
+
+    def mask(self, selections: dict) -> np.ndarray:
+        """Compiles `selections` into a single boolean mask over the document index"""
+        mask: np.ndarray = np.ones(len(self.document_index), dtype=bool)
+        for key, values in (selections or {}).items():
+            if values is None:
+                continue
+            mask &= self.key_mask(key, values)
+        return mask
+
+    def filter_document_index(self, selections: dict) -> pd.DataFrame:
+        """Returns document index rows that matches `selections` (DTM is left untouched)"""
+        if not selections:
+            return self.document_index
+        return self.document_index[self.mask(selections)]
+
+    def filter(self, selections: dict) -> pc.VectorizedCorpus:
+        """Returns a corpus that only contains documents matching `selections`"""
+        if not selections:
+            return self.corpus
+        mask: np.ndarray = self.mask(selections)
+        if mask.all():
+            return self.corpus
+        return self.slice(np.flatnonzero(mask))
+
+    def slice(self, indices: np.ndarray) -> pc.VectorizedCorpus:
+        """Returns a corpus consisting of rows `indices`, document IDs are renumbered (same as `VectorizedCorpus.filter`)"""
+        bag_term_matrix = self.corpus.bag_term_matrix[indices, :]
+        document_index: pd.DataFrame = self.document_index.iloc[indices].reset_index(
+            drop=True
+        )
+        document_index["document_id"] = document_index.index
+        return pc.VectorizedCorpus(
+            bag_term_matrix=bag_term_matrix,
+            token2id=self.corpus.token2id,
+            document_index=document_index,
+            **self.corpus.payload,
+        )
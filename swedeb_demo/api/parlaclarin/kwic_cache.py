@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import glob
+import hashlib
+import json
+import os
+import threading
+from os.path import join as jj
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+KWIC_CACHE_VERSION: int = 1
+
+
+def encode_frame(data: pd.DataFrame) -> dict[str, np.ndarray]:
+    """Encodes frame as (pickle free) arrays, one or more per column"""
+    arrays: dict[str, np.ndarray] = {}
+    columns: list[dict] = []
+    for i, column in enumerate(data.columns):
+        values: pd.Series = data[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            arrays[f"{i}.codes"] = values.cat.codes.values
+            arrays[f"{i}.categories"] = values.cat.categories.values.astype(str)
+            columns.append({"name": column, "kind": "category"})
+        elif values.dtype.kind in "biuf":
+            arrays[f"{i}.values"] = values.values
+            columns.append({"name": column, "kind": "numeric"})
+        else:
+            isna: np.ndarray = values.isna().values
+            arrays[f"{i}.values"] = np.where(isna, "", values.values).astype(str)
+            arrays[f"{i}.isna"] = isna
+            columns.append({"name": column, "kind": "string"})
+    arrays["columns"] = np.array(json.dumps(columns))
+    return arrays
+
+
+def decode_frame(arrays: dict[str, np.ndarray]) -> pd.DataFrame:
+    data: dict[str, pd.Series | np.ndarray] = {}
+    for i, column in enumerate(json.loads(str(arrays["columns"]))):
+        if column["kind"] == "category":
+            data[column["name"]] = pd.Categorical.from_codes(
+                arrays[f"{i}.codes"], arrays[f"{i}.categories"].astype(object)
+            )
+        elif column["kind"] == "numeric":
+            data[column["name"]] = arrays[f"{i}.values"]
+        else:
+            values: np.ndarray = arrays[f"{i}.values"].astype(object)
+            values[arrays[f"{i}.isna"]] = None
+            data[column["name"]] = values
+    return pd.DataFrame(data)
+
+
+class KwicResultCache:
+    """Disk-backed cache of (materialized) KWIC results, shared by processes and kept across restarts.
+
+    Results are stored as compressed columnar NumPy archives, one file per key. The least recently
+    used results are removed when the total size exceeds `max_bytes`.
+    """
+
+    def __init__(self, folder: str, max_bytes: int = 1024**3):
+        self.folder: str = folder
+        self.max_bytes: int = max_bytes
+        self.hits: int = 0
+        self.misses: int = 0
+        self.stores: int = 0
+        self.evictions: int = 0
+        self.lock: threading.Lock = threading.Lock()
+        os.makedirs(self.folder, exist_ok=True)
+
+    @staticmethod
+    def key(**parts) -> str:
+        """Returns cache key for query `parts` (e.g. query string, corpus, years, context width)"""
+        parts["version"] = KWIC_CACHE_VERSION
+        return hashlib.sha1(
+            json.dumps(parts, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+
+    def filename(self, key: str) -> str:
+        return jj(self.folder, f"{key}.npz")
+
+    def get(self, key: str) -> pd.DataFrame | None:
+        filename: str = self.filename(key)
+        try:
+            with np.load(filename, allow_pickle=False) as fp:
+                data: pd.DataFrame = decode_frame(dict(fp))
+        except (OSError, ValueError, KeyError) as ex:
+            if not isinstance(ex, FileNotFoundError):
+                logger.warning(f"KwicResultCache: ignoring unreadable {filename}: {ex}")
+            with self.lock:
+                self.misses += 1
+            return None
+        with self.lock:
+            self.hits += 1
+        try:
+            """Marks result as recently used"""
+            os.utime(filename)
+        except OSError:
+            ...
+        return data
+
+    def put(self, key: str, data: pd.DataFrame) -> None:
+        filename: str = self.filename(key)
+        tmp_filename: str = f"{filename}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_filename, "wb") as fp:
+                np.savez_compressed(fp, **encode_frame(data))
+            os.replace(tmp_filename, filename)
+        except OSError as ex:
+            logger.warning(f"KwicResultCache: unable to store {filename}: {ex}")
+            return
+        with self.lock:
+            self.stores += 1
+        self.evict()
+
+    def evict(self) -> None:
+        """Removes least recently used results until total size is within `max_bytes`"""
+        files: list[tuple[float, int, str]] = []
+        for filename in glob.glob(jj(self.folder, "*.npz")):
+            try:
+                stat: os.stat_result = os.stat(filename)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, filename))
+        nbytes: int = sum(size for _, size, _ in files)
+        for _, size, filename in sorted(files):
+            if nbytes <= self.max_bytes:
+                break
+            try:
+                os.remove(filename)
+            except OSError:
+                continue
+            nbytes -= size
+            with self.lock:
+                self.evictions += 1
+
+    def clear(self) -> None:
+        for filename in glob.glob(jj(self.folder, "*.npz")):
+            os.remove(filename)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            os.path.getsize(filename)
+            for filename in glob.glob(jj(self.folder, "*.npz"))
+        )
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            stores=self.stores,
+            evictions=self.evictions,
+            nbytes=self.nbytes,
+        )
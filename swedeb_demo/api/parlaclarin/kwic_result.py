@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import threading
+from typing import Callable
+
+import pandas as pd
+
+from swedeb_demo.api.cache import LRUCache
+
+
+class KwicResult:
+    """Concordance lines of a KWIC query that are materialized lazily, page by page.
+
+    The query is run once and only the number of hits and a `fetch(start, stop)` function that
+    materializes lines `start` to `stop` (in match order) are kept. Fetched row ranges are cached,
+    and a complete frame is only materialized when the result is sorted or downloaded (and is then
+    passed to `on_materialized`, if given).
+    """
+
+    def __init__(
+        self,
+        *,
+        n_hits: int,
+        fetch: Callable[[int, int], pd.DataFrame],
+        page_cache_size: int = 32,
+        on_materialized: Callable[[pd.DataFrame], None] = None,
+    ):
+        self.n_hits: int = n_hits
+        self.fetch: Callable[[int, int], pd.DataFrame] = fetch
+        self.on_materialized: Callable[[pd.DataFrame], None] | None = on_materialized
+        self.pages: LRUCache[pd.DataFrame] = LRUCache(max_items=page_cache_size)
+        self.sort_orders: LRUCache[KwicResult] = LRUCache(max_items=4)
+        self.data: pd.DataFrame | None = None
+        self.lock: threading.Lock = threading.Lock()
+
+    @staticmethod
+    def from_frame(data: pd.DataFrame) -> "KwicResult":
+        """Wraps already materialized concordance lines"""
+        result: KwicResult = KwicResult(
+            n_hits=len(data), fetch=lambda start, stop: data.iloc[start:stop]
+        )
+        result.data = data
+        return result
+
+    def __len__(self) -> int:
+        return self.n_hits
+
+    @property
+    def empty(self) -> bool:
+        return self.n_hits == 0
+
+    @property
+    def is_materialized(self) -> bool:
+        return self.data is not None
+
+    def rows(self, start: int, stop: int) -> pd.DataFrame:
+        """Returns concordance lines `start` to `stop`"""
+        if self.data is not None:
+            return self.data.iloc[start:stop]
+        stop = min(stop, self.n_hits)
+        return self.pages.get_or_create((start, stop), lambda: self.fetch(start, stop))
+
+    def to_frame(self) -> pd.DataFrame:
+        """Returns all concordance lines (materialized once)"""
+        with self.lock:
+            if self.data is None:
+                self.data = self.fetch(0, self.n_hits)
+                self.pages.clear()
+                if self.on_materialized is not None:
+                    self.on_materialized(self.data)
+        return self.data
+
+    def sort_values(self, by: str | list[str], ascending: bool = True) -> "KwicResult":
+        """Returns (cached) result sorted on `by`"""
+        key: tuple = (tuple(by) if isinstance(by, list) else by, ascending)
+        return self.sort_orders.get_or_create(
+            key,
+            lambda: KwicResult.from_frame(
+                self.to_frame().sort_values(by, ascending=ascending)
+            ),
+        )
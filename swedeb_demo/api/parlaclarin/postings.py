@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import json
+import os
+from functools import reduce
+from os.path import join as jj
+
+import click
+import numpy as np
+import scipy.sparse as sp
+from dotenv import load_dotenv
+from loguru import logger
+from penelope import corpus as pc  # type: ignore
+
+from swedeb_demo.api.parlaclarin.trends_cube import corpus_fingerprint
+
+POSTINGS_VERSION: int = 1
+
+
+def postings_folder(folder: str, tag: str) -> str:
+    """Returns default location of the postings index for the corpus `tag` in `folder`"""
+    return jj(folder, f"{tag}_postings")
+
+
+class PostingsIndex:
+    """Inverted index that maps each term to the sorted IDs (DTM row numbers) of documents containing it.
+
+    All postings are stored in a single array (CSC layout without counts), the postings of term
+    `t` are `document_ids[indptr[t]:indptr[t + 1]]`. Listing documents for a word is hence
+    proportional to its document frequency, not to the size of the corpus.
+    """
+
+    def __init__(
+        self,
+        *,
+        indptr: np.ndarray,
+        document_ids: np.ndarray,
+        token2id: dict[str, int],
+        n_documents: int,
+        metadata: dict = None,
+    ):
+        self.indptr: np.ndarray = indptr
+        self.document_ids: np.ndarray = document_ids
+        self.token2id: dict[str, int] = token2id
+        self.n_documents: int = n_documents
+        self.metadata: dict = metadata or {}
+
+    @staticmethod
+    def compute(corpus: pc.VectorizedCorpus) -> "PostingsIndex":
+        """Computes postings from `corpus` DTM (explicit zeros are ignored)"""
+        bag_term_matrix: sp.spmatrix = corpus.bag_term_matrix
+        csc: sp.csc_matrix = sp.csc_matrix(
+            (np.ones(bag_term_matrix.nnz, dtype=np.int8), bag_term_matrix.nonzero()),
+            shape=bag_term_matrix.shape,
+        )
+        csc.sort_indices()
+        return PostingsIndex(
+            indptr=csc.indptr.astype(np.int64),
+            document_ids=csc.indices.astype(np.int32),
+            token2id=dict(corpus.token2id),
+            n_documents=bag_term_matrix.shape[0],
+        )
+
+    def store(self, target_folder: str, metadata: dict = None) -> "PostingsIndex":
+        os.makedirs(target_folder, exist_ok=True)
+        np.save(jj(target_folder, "indptr.npy"), self.indptr)
+        np.save(jj(target_folder, "document_ids.npy"), self.document_ids)
+        self.metadata = {
+            **(metadata or {}),
+            "version": POSTINGS_VERSION,
+            "n_documents": self.n_documents,
+            "n_terms": len(self.indptr) - 1,
+        }
+        with open(jj(target_folder, "metadata.json"), "w", encoding="utf-8") as fp:
+            json.dump(self.metadata, fp, indent=2)
+        return self
+
+    @staticmethod
+    def load(source_folder: str, token2id: dict[str, int]) -> "PostingsIndex":
+        """Loads index with postings memory-mapped (read-only), terms are resolved using corpus `token2id`"""
+        with open(jj(source_folder, "metadata.json"), "r", encoding="utf-8") as fp:
+            metadata: dict = json.load(fp)
+        return PostingsIndex(
+            indptr=np.load(jj(source_folder, "indptr.npy"), mmap_mode="r"),
+            document_ids=np.load(jj(source_folder, "document_ids.npy"), mmap_mode="r"),
+            token2id=token2id,
+            n_documents=metadata["n_documents"],
+            metadata=metadata,
+        )
+
+    @staticmethod
+    def build(
+        *,
+        folder: str,
+        tag: str,
+        target_folder: str = None,
+        corpus: pc.VectorizedCorpus = None,
+    ) -> "PostingsIndex":
+        """Computes and stores postings for corpus `tag` in `folder`"""
+        corpus = corpus or pc.VectorizedCorpus.load(folder=folder, tag=tag)
+        return PostingsIndex.compute(corpus).store(
+            target_folder or postings_folder(folder, tag),
+            metadata={
+                "tag": tag,
+                "folder": os.path.abspath(folder),
+                "fingerprint": corpus_fingerprint(folder, tag),
+            },
+        )
+
+    def is_valid(self, *, folder: str, tag: str, corpus: pc.VectorizedCorpus) -> bool:
+        """Checks that postings were computed from the (unchanged) corpus `tag` in `folder`"""
+        return (
+            self.metadata.get("version") == POSTINGS_VERSION
+            and self.metadata.get("tag") == tag
+            and self.metadata.get("folder") == os.path.abspath(folder)
+            and self.metadata.get("fingerprint") == corpus_fingerprint(folder, tag)
+            and self.n_documents == corpus.bag_term_matrix.shape[0]
+            and len(self.indptr) - 1 == corpus.bag_term_matrix.shape[1]
+        )
+
+    @staticmethod
+    def load_if_valid(
+        *, folder: str, tag: str, corpus: pc.VectorizedCorpus, source_folder: str = None
+    ) -> "PostingsIndex | None":
+        """Returns stored postings if they exist and are valid for given corpus, otherwise None"""
+        source_folder = source_folder or postings_folder(folder, tag)
+        if not os.path.isfile(jj(source_folder, "metadata.json")):
+            return None
+        try:
+            postings: PostingsIndex = PostingsIndex.load(source_folder, corpus.token2id)
+            if postings.is_valid(folder=folder, tag=tag, corpus=corpus):
+                return postings
+            logger.warning(f"postings index {source_folder} is stale, please rebuild")
+        except Exception as ex:  # pylint: disable=broad-except
+            logger.error(f"unable to load postings index {source_folder}: {ex}")
+        return None
+
+    def document_frequency(self, word: str) -> int:
+        token_id: int | None = self.token2id.get(word)
+        if token_id is None:
+            return 0
+        return int(self.indptr[token_id + 1] - self.indptr[token_id])
+
+    def documents(self, word: str) -> np.ndarray:
+        """Returns sorted IDs of documents that contain `word` (empty if word is unknown)"""
+        token_id: int | None = self.token2id.get(word)
+        if token_id is None:
+            return np.empty(0, dtype=np.int32)
+        return self.document_ids[self.indptr[token_id] : self.indptr[token_id + 1]]
+
+    def union(self, words: list[str]) -> np.ndarray:
+        """Returns sorted IDs of documents that contain any of `words`"""
+        return reduce(
+            np.union1d, (self.documents(word) for word in words), np.empty(0, np.int32)
+        )
+
+    def intersection(self, words: list[str]) -> np.ndarray:
+        """Returns sorted IDs of documents that contain all `words` (rarest word first)"""
+        if not words:
+            return np.empty(0, dtype=np.int32)
+        postings: list[np.ndarray] = sorted(
+            (self.documents(word) for word in words), key=len
+        )
+        return reduce(
+            lambda a, b: np.intersect1d(a, b, assume_unique=True),
+            postings[1:],
+            postings[0],
+        )
+
+
+@click.command()
+@click.option("--folder", help="DTM corpus folder (defaults to FOLDER in env file)")
+@click.option("--tag", help="DTM corpus tag (defaults to TAG in env file)")
+@click.option("--env_file", default=".env", help="Path to .env file")
+@click.option("--target_folder", default=None, help="Target folder for postings")
+def build_postings(folder: str, tag: str, env_file: str, target_folder: str) -> None:
+    """Builds postings index for a DTM corpus (must be rebuilt when the corpus changes)"""
+    load_dotenv(env_file)
+    folder = folder or os.getenv("FOLDER")
+    tag = tag or os.getenv("TAG")
+    postings: PostingsIndex = PostingsIndex.build(
+        folder=folder, tag=tag, target_folder=target_folder
+    )
+    logger.info(
+        f"stored postings index ({len(postings.document_ids)} postings) in "
+        f"{target_folder or postings_folder(folder, tag)}"
+    )
+
+
+if __name__ == "__main__":
+    build_postings()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+Selections = tuple[tuple[str, tuple[Any, ...]], ...]
+
+
+def _scalar(value: Any) -> Any:
+    """Converts NumPy scalars to Python scalars (so that equal values are equal keys)"""
+    return value.item() if hasattr(value, "item") else value
+
+
+def freeze_selections(selections: dict | Selections | None) -> Selections:
+    """Returns selections as sorted (key, sorted distinct values) pairs"""
+    items: Iterable = (
+        selections.items() if isinstance(selections, dict) else selections or ()
+    )
+    frozen: list[tuple[str, tuple[Any, ...]]] = []
+    for key, values in items:
+        if values is None:
+            continue
+        if isinstance(values, (str, int)) or not isinstance(values, Iterable):
+            values = [values]
+        distinct: set = {_scalar(value) for value in values}
+        try:
+            frozen.append((key, tuple(sorted(distinct))))
+        except TypeError:
+            frozen.append((key, tuple(sorted(distinct, key=str))))
+    return tuple(sorted(frozen))
+
+
+def canonical_selections(selections: dict | Selections | None) -> dict[str, list]:
+    """Returns a new dict with sorted keys and sorted distinct values (input is never mutated)"""
+    return {key: list(values) for key, values in freeze_selections(selections)}
+
+
+def normalize_terms(terms: Iterable[str] | str | None) -> tuple[str, ...]:
+    """Strips and lower-cases search terms (order is kept, since it matters for phrases)"""
+    if isinstance(terms, str):
+        terms = terms.split(" ")
+    return tuple(term.strip().lower() for term in terms or [] if term.strip())
+
+
+@dataclass(frozen=True)
+class SearchQuery:
+    """Canonical, immutable and hashable search request shared by KWIC, word trends and speech listings.
+
+    Equivalent requests (e.g. same filter values selected in different order) are equal, and hence
+    share cache entries.
+    """
+
+    terms: tuple[str, ...] = ()
+    from_year: int | None = None
+    to_year: int | None = None
+    selections: Selections = field(default=())
+    lemmatized: bool = True
+    words_before: int = 2
+    words_after: int = 2
+
+    @staticmethod
+    def create(
+        terms: Iterable[str] | str = None,
+        from_year: int = None,
+        to_year: int = None,
+        selections: dict | Selections = None,
+        lemmatized: bool = True,
+        words_before: int = 2,
+        words_after: int = 2,
+    ) -> "SearchQuery":
+        return SearchQuery(
+            terms=normalize_terms(terms),
+            from_year=None if from_year is None else int(from_year),
+            to_year=None if to_year is None else int(to_year),
+            selections=freeze_selections(selections),
+            lemmatized=bool(lemmatized),
+            words_before=int(words_before),
+            words_after=int(words_after),
+        )
+
+    @property
+    def selections_dict(self) -> dict[str, list]:
+        """Selections as a new dict of lists (safe to mutate)"""
+        return canonical_selections(self.selections)
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import glob
+import json
+import os
+from os.path import join as jj
+
+import click
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from dotenv import load_dotenv
+from loguru import logger
+from penelope import corpus as pc  # type: ignore
+
+from swedeb_demo.api.parlaclarin.word_vectors import group_indicator
+
+CUBE_VERSION: int = 1
+CUBE_PIVOT_KEYS: tuple[str, ...] = ("party_id", "gender_id")
+CUBE_TEMPORAL_KEY: str = "year"
+
+
+def cube_folder(folder: str, tag: str) -> str:
+    """Returns default location of the trends cube for the corpus `tag` in `folder`"""
+    return jj(folder, f"{tag}_trends_cube")
+
+
+def corpus_fingerprint(folder: str, tag: str) -> dict[str, list[int]]:
+    """Returns (size, mtime) of all files that belongs to the corpus `tag` in `folder`"""
+    return {
+        os.path.basename(filename): [
+            os.path.getsize(filename),
+            int(os.path.getmtime(filename)),
+        ]
+        for filename in sorted(glob.glob(jj(folder, f"{tag}_*")))
+        if os.path.isfile(filename)
+    }
+
+
+class TrendsCube:
+    """Precomputed sparse aggregate of term counts per (year, party_id, gender_id) combination.
+
+    The cube is a CSC matrix with one row per *existing* combination (cell) and one column per term,
+    so that trends for a handful of words are answered by slicing a few columns, masking cells on
+    the selected party/gender IDs and summing over the requested pivot keys.
+    """
+
+    def __init__(
+        self,
+        *,
+        cube: sp.csc_matrix,
+        cells: pd.DataFrame,
+        metadata: dict = None,
+    ):
+        self.cube: sp.csc_matrix = cube
+        self.cells: pd.DataFrame = cells
+        self.metadata: dict = metadata or {}
+
+    @property
+    def keys(self) -> list[str]:
+        return list(self.cells.columns)
+
+    @property
+    def pivot_keys(self) -> list[str]:
+        return [key for key in self.keys if key != CUBE_TEMPORAL_KEY]
+
+    @staticmethod
+    def compute(
+        corpus: pc.VectorizedCorpus, pivot_keys: tuple[str, ...] = CUBE_PIVOT_KEYS
+    ) -> "TrendsCube":
+        """Aggregates `corpus` DTM to one row per distinct (year, *pivot_keys) combination"""
+        keys: list[str] = [CUBE_TEMPORAL_KEY] + list(pivot_keys)
+        indicator, cells = group_indicator(corpus.document_index, keys)
+        cells = cells.astype({CUBE_TEMPORAL_KEY: np.int16}).astype(
+            {key: np.int8 for key in pivot_keys}
+        )
+        cube: sp.csc_matrix = (indicator @ corpus.bag_term_matrix).tocsc()
+        cube.sort_indices()
+
+        return TrendsCube(cube=cube, cells=cells)
+
+    def store(self, target_folder: str, metadata: dict = None) -> "TrendsCube":
+        os.makedirs(target_folder, exist_ok=True)
+        np.save(jj(target_folder, "cube_data.npy"), self.cube.data)
+        np.save(jj(target_folder, "cube_indices.npy"), self.cube.indices)
+        np.save(jj(target_folder, "cube_indptr.npy"), self.cube.indptr)
+        np.save(jj(target_folder, "cells.npy"), self.cells.values.astype(np.int16))
+        self.metadata = {
+            **(metadata or {}),
+            "version": CUBE_VERSION,
+            "keys": self.keys,
+            "shape": list(self.cube.shape),
+        }
+        with open(jj(target_folder, "metadata.json"), "w", encoding="utf-8") as fp:
+            json.dump(self.metadata, fp, indent=2)
+        return self
+
+    @staticmethod
+    def load(source_folder: str) -> "TrendsCube":
+        """Loads cube with matrix data memory-mapped (read-only)"""
+        with open(jj(source_folder, "metadata.json"), "r", encoding="utf-8") as fp:
+            metadata: dict = json.load(fp)
+        cube: sp.csc_matrix = sp.csc_matrix(
+            (
+                np.load(jj(source_folder, "cube_data.npy"), mmap_mode="r"),
+                np.load(jj(source_folder, "cube_indices.npy"), mmap_mode="r"),
+                np.load(jj(source_folder, "cube_indptr.npy"), mmap_mode="r"),
+            ),
+            shape=tuple(metadata["shape"]),
+            copy=False,
+        )
+        keys: list[str] = metadata["keys"]
+        cells: pd.DataFrame = pd.DataFrame(
+            np.load(jj(source_folder, "cells.npy")), columns=keys
+        ).astype({key: np.int8 for key in keys if key != CUBE_TEMPORAL_KEY})
+        return TrendsCube(cube=cube, cells=cells, metadata=metadata)
+
+    @staticmethod
+    def build(
+        *,
+        folder: str,
+        tag: str,
+        target_folder: str = None,
+        corpus: pc.VectorizedCorpus = None,
+    ) -> "TrendsCube":
+        """Computes and stores cube for corpus `tag` in `folder`"""
+        corpus = corpus or pc.VectorizedCorpus.load(folder=folder, tag=tag)
+        return TrendsCube.compute(corpus).store(
+            target_folder or cube_folder(folder, tag),
+            metadata={
+                "tag": tag,
+                "folder": os.path.abspath(folder),
+                "fingerprint": corpus_fingerprint(folder, tag),
+                "n_documents": corpus.bag_term_matrix.shape[0],
+            },
+        )
+
+    def is_valid(self, *, folder: str, tag: str, corpus: pc.VectorizedCorpus) -> bool:
+        """Checks that cube was computed from the (unchanged) corpus `tag` in `folder`"""
+        return (
+            self.metadata.get("version") == CUBE_VERSION
+            and self.metadata.get("tag") == tag
+            and self.metadata.get("folder") == os.path.abspath(folder)
+            and self.metadata.get("fingerprint") == corpus_fingerprint(folder, tag)
+            and self.metadata.get("n_documents") == corpus.bag_term_matrix.shape[0]
+            and self.cube.shape[1] == corpus.bag_term_matrix.shape[1]
+        )
+
+    @staticmethod
+    def load_if_valid(
+        *, folder: str, tag: str, corpus: pc.VectorizedCorpus, source_folder: str = None
+    ) -> "TrendsCube | None":
+        """Returns stored cube if it exists and is valid for given corpus, otherwise None"""
+        source_folder = source_folder or cube_folder(folder, tag)
+        if not os.path.isfile(jj(source_folder, "metadata.json")):
+            return None
+        try:
+            trends_cube: TrendsCube = TrendsCube.load(source_folder)
+            if trends_cube.is_valid(folder=folder, tag=tag, corpus=corpus):
+                return trends_cube
+            logger.warning(f"trends cube {source_folder} is stale, please rebuild")
+        except Exception as ex:  # pylint: disable=broad-except
+            logger.error(f"unable to load trends cube {source_folder}: {ex}")
+        return None
+
+    def can_answer(self, filter_keys: list[str]) -> bool:
+        """True if a trends query filtered/pivoted on `filter_keys` can be answered by the cube"""
+        return all(key in self.pivot_keys for key in filter_keys)
+
+    def extract(
+        self,
+        *,
+        token_ids: list[int],
+        words: list[str],
+        filter_opts: dict,
+        pivot_keys: list[str],
+    ) -> pd.DataFrame:
+        """Returns frame with columns year, `pivot_keys` and `words` (same layout as `TrendsService.extract`)"""
+        mask: np.ndarray = np.ones(len(self.cells), dtype=bool)
+        for key, values in (filter_opts or {}).items():
+            mask &= self.cells[key].isin(values).values
+
+        counts: np.ndarray = self.cube[:, token_ids].toarray()[mask]
+        keys: list[str] = [CUBE_TEMPORAL_KEY] + list(pivot_keys)
+        data: pd.DataFrame = pd.concat(
+            [
+                self.cells.loc[mask, keys].reset_index(drop=True),
+                pd.DataFrame(data=counts, columns=words),
+            ],
+            axis=1,
+        )
+        return data.groupby(keys, as_index=False, sort=True)[words].sum()
+
+
+@click.command()
+@click.option("--folder", help="DTM corpus folder (defaults to FOLDER in env file)")
+@click.option("--tag", help="DTM corpus tag (defaults to TAG in env file)")
+@click.option("--env_file", default=".env", help="Path to .env file")
+@click.option("--target_folder", default=None, help="Target folder for cube")
+def build_trends_cube(folder: str, tag: str, env_file: str, target_folder: str) -> None:
+    """Builds trends cube for a DTM corpus (must be rebuilt when the corpus changes)"""
+    load_dotenv(env_file)
+    folder = folder or os.getenv("FOLDER")
+    tag = tag or os.getenv("TAG")
+    trends_cube: TrendsCube = TrendsCube.build(
+        folder=folder, tag=tag, target_folder=target_folder
+    )
+    logger.info(
+        f"stored trends cube {trends_cube.cube.shape} in "
+        f"{target_folder or cube_folder(folder, tag)}"
+    )
+
+
+if __name__ == "__main__":
+    build_trends_cube()  # pylint: disable=no-value-for-parameter
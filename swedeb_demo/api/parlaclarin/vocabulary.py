@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import fnmatch
+import re
+from functools import cached_property, reduce
+from typing import Callable, Iterable
+
+import numpy as np
+
+WILDCARDS: re.Pattern = re.compile(r"\*|\?|\[[^\]]*\]")
+MAX_CHAR: str = "\U0010ffff"
+
+
+def trigram_codes(codepoints: np.ndarray) -> np.ndarray:
+    """Returns (n x len-2) int64 codes of trigrams in (n x len) codepoints (21 bits per character)"""
+    codepoints = codepoints.astype(np.int64)
+    return (codepoints[:, :-2] << 42) | (codepoints[:, 1:-1] << 21) | codepoints[:, 2:]
+
+
+def word_trigram_codes(word: str) -> np.ndarray:
+    if len(word) < 3:
+        return np.empty(0, dtype=np.int64)
+    return trigram_codes(np.array([word]).view(np.uint32).reshape(1, -1))[0]
+
+
+class TrigramIndex:
+    """Maps each trigram (encoded as int64) to the sorted positions of the words that contain it.
+
+    The index is built vectorized, one bucket of equal length words at a time, and is stored in
+    CSR layout: postings of `codes[i]` are `word_ids[indptr[i]:indptr[i + 1]]`.
+    """
+
+    def __init__(self, words: np.ndarray):
+        lengths: np.ndarray = np.fromiter((len(w) for w in words), np.int32, len(words))
+        codes: list[np.ndarray] = []
+        word_ids: list[np.ndarray] = []
+        for length in np.unique(lengths[lengths >= 3]):
+            ids: np.ndarray = np.flatnonzero(lengths == length)
+            codepoints: np.ndarray = (
+                words[ids].astype(f"U{length}").view(np.uint32).reshape(len(ids), -1)
+            )
+            codes.append(trigram_codes(codepoints).ravel())
+            word_ids.append(np.repeat(ids, length - 2).astype(np.int32))
+
+        all_codes: np.ndarray = (
+            np.concatenate(codes) if codes else np.empty(0, np.int64)
+        )
+        all_ids: np.ndarray = (
+            np.concatenate(word_ids) if word_ids else np.empty(0, np.int32)
+        )
+        order: np.ndarray = np.lexsort((all_ids, all_codes))
+        all_codes, all_ids = all_codes[order], all_ids[order]
+
+        """Drop duplicates (same trigram occurring more than once in a word)"""
+        keep: np.ndarray = np.ones(len(all_codes), dtype=bool)
+        keep[1:] = (all_codes[1:] != all_codes[:-1]) | (all_ids[1:] != all_ids[:-1])
+        all_codes, self.word_ids = all_codes[keep], all_ids[keep]
+
+        starts: np.ndarray = np.flatnonzero(
+            np.concatenate([[True], all_codes[1:] != all_codes[:-1]])
+        )
+        self.codes: np.ndarray = all_codes[starts]
+        self.indptr: np.ndarray = np.append(starts, len(all_codes))
+
+    def postings(self, code: int) -> np.ndarray:
+        i: int = int(np.searchsorted(self.codes, code))
+        if i == len(self.codes) or self.codes[i] != code:
+            return np.empty(0, dtype=np.int32)
+        return self.word_ids[self.indptr[i] : self.indptr[i + 1]]
+
+    def find(self, fragment: str) -> np.ndarray:
+        """Returns sorted positions of words that contains all trigrams in `fragment` (len >= 3)"""
+        postings: list[np.ndarray] = sorted(
+            (self.postings(code) for code in set(word_trigram_codes(fragment))), key=len
+        )
+        return reduce(
+            lambda a, b: np.intersect1d(a, b, assume_unique=True),
+            postings[1:],
+            postings[0],
+        )
+
+
+class VocabularyIndex:
+    """Frequency-ranked index of the corpus vocabulary for exact, prefix and wildcard lookups.
+
+    Words are kept in a sorted array so that words having a given prefix is a contiguous range
+    found by binary search. Other wildcard patterns (e.g. `*skola*`) are matched against
+    candidates that contain the pattern's literal fragments, found using a trigram index that
+    is built on first use. Matches are ranked by corpus frequency.
+    """
+
+    def __init__(self, words: Iterable[str], frequencies: Iterable[int]):
+        words = np.asarray(list(words), dtype=object)
+        order: np.ndarray = np.argsort(words, kind="stable")
+        self.words: np.ndarray = words[order]
+        self.frequencies: np.ndarray = np.asarray(frequencies, dtype=np.int64)[order]
+
+    @staticmethod
+    def create(
+        token2id: dict[str, int], term_frequency: np.ndarray
+    ) -> "VocabularyIndex":
+        term_frequency = np.asarray(term_frequency).ravel()
+        return VocabularyIndex(
+            token2id.keys(), term_frequency[np.fromiter(token2id.values(), np.int64)]
+        )
+
+    @cached_property
+    def trigrams(self) -> TrigramIndex:
+        return TrigramIndex(self.words)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __contains__(self, word: str) -> bool:
+        i: int = int(np.searchsorted(self.words, word))
+        return i < len(self.words) and self.words[i] == word
+
+    def prefix_range(self, prefix: str) -> tuple[int, int]:
+        """Returns range of (sorted) positions of words that start with `prefix`"""
+        if not prefix:
+            return 0, len(self.words)
+        return (
+            int(np.searchsorted(self.words, prefix, side="left")),
+            int(np.searchsorted(self.words, prefix + MAX_CHAR, side="left")),
+        )
+
+    def top(self, ids: np.ndarray, n: int) -> list[str]:
+        """Returns the (at most) `n` most frequent words among positions `ids` (ties in alphabetical order)"""
+        frequencies: np.ndarray = self.frequencies[ids]
+        if n is not None and len(ids) > n:
+            selected: np.ndarray = np.argpartition(-frequencies, n - 1)[:n]
+            ids, frequencies = ids[selected], frequencies[selected]
+        return self.words[ids[np.lexsort((ids, -frequencies))]].tolist()
+
+    def candidates(self, pattern: str) -> np.ndarray:
+        """Returns sorted positions of words that may match the (fnmatch) `pattern`"""
+        fragments: list[str] = WILDCARDS.split(pattern)
+        lo, hi = self.prefix_range(fragments[0])
+        trigram_fragments: list[str] = [x for x in fragments[1:] if len(x) >= 3]
+        if not trigram_fragments:
+            return np.arange(lo, hi)
+        ids: np.ndarray = reduce(
+            lambda a, b: np.intersect1d(a, b, assume_unique=True),
+            (self.trigrams.find(fragment) for fragment in trigram_fragments),
+        )
+        return ids[(ids >= lo) & (ids < hi)]
+
+    def match(self, pattern: str) -> np.ndarray:
+        """Returns sorted positions of words that match `pattern` (word, fnmatch pattern or |regexp|)
+
+        Only patterns that contain `*` are fnmatch patterns (other wildcards are then also
+        expanded), any other word (e.g. `?`) is looked up as is.
+        """
+        if len(pattern) > 1 and pattern.startswith("|") and pattern.endswith("|"):
+            ids: np.ndarray = np.arange(len(self.words))
+            matcher: Callable = re.compile(pattern.strip("|")).match
+        elif "*" not in pattern:
+            i: int = int(np.searchsorted(self.words, pattern))
+            found: bool = i < len(self.words) and self.words[i] == pattern
+            return np.arange(i, i + 1) if found else np.empty(0, dtype=np.int64)
+        elif pattern.endswith("*") and not WILDCARDS.search(pattern[:-1]):
+            return np.arange(*self.prefix_range(pattern[:-1]))
+        else:
+            ids = self.candidates(pattern)
+            matcher = re.compile(fnmatch.translate(pattern)).match
+        matches: np.ndarray = np.fromiter(
+            (matcher(word) is not None for word in self.words[ids]), bool, len(ids)
+        )
+        return ids[matches]
+
+    def find(self, pattern: str, n: int = 5) -> list[str]:
+        """Returns the `n` most frequent words that match `pattern`"""
+        return self.top(self.match(pattern), n)
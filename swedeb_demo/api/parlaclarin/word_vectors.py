@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from functools import cached_property
+from typing import Hashable, NamedTuple
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from penelope import corpus as pc  # type: ignore
+
+from swedeb_demo.api.cache import LRUCache
+
+
+def group_indicator(
+    document_index: pd.DataFrame, keys: list[str]
+) -> tuple[sp.csr_matrix, pd.DataFrame]:
+    """Returns (groups x documents) 0/1 matrix and the distinct (sorted) `keys` values of each group"""
+    di: pd.DataFrame = document_index[keys]
+    group_ids: np.ndarray = di.groupby(keys, sort=True).ngroup().values
+    groups: pd.DataFrame = di.drop_duplicates().sort_values(keys).reset_index(drop=True)
+    n_documents: int = len(group_ids)
+    indicator: sp.csr_matrix = sp.csr_matrix(
+        (np.ones(n_documents, dtype=np.int32), (group_ids, np.arange(n_documents))),
+        shape=(len(groups), n_documents),
+    )
+    return indicator, groups
+
+
+class Grouping(NamedTuple):
+    """Selected documents (None if all) and their (groups x documents) indicator for some keys"""
+
+    rows: np.ndarray | None
+    indicator: sp.csr_matrix
+    groups: pd.DataFrame
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            (0 if self.rows is None else self.rows.nbytes)
+            + self.indicator.data.nbytes
+            + self.indicator.indices.nbytes
+            + self.indicator.indptr.nbytes
+            + int(self.groups.memory_usage(deep=True).sum())
+        )
+
+
+class WordVectors:
+    """Extracts DTM columns for a batch of words in a single slice of a (once converted) CSC matrix.
+
+    Columns are returned as a sparse (documents x words) matrix, and can be aggregated over groups
+    of documents (e.g. year and party) with a sparse matrix product, without any dense vectors of
+    corpus length. Groupings (the filtered and grouped documents) only depend on keys and filter,
+    and are kept in a size-bounded LRU cache so that a search with other words reuses them.
+    """
+
+    def __init__(
+        self, corpus: pc.VectorizedCorpus, max_cached_bytes: int = 256 * 1024**2
+    ):
+        self.corpus: pc.VectorizedCorpus = corpus
+        self.groupings: LRUCache[Grouping] = LRUCache(
+            max_bytes=max_cached_bytes, sizeof=lambda grouping: grouping.nbytes
+        )
+
+    @cached_property
+    def csc(self) -> sp.csc_matrix:
+        csc: sp.csc_matrix = sp.csc_matrix(self.corpus.bag_term_matrix)
+        csc.sort_indices()
+        return csc
+
+    def known_words(self, words: list[str]) -> list[str]:
+        """Returns distinct words in `words` that exists in the corpus vocabulary (order is kept)"""
+        return [word for word in dict.fromkeys(words) if word in self.corpus.token2id]
+
+    def vectors(self, words: list[str]) -> sp.csc_matrix:
+        """Returns (documents x words) counts, unknown words have all-zero columns"""
+        token2id: dict[str, int] = self.corpus.token2id
+        token_ids: np.ndarray = np.array(
+            [token2id.get(word, -1) for word in words], dtype=np.int64
+        )
+        known: np.ndarray = token_ids >= 0
+        vectors: sp.csc_matrix = self.csc[:, np.where(known, token_ids, 0)]
+        if not known.all():
+            vectors = (vectors @ sp.diags(known.astype(vectors.dtype))).tocsc()
+            vectors.eliminate_zeros()
+        return vectors
+
+    def grouping(self, keys: list[str], mask: np.ndarray = None) -> Grouping:
+        """Groups documents in `mask` (all if None) on distinct `keys`"""
+        document_index: pd.DataFrame = self.corpus.document_index
+        rows: np.ndarray | None = None if mask is None else np.flatnonzero(mask)
+        if rows is not None:
+            document_index = document_index.iloc[rows]
+        indicator, groups = group_indicator(document_index, keys)
+        return Grouping(rows, indicator, groups)
+
+    def aggregate(
+        self,
+        words: list[str],
+        keys: list[str],
+        mask: np.ndarray = None,
+        cache_key: Hashable = None,
+    ) -> pd.DataFrame:
+        """Returns frame with columns `keys` and `words`, with counts summed over documents (in `mask`) per distinct `keys`
+
+        If given, `cache_key` must identify `mask` (e.g. the filter it was compiled from), and
+        the grouping is then cached.
+        """
+        grouping: Grouping = (
+            self.grouping(keys, mask)
+            if cache_key is None
+            else self.groupings.get_or_create(
+                (tuple(keys), cache_key), lambda: self.grouping(keys, mask)
+            )
+        )
+        vectors: sp.csc_matrix = self.vectors(words)
+        if grouping.rows is not None:
+            vectors = vectors[grouping.rows]
+        counts: np.ndarray = (grouping.indicator @ vectors).toarray()
+        return pd.concat(
+            [grouping.groups, pd.DataFrame(data=counts, columns=words)], axis=1
+        )
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import os
+import resource
+import sys
+import threading
+from concurrent.futures import Future
+from typing import Callable
+
+from loguru import logger
+from penelope import corpus as pc  # type: ignore
+
+from swedeb_demo.api.dummy_api import ADummyApi
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+ApiKey = tuple[str, str, str]
+
+
+def corpus_nbytes(corpus: pc.VectorizedCorpus) -> int:
+    """Estimated memory size of `corpus` DTM and document index"""
+    return int(corpus.nbytes() or 0) + int(
+        corpus.document_index.memory_usage(index=True, deep=False).sum()
+    )
+
+
+def resident_memory() -> int:
+    """Returns resident set size (bytes) of current process"""
+    if psutil is not None:
+        return psutil.Process(os.getpid()).memory_info().rss
+    try:
+        with open("/proc/self/statm", "r", encoding="utf-8") as fp:
+            return int(fp.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        """Peak RSS (in KB on Linux, bytes on macOS)"""
+        max_rss: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+class ApiRegistry:
+    """Process-wide registry of API instances that are shared by all (Streamlit) sessions.
+
+    Instances are keyed by (env_file, corpus_dir, corpus_name). Each instance is created once (by
+    `factory`), concurrent requests for an instance that is being loaded wait for the same load to
+    finish. A failed load is not kept, so the next request tries again.
+    """
+
+    def __init__(self, factory: Callable[[str, str, str], ADummyApi] = ADummyApi):
+        self.factory: Callable[[str, str, str], ADummyApi] = factory
+        self.apis: dict[ApiKey, Future] = {}
+        self.lock: threading.Lock = threading.Lock()
+
+    @staticmethod
+    def key(env_file: str, corpus_dir: str, corpus_name: str) -> ApiKey:
+        return (os.path.abspath(env_file), os.path.abspath(corpus_dir), corpus_name)
+
+    def get(self, env_file: str, corpus_dir: str, corpus_name: str) -> ADummyApi:
+        key: ApiKey = self.key(env_file, corpus_dir, corpus_name)
+        with self.lock:
+            future: Future | None = self.apis.get(key)
+            is_creator: bool = future is None
+            if is_creator:
+                future = self.apis[key] = Future()
+
+        if is_creator:
+            try:
+                logger.info(f"ApiRegistry: creating API {key}")
+                future.set_result(self.factory(env_file, corpus_dir, corpus_name))
+                logger.info(f"ApiRegistry: {self.memory_usage()}")
+            except BaseException as ex:
+                with self.lock:
+                    del self.apis[key]
+                future.set_exception(ex)
+
+        return future.result()
+
+    def evict(self, env_file: str, corpus_dir: str, corpus_name: str) -> None:
+        """Removes API instance from registry (freed when no session refers to it)"""
+        key: ApiKey = self.key(env_file, corpus_dir, corpus_name)
+        with self.lock:
+            self.apis.pop(key, None)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.apis.clear()
+
+    def memory_usage(self) -> dict:
+        """Returns process RSS and estimated size of each loaded API's DTM corpus (bytes)"""
+        with self.lock:
+            loaded: dict[ApiKey, Future] = {
+                key: future
+                for key, future in self.apis.items()
+                if future.done() and future.exception() is None
+            }
+        return {
+            "rss": resident_memory(),
+            "apis": {
+                "|".join(key): corpus_nbytes(future.result().corpus)
+                for key, future in loaded.items()
+            },
+        }
+
+
+registry: ApiRegistry = ApiRegistry()
+
+
+def get_api(env_file: str, corpus_dir: str, corpus_name: str) -> ADummyApi:
+    """Returns API instance shared by all sessions in this process"""
+    return registry.get(env_file, corpus_dir, corpus_name)
@@ -4,11 +4,13 @@ import sqlite3
 from contextlib import nullcontext
 from dataclasses import dataclass
 from functools import cached_property
-from typing import Callable, Literal, Mapping
+from typing import Any, Callable, Literal, Mapping
 
+import numpy as np
 import pandas as pd
 from penelope import utility as pu
 
+from .codecs_snapshot import load_snapshot_if_valid
 from .utility import load_tables
 
 CODE_TABLENAMES: dict[str, str] = {
@@ -29,6 +31,81 @@ class Codec:
     fx: Callable[[int], str]
     default: str = None
 
+    @property
+    def mapping(self) -> dict | None:
+        """The dict that `fx` looks up values in (if `fx` is a dict's `get`)"""
+        owner: Any = getattr(self.fx, "__self__", None)
+        return owner if isinstance(owner, dict) else None
+
+
+class CodecLookup:
+    """Vectorized dict lookup that translates a series into a pandas `Categorical`.
+
+    Each distinct translated value is assigned a category code once. Categories are sorted so
+    that sorting, grouping and unstacking gives the same order as for plain string columns.
+    Integer keys in a reasonably dense range (e.g. party_id, gender_id, pid) are translated by
+    `take` on a code array indexed by key, other keys (e.g. person_id) by a single
+    `Index.get_indexer` lookup. Unknown keys are translated to `default` (NaN if no default).
+    """
+
+    MAX_DENSE_KEY: int = 2**24
+
+    def __init__(self, mapping: dict, default: str = None):
+        values: pd.Series = pd.Series(list(mapping.values()), dtype=object)
+        categories: list = list(pd.unique(values.dropna()))
+        if default is not None and default not in categories:
+            categories.append(default)
+        categories = sorted(categories, key=str)
+
+        self.categories: pd.Index = pd.Index(categories, dtype=object)
+        self.missing_code: int = (
+            -1 if default is None else self.categories.get_loc(default)
+        )
+        self.keys: pd.Index = pd.Index(list(mapping.keys()))
+
+        codes: np.ndarray = self.categories.get_indexer(values).astype(np.int32)
+        codes[codes < 0] = self.missing_code
+
+        """Extra trailing slot so that unknown keys (indexer -1) maps to missing code"""
+        self.key_codes: np.ndarray = np.append(codes, np.int32(self.missing_code))
+
+        self.dense_codes: np.ndarray | None = None
+        if len(self.keys) > 0 and pd.api.types.is_integer_dtype(self.keys.dtype):
+            keys: np.ndarray = self.keys.values.astype(np.int64)
+            if keys.min() >= 0 and keys.max() < self.MAX_DENSE_KEY:
+                self.dense_codes = np.full(
+                    keys.max() + 2, self.missing_code, dtype=np.int32
+                )
+                self.dense_codes[keys] = codes
+
+    def codes(self, values: pd.Series) -> np.ndarray:
+        """Returns category codes for `values`"""
+        if self.dense_codes is not None and pd.api.types.is_integer_dtype(values.dtype):
+            keys: np.ndarray = values.values.astype(np.int64, copy=False)
+            missing: int = len(self.dense_codes) - 1
+            return self.dense_codes.take(
+                np.where((keys >= 0) & (keys < missing), keys, missing)
+            )
+        """Hash each distinct value once (factorize is faster than a full `get_indexer`)"""
+        value_codes, uniques = pd.factorize(values)
+        unique_codes: np.ndarray = self.key_codes.take(self.keys.get_indexer(uniques))
+        return np.append(unique_codes, np.int32(self.missing_code)).take(value_codes)
+
+    def translate(self, values: pd.Series) -> pd.Series:
+        """Returns translated `values` as a categorical series (only observed categories)"""
+        codes: np.ndarray = self.codes(values)
+        used: np.ndarray = (
+            np.bincount(codes[codes >= 0], minlength=len(self.categories)) > 0
+        )
+        """Renumber codes so that only used categories are kept (-1 stays -1)"""
+        renumber: np.ndarray = np.append(
+            np.cumsum(used, dtype=np.int32) - 1, np.int32(-1)
+        )
+        categorical: pd.Categorical = pd.Categorical.from_codes(
+            renumber.take(codes), dtype=pd.CategoricalDtype(self.categories[used])
+        )
+        return pd.Series(categorical, index=values.index)
+
 
 null_frame: pd.DataFrame = pd.DataFrame()
 
@@ -43,9 +120,24 @@ class Codecs:
         self.sub_office_type: pd.DataFrame = null_frame
         self.extra_codecs: list[Codec] = []
         self.source_filename: str | None = None
+        self.lookups: dict[tuple, CodecLookup] = {}
 
-    def load(self, source: str | sqlite3.Connection | str) -> Codecs:
+    def load(
+        self, source: str | sqlite3.Connection | dict, use_snapshot: bool = True
+    ) -> Codecs:
+        """Loads code tables from database, or from a dict of already loaded tables
+
+        If `source` is a database file with a valid columnar snapshot (see `codecs_snapshot`), then
+        tables are loaded from the snapshot instead.
+        """
         self.source_filename = source if isinstance(source, str) else None
+        self.lookups = {}
+        if isinstance(source, str) and use_snapshot:
+            source = load_snapshot_if_valid(source, list(self.tablenames())) or source
+        if isinstance(source, dict):
+            for table_name in self.tablenames():
+                setattr(self, table_name, source[table_name])
+            return self
         with (
             sqlite3.connect(database=source)
             if isinstance(source, str)
@@ -122,14 +214,29 @@ class Codecs:
     def encoders(self) -> list[dict]:
         return [c for c in self.codecs if c.type == "encode"]
 
+    def lookup(self, codec: Codec) -> CodecLookup | None:
+        """Returns (cached) vectorized lookup for decoder `codec`, None if `fx` isn't a dict lookup"""
+        mapping: dict | None = codec.mapping
+        if mapping is None or codec.type != "decode":
+            return None
+        key: tuple = (codec.from_column, codec.to_column, id(mapping), codec.default)
+        if key not in self.lookups:
+            self.lookups[key] = CodecLookup(mapping, default=codec.default)
+        return self.lookups[key]
+
     def apply_codec(
         self, df: pd.DataFrame, codecs: list[Codec], drop: bool = True
     ) -> pd.DataFrame:
         for codec in codecs:
             if codec.from_column in df.columns:
                 if codec.to_column not in df:
-                    df[codec.to_column] = df[codec.from_column].apply(codec.fx)
-                if codec.default is not None:
+                    lookup: CodecLookup | None = self.lookup(codec)
+                    df[codec.to_column] = (
+                        lookup.translate(df[codec.from_column])
+                        if lookup is not None
+                        else df[codec.from_column].apply(codec.fx)
+                    )
+                if codec.default is not None and df[codec.to_column].hasnans:
                     df[codec.to_column] = df[codec.to_column].fillna(codec.default)
             if drop:
                 df.drop(columns=[codec.from_column], inplace=True, errors="ignore")
@@ -198,8 +305,10 @@ class PersonCodecs(Codecs):
         tables["persons_of_interest"] = "person_id"
         return tables
 
-    def load(self, source: str | sqlite3.Connection | dict) -> PersonCodecs:
-        super().load(source)
+    def load(
+        self, source: str | sqlite3.Connection | dict, use_snapshot: bool = True
+    ) -> PersonCodecs:
+        super().load(source, use_snapshot=use_snapshot)
         if "pid" not in self.persons_of_interest.columns:
             pi: pd.DataFrame = self.persons_of_interest.reset_index()
             pi["pid"] = pi.index
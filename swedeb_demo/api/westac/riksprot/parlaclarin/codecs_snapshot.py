@@ -0,0 +1,156 @@
+"""
+Columnar snapshot of the metadata code tables, stored in a folder next to the metadata database:
+
+    metadata.json               version, source fingerprint, and per table: index name and columns
+    <table>.<column>.npy        column values (strings are stored as fixed-width unicode)
+    <table>.<column>.isna.npy   missing value mask for string columns (only if any is missing)
+
+Tables are stored with slimmed types and indexes already set, and numeric columns are memory-mapped
+when loaded, so that loading is fast and pages can be shared between processes.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from os.path import join as jj
+
+import click
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+from loguru import logger
+
+SNAPSHOT_VERSION: int = 1
+
+
+def snapshot_folder(source: str) -> str:
+    """Returns default snapshot location for metadata database `source`"""
+    return f"{source}.codecs"
+
+
+def source_fingerprint(source: str) -> list[int]:
+    return [os.path.getsize(source), int(os.path.getmtime(source))]
+
+
+def _store_column(folder: str, name: str, values: np.ndarray) -> str:
+    """Stores column values, returns kind of stored data ("numeric" or "string")"""
+    if values.dtype.kind in "biufcmM":
+        np.save(jj(folder, f"{name}.npy"), values)
+        return "numeric"
+    isna: np.ndarray = pd.isna(values)
+    np.save(jj(folder, f"{name}.npy"), np.where(isna, "", values).astype(str))
+    if isna.any():
+        np.save(jj(folder, f"{name}.isna.npy"), isna)
+    return "string"
+
+
+def _load_column(folder: str, name: str, kind: str) -> np.ndarray:
+    values: np.ndarray = np.load(jj(folder, f"{name}.npy"), mmap_mode="r")
+    if kind == "numeric":
+        return values
+    values = values.astype(object)
+    if os.path.isfile(jj(folder, f"{name}.isna.npy")):
+        values[np.load(jj(folder, f"{name}.isna.npy"))] = None
+    return values
+
+
+def store_snapshot(
+    tables: dict[str, pd.DataFrame], target_folder: str, source: str = None
+) -> None:
+    """Stores (already loaded and slimmed) code tables as a columnar snapshot"""
+    os.makedirs(target_folder, exist_ok=True)
+    metadata: dict = {
+        "version": SNAPSHOT_VERSION,
+        "source": os.path.abspath(source) if source else None,
+        "fingerprint": source_fingerprint(source) if source else None,
+        "tables": {},
+    }
+    for table_name, table in tables.items():
+        index_name: str | None = table.index.name
+        data: pd.DataFrame = table.reset_index() if index_name else table
+        metadata["tables"][table_name] = {
+            "index": index_name,
+            "columns": {
+                column: _store_column(
+                    target_folder, f"{table_name}.{column}", data[column].values
+                )
+                for column in data.columns
+            },
+        }
+    with open(jj(target_folder, "metadata.json"), "w", encoding="utf-8") as fp:
+        json.dump(metadata, fp, indent=2)
+
+
+def load_snapshot(
+    source_folder: str, table_names: list[str]
+) -> dict[str, pd.DataFrame]:
+    """Loads code tables `table_names` from snapshot"""
+    with open(jj(source_folder, "metadata.json"), "r", encoding="utf-8") as fp:
+        metadata: dict = json.load(fp)
+    tables: dict[str, pd.DataFrame] = {}
+    for table_name in table_names:
+        spec: dict = metadata["tables"][table_name]
+        table: pd.DataFrame = pd.DataFrame(
+            {
+                column: _load_column(source_folder, f"{table_name}.{column}", kind)
+                for column, kind in spec["columns"].items()
+            },
+            copy=False,
+        )
+        if spec["index"]:
+            table.set_index(spec["index"], drop=True, inplace=True)
+        tables[table_name] = table
+    return tables
+
+
+def is_valid_snapshot(source_folder: str, source: str, table_names: list[str]) -> bool:
+    """Checks that snapshot exists, has all tables and was created from (unchanged) `source`"""
+    try:
+        with open(jj(source_folder, "metadata.json"), "r", encoding="utf-8") as fp:
+            metadata: dict = json.load(fp)
+    except (OSError, ValueError):
+        return False
+    return (
+        metadata.get("version") == SNAPSHOT_VERSION
+        and metadata.get("fingerprint") == source_fingerprint(source)
+        and all(name in metadata.get("tables", {}) for name in table_names)
+    )
+
+
+def load_snapshot_if_valid(
+    source: str, table_names: list[str]
+) -> dict[str, pd.DataFrame] | None:
+    """Returns tables from the default snapshot of `source` if it's valid, otherwise None"""
+    folder: str = snapshot_folder(source)
+    if not os.path.isfile(source) or not is_valid_snapshot(folder, source, table_names):
+        return None
+    try:
+        return load_snapshot(folder, table_names)
+    except Exception as ex:  # pylint: disable=broad-except
+        logger.error(f"unable to load codecs snapshot {folder}: {ex}")
+        return None
+
+
+@click.command()
+@click.option("--metadata_filename", default=None, help="Metadata database")
+@click.option("--env_file", default=".env", help="Path to .env file")
+def build_codecs_snapshot(metadata_filename: str, env_file: str) -> None:
+    """Builds a columnar snapshot of the metadata code tables (must be rebuilt if database changes)"""
+    from .codecs import PersonCodecs  # pylint: disable=import-outside-toplevel
+
+    load_dotenv(env_file)
+    metadata_filename = metadata_filename or os.getenv("METADATA_FILENAME")
+    person_codecs: PersonCodecs = PersonCodecs().load(
+        source=metadata_filename, use_snapshot=False
+    )
+    store_snapshot(
+        {name: getattr(person_codecs, name) for name in person_codecs.tablenames()},
+        snapshot_folder(metadata_filename),
+        source=metadata_filename,
+    )
+    logger.info(f"stored codecs snapshot in {snapshot_folder(metadata_filename)}")
+
+
+if __name__ == "__main__":
+    build_codecs_snapshot()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from typing import Callable
+
+import click
+from dotenv import load_dotenv
+from loguru import logger
+
+try:
+    import github as gh
+except ImportError:
+    gh = None
+
+RIKSDAGEN_CORPUS_REPOSITORY: str = "welfare-state-analytics/riksdagen-corpus"
+DEFAULT_RELEASE_TAGS: list[str] = ["main", "dev"]
+DEFAULT_TTL: int = 7 * 24 * 60 * 60
+
+
+def default_cache_filename() -> str:
+    return os.environ.get(
+        "RELEASE_TAGS_CACHE",
+        os.path.join(
+            os.path.expanduser("~"),
+            ".cache",
+            "swedeb",
+            "riksdagen_corpus_releases.json",
+        ),
+    )
+
+
+def fetch_github_release_tags(github_access_token: str = None) -> list[str]:
+    """Fetches release titles of the riksdagen-corpus repository from GitHub (raises on failure)"""
+    if gh is None:
+        raise ModuleNotFoundError("PyGithub is not installed")
+    access_token: str = github_access_token or os.environ.get(
+        "GITHUB_ACCESS_TOKEN", None
+    )
+    repository = gh.Github(access_token).get_repo(RIKSDAGEN_CORPUS_REPOSITORY)
+    return [x.title for x in repository.get_releases()]
+
+
+class ReleaseTagCache:
+    """Corpus release tags resolved from a local cache file, never from the network on the caller's thread.
+
+    If the cache is missing or older than `ttl` seconds, a background refresh is started (unless
+    disabled), and the tags known so far (at least `main` and `dev`) are returned immediately.
+    """
+
+    def __init__(
+        self,
+        filename: str = None,
+        ttl: int = DEFAULT_TTL,
+        background_refresh: bool = True,
+        fetcher: Callable[[], list[str]] = fetch_github_release_tags,
+    ):
+        self.filename: str = filename or default_cache_filename()
+        self.ttl: int = ttl
+        self.background_refresh: bool = background_refresh
+        self.fetcher: Callable[[], list[str]] = fetcher
+        self.lock: threading.Lock = threading.Lock()
+        self.refresh_thread: threading.Thread | None = None
+        self.data: dict | None = None
+
+    def load(self) -> dict:
+        """Returns cached data, i.e. `{"fetched_at": <epoch>, "tags": [...]}`"""
+        if self.data is None:
+            try:
+                with open(self.filename, "r", encoding="utf-8") as fp:
+                    self.data = json.load(fp)
+            except (OSError, ValueError):
+                self.data = {"fetched_at": 0, "tags": []}
+        return self.data
+
+    def store(self, tags: list[str]) -> None:
+        """Writes cache file atomically"""
+        data: dict = {"fetched_at": int(time.time()), "tags": list(tags)}
+        os.makedirs(os.path.dirname(os.path.abspath(self.filename)), exist_ok=True)
+        tmp_filename: str = f"{self.filename}.{os.getpid()}.tmp"
+        with open(tmp_filename, "w", encoding="utf-8") as fp:
+            json.dump(data, fp, indent=2)
+        os.replace(tmp_filename, self.filename)
+        self.data = data
+
+    @property
+    def is_stale(self) -> bool:
+        return time.time() - self.load().get("fetched_at", 0) > self.ttl
+
+    @property
+    def tags(self) -> list[str]:
+        if self.is_stale and self.background_refresh:
+            self.start_refresh()
+        return DEFAULT_RELEASE_TAGS + [
+            tag
+            for tag in self.load().get("tags", [])
+            if tag not in DEFAULT_RELEASE_TAGS
+        ]
+
+    def refresh(self) -> list[str]:
+        """Fetches tags and updates cache file (on failure, cached tags are kept)"""
+        try:
+            self.store(self.fetcher())
+        except Exception as ex:  # pylint: disable=broad-except
+            logger.warning(f"unable to fetch release tags: {ex}")
+            """Don't retry (in this process) until TTL has passed"""
+            self.load()["fetched_at"] = int(time.time())
+        return self.load().get("tags", [])
+
+    def start_refresh(self) -> None:
+        """Refreshes cache in a daemon thread (at most one refresh at a time)"""
+        with self.lock:
+            if self.refresh_thread is not None and self.refresh_thread.is_alive():
+                return
+            self.refresh_thread = threading.Thread(
+                target=self.refresh, name="release-tags-refresh", daemon=True
+            )
+            self.refresh_thread.start()
+
+
+@click.command()
+@click.option("--env_file", default=".env", help="Path to .env file")
+@click.option("--cache_file", default=None, help="Release tags cache file")
+def refresh_release_tags(env_file: str, cache_file: str) -> None:
+    """Fetches riksdagen-corpus release tags from GitHub and updates the local cache"""
+    load_dotenv(env_file)
+    cache: ReleaseTagCache = ReleaseTagCache(filename=cache_file)
+    tags: list[str] = cache.refresh()
+    logger.info(f"{len(tags)} release tags cached in {cache.filename}")
+
+
+if __name__ == "__main__":
+    refresh_release_tags()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import pathlib
+import sqlite3
+import threading
+from typing import Iterable
+
+from loguru import logger
+
+from swedeb_demo.api.cache import LRUCache
+
+NOT_FOUND: object = object()
+
+
+class SpeakerNoteService:
+    """Looks up speaker notes by id in the metadata database (instead of loading the whole table).
+
+    A single read-only connection is kept open (shared by all threads, queries are serialized),
+    and the most recently used notes are cached. Unknown ids are cached as well.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        id_name: str = "speaker_note_id",
+        cache_size: int = 4096,
+        chunk_size: int = 500,
+    ):
+        self.filename: str = filename
+        self.id_name: str = id_name
+        self.chunk_size: int = chunk_size
+        self.notes: LRUCache[str | None] = LRUCache(max_items=cache_size)
+        self.lock: threading.Lock = threading.Lock()
+        self.connection: sqlite3.Connection | None = None
+
+    def connect(self) -> sqlite3.Connection:
+        if self.connection is None:
+            uri: str = f"{pathlib.Path(self.filename).resolve().as_uri()}?mode=ro"
+            self.connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        return self.connection
+
+    def close(self) -> None:
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+    def query(self, speaker_note_ids: list[str]) -> dict[str, str]:
+        """Reads notes for `speaker_note_ids` from database (in chunks of at most `chunk_size` ids)"""
+        notes: dict[str, str] = {}
+        with self.lock:
+            db: sqlite3.Connection = self.connect()
+            for i in range(0, len(speaker_note_ids), self.chunk_size):
+                chunk: list[str] = speaker_note_ids[i : i + self.chunk_size]
+                sql: str = (
+                    f"select {self.id_name}, speaker_note from speaker_notes "
+                    f"where {self.id_name} in ({', '.join('?' * len(chunk))})"
+                )
+                notes.update(db.execute(sql, chunk).fetchall())
+        return notes
+
+    def get_many(self, speaker_note_ids: Iterable[str]) -> dict[str, str | None]:
+        """Returns notes for `speaker_note_ids` (None for unknown ids), only uncached ids are queried"""
+        notes: dict[str, str | None] = {}
+        missing: list[str] = []
+        for speaker_note_id in dict.fromkeys(speaker_note_ids):
+            note: str | None | object = self.notes.get(speaker_note_id, NOT_FOUND)
+            if note is NOT_FOUND:
+                missing.append(speaker_note_id)
+            else:
+                notes[speaker_note_id] = note
+        if missing:
+            try:
+                found: dict[str, str] = self.query(missing)
+            except sqlite3.Error as ex:
+                logger.error(f"unable to read speaker_notes: {ex}")
+                return {**notes, **{x: None for x in missing}}
+            for speaker_note_id in missing:
+                notes[speaker_note_id] = self.notes.put(
+                    speaker_note_id, found.get(speaker_note_id)
+                )
+        return notes
+
+    def get(self, speaker_note_id: str, default: str = None) -> str | None:
+        note: str | None = self.get_many([speaker_note_id]).get(speaker_note_id)
+        return default if note is None else note
@@ -0,0 +1,266 @@
+"""
+Packed speech store: all tagged speeches in a single file of zlib-compressed JSON blobs,
+plus an offset index (numpy arrays) stored in `<filename>.index.npz`.
+
+Speeches are written protocol by protocol, so that a protocol's speeches are stored contiguously:
+
+    speech_offset/speech_length     location of speech blob (JSON list of utterances)
+    speech_protocol                 index of speech's protocol in protocol arrays
+    document_id                     speech's document ID in the DTM document index
+    protocol_name                   protocol names
+    metadata_offset/metadata_length location of protocol's metadata blob (JSON dict)
+    speech_start/speech_count       speech range of protocol
+    metadata                        JSON dict with the corpus (tag, folder, fingerprint, n_documents)
+                                    the store was packed for
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import zlib
+
+import click
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+from loguru import logger
+from penelope.corpus import VectorizedCorpus  # type: ignore
+
+from swedeb_demo.api.parlaclarin.trends_cube import corpus_fingerprint
+
+from .speech_text import Loader, ZipLoader
+from .utility import get_protocol_names
+
+STORE_VERSION: int = 1
+
+
+def index_filename(filename: str) -> str:
+    return f"{filename}.index.npz"
+
+
+class PackedLoader(Loader):
+    """Loads tagged protocols and speeches from a memory-mapped packed speech store"""
+
+    def __init__(self, filename: str):
+        self.filename: str = filename
+
+        with np.load(index_filename(filename)) as index:
+            self.document_id: np.ndarray = index["document_id"]
+            self.speech_offset: np.ndarray = index["speech_offset"]
+            self.speech_length: np.ndarray = index["speech_length"]
+            self.speech_protocol: np.ndarray = index["speech_protocol"]
+            self.metadata_offset: np.ndarray = index["metadata_offset"]
+            self.metadata_length: np.ndarray = index["metadata_length"]
+            self.speech_start: np.ndarray = index["speech_start"]
+            self.speech_count: np.ndarray = index["speech_count"]
+            protocol_names: np.ndarray = index["protocol_name"]
+            self.metadata: dict = (
+                json.loads(str(index["metadata"])) if "metadata" in index.files else {}
+            )
+
+        self.protocol_name2index: dict[str, int] = {
+            name: i for i, name in enumerate(protocol_names.tolist())
+        }
+
+        """Dense lookup table from document ID to speech position"""
+        self.document_id2position: np.ndarray = np.full(
+            int(self.document_id.max(initial=-1)) + 1, -1, dtype=np.int32
+        )
+        self.document_id2position[self.document_id] = np.arange(
+            len(self.document_id), dtype=np.int32
+        )
+
+        with open(filename, "rb") as fp:
+            self.data: mmap.mmap = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def is_valid(self, *, folder: str, tag: str, n_documents: int) -> bool:
+        """Checks that the store was packed for the (unchanged) corpus `tag` in `folder`"""
+        return (
+            self.metadata.get("version") == STORE_VERSION
+            and self.metadata.get("tag") == tag
+            and self.metadata.get("fingerprint") == corpus_fingerprint(folder, tag)
+            and self.metadata.get("n_documents") == n_documents
+        )
+
+    def _read(self, offset: int, length: int) -> dict | list:
+        return json.loads(zlib.decompress(self.data[offset : offset + length]))
+
+    def _metadata(self, protocol_index: int) -> dict:
+        return self._read(
+            self.metadata_offset[protocol_index], self.metadata_length[protocol_index]
+        )
+
+    def _utterances(self, position: int) -> list[dict]:
+        return self._read(self.speech_offset[position], self.speech_length[position])
+
+    def load(self, protocol_name: str) -> tuple[dict, list[dict]]:
+        """Loads protocol metadata and all utterances of the protocol's speeches"""
+        protocol_index: int = self.protocol_name2index.get(protocol_name)
+        if protocol_index is None:
+            raise FileNotFoundError(protocol_name)
+        start: int = self.speech_start[protocol_index]
+        utterances: list[dict] = [
+            u
+            for position in range(start, start + self.speech_count[protocol_index])
+            for u in self._utterances(position)
+        ]
+        return self._metadata(protocol_index), utterances
+
+    def load_speech(self, document_id: int) -> tuple[dict, list[dict]] | None:
+        """Loads protocol metadata and the utterances of a single speech"""
+        if not 0 <= document_id < len(self.document_id2position):
+            return None
+        position: int = self.document_id2position[document_id]
+        if position < 0:
+            return None
+        return (
+            self._metadata(self.speech_protocol[position]),
+            self._utterances(position),
+        )
+
+
+def pack_speeches(
+    *,
+    source: str | Loader,
+    document_index: pd.DataFrame,
+    target_filename: str,
+    metadata: dict = None,
+) -> None:
+    """Converts tagged protocols (by default zip archives in folder `source`) to a packed speech store.
+
+    Each protocol's utterances are split into speeches using `n_utterances` in the document index.
+    The corpus is identified by `metadata` (tag, folder and fingerprint), see `PackedLoader.is_valid`.
+    """
+    loader: Loader = source if isinstance(source, Loader) else ZipLoader(source)
+    di: pd.DataFrame = document_index.assign(
+        protocol_name=get_protocol_names(document_index)
+    )
+
+    speeches: dict[str, list] = {
+        key: []
+        for key in ["document_id", "speech_offset", "speech_length", "speech_protocol"]
+    }
+    protocols: dict[str, list] = {
+        key: []
+        for key in [
+            "protocol_name",
+            "metadata_offset",
+            "metadata_length",
+            "speech_start",
+            "speech_count",
+        ]
+    }
+
+    os.makedirs(os.path.dirname(os.path.abspath(target_filename)), exist_ok=True)
+
+    with open(target_filename, "wb") as fp:
+
+        def write(data: dict | list) -> tuple[int, int]:
+            blob: bytes = zlib.compress(json.dumps(data).encode("utf-8"))
+            offset: int = fp.tell()
+            fp.write(blob)
+            return offset, len(blob)
+
+        for protocol_name, group in di.groupby(
+            "protocol_name", sort=False, observed=True
+        ):
+            try:
+                protocol_metadata, utterances = loader.load(protocol_name)
+            except FileNotFoundError:
+                logger.warning(f"pack_speeches: protocol {protocol_name} not found")
+                continue
+
+            metadata_offset, metadata_length = write(protocol_metadata)
+            protocols["protocol_name"].append(protocol_name)
+            protocols["metadata_offset"].append(metadata_offset)
+            protocols["metadata_length"].append(metadata_length)
+            protocols["speech_start"].append(len(speeches["document_id"]))
+            protocols["speech_count"].append(len(group))
+
+            start: int = 0
+            for document_id, n_utterances in zip(
+                group["document_id"], group["n_utterances"]
+            ):
+                offset, length = write(utterances[start : start + n_utterances])
+                start += n_utterances
+                speeches["document_id"].append(document_id)
+                speeches["speech_offset"].append(offset)
+                speeches["speech_length"].append(length)
+                speeches["speech_protocol"].append(len(protocols["protocol_name"]) - 1)
+
+    np.savez(
+        index_filename(target_filename),
+        document_id=np.array(speeches["document_id"], dtype=np.int32),
+        speech_offset=np.array(speeches["speech_offset"], dtype=np.int64),
+        speech_length=np.array(speeches["speech_length"], dtype=np.int32),
+        speech_protocol=np.array(speeches["speech_protocol"], dtype=np.int32),
+        protocol_name=np.array(protocols["protocol_name"], dtype=str),
+        metadata_offset=np.array(protocols["metadata_offset"], dtype=np.int64),
+        metadata_length=np.array(protocols["metadata_length"], dtype=np.int32),
+        speech_start=np.array(protocols["speech_start"], dtype=np.int32),
+        speech_count=np.array(protocols["speech_count"], dtype=np.int32),
+        metadata=np.array(
+            json.dumps(
+                {
+                    **(metadata or {}),
+                    "version": STORE_VERSION,
+                    "n_documents": len(document_index),
+                    "source_folder": (
+                        os.path.abspath(source) if isinstance(source, str) else None
+                    ),
+                }
+            )
+        ),
+    )
+
+
+def create_loader(
+    source: str, *, folder: str = None, tag: str = None, n_documents: int = None
+) -> Loader:
+    """Returns a packed store loader if `source` is a file, otherwise a zip folder loader.
+
+    If corpus `folder` and `tag` are given, a store that wasn't packed for that corpus is not
+    used (zip archives in the folder the store was packed from are read instead).
+    """
+    if not (os.path.isfile(source) and os.path.isfile(index_filename(source))):
+        return ZipLoader(source)
+    loader: PackedLoader = PackedLoader(source)
+    if folder is None or loader.is_valid(
+        folder=folder, tag=tag, n_documents=n_documents
+    ):
+        return loader
+    zip_folder: str = loader.metadata.get("source_folder") or os.path.dirname(source)
+    logger.warning(
+        f"packed speech store {source} is stale, please rebuild (reading {zip_folder})"
+    )
+    return ZipLoader(zip_folder)
+
+
+@click.command()
+@click.argument("target_filename")
+@click.option("--env_file", default=".env", help="Path to .env file")
+@click.option("--source_folder", default=None, help="Tagged corpus (zip) folder")
+def pack_tagged_corpus(target_filename: str, env_file: str, source_folder: str) -> None:
+    """Packs the tagged corpus (TAGGED_CORPUS_FOLDER) into a single speech store file"""
+    load_dotenv(env_file)
+    folder, tag = os.getenv("FOLDER"), os.getenv("TAG")
+    document_index: pd.DataFrame = VectorizedCorpus.load_metadata(
+        tag=tag, folder=folder
+    )["document_index"]
+    pack_speeches(
+        source=source_folder or os.getenv("TAGGED_CORPUS_FOLDER"),
+        document_index=document_index,
+        target_filename=target_filename,
+        metadata={
+            "tag": tag,
+            "folder": os.path.abspath(folder),
+            "fingerprint": corpus_fingerprint(folder, tag),
+        },
+    )
+    logger.info(f"packed {len(document_index)} speeches into {target_filename}")
+
+
+if __name__ == "__main__":
+    pack_tagged_corpus()  # pylint: disable=no-value-for-parameter
@@ -1,30 +1,32 @@
 from __future__ import annotations
 
 import abc
+import functools
 import json
 import os
 import re
-import sqlite3
-import types
 import zipfile
-from collections import namedtuple
+from collections import deque, namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
 from functools import cached_property
 from os.path import join as jj
-from typing import Iterable, Literal
+from typing import IO, Callable, Iterable, Iterator, Literal
 
 import numpy as np
 import pandas as pd
 from jinja2 import Template
-from loguru import logger
 from penelope import utility as pu
 
-from . import codecs as md
-from .utility import read_sql_table
+from swedeb_demo.api.cache import LRUCache
 
-try:
-    import github as gh
-except ImportError:
-    Github = lambda t: types.SimpleNamespace()
+from . import codecs as md
+from .release_tags import (
+    DEFAULT_RELEASE_TAGS,
+    ReleaseTagCache,
+    fetch_github_release_tags,
+)
+from .speaker_notes import SpeakerNoteService
+from .utility import get_protocol_names, split_speech_name, to_protocol_name
 
 
 default_template: Template = Template(
@@ -44,62 +46,124 @@ default_template: Template = Template(
 
 GithubUrl = namedtuple("GithubUrl", "name url")
 
+SPEAKER_NOTE_NOT_FOUND: str = "(introductory note not found)"
+
 # pylint: disable=unused-argument
 
 
-class SpeechTextService:
-    """Reconstitute text using information stored in the document (speech) index"""
+class ProtocolSpeechIndex:
+    """Compact index of speeches grouped by protocol.
 
-    def __init__(self, document_index: pd.DataFrame):
-        self.speech_index: pd.DataFrame = document_index
-        self.speech_index["protocol_name"] = (
-            self.speech_index["document_name"].str.split("_").str[0]
+    Speech properties are stored in contiguous arrays ordered by protocol (document index order
+    within protocol). Protocol names are sorted, so that a protocol's speeches are found by binary
+    search as the row range `starts[i]:ends[i]`. For each speech, `offsets` holds the position of the
+    speech's first utterance within the protocol.
+    """
+
+    def __init__(self, speech_index: pd.DataFrame, columns: list[str]):
+        codes, protocol_names = pd.factorize(speech_index["protocol_name"], sort=True)
+        order: np.ndarray = np.argsort(codes, kind="stable")
+        counts: np.ndarray = np.bincount(codes, minlength=len(protocol_names))
+
+        self.protocol_names: np.ndarray = np.asarray(protocol_names, dtype=str)
+        self.ends: np.ndarray = np.cumsum(counts)
+        self.starts: np.ndarray = self.ends - counts
+        self.columns: list[str] = columns
+        self.data: dict[str, np.ndarray] = {
+            column: speech_index[column].values[order] for column in columns
+        }
+        n_utterances: np.ndarray = (
+            speech_index["n_utterances"].fillna(0).values[order].astype(np.int64)
         )
-        self.speech_index.rename(
-            columns={"speach_index": "speech_index"}, inplace=True, errors="ignore"
+        utterance_ends: np.ndarray = np.cumsum(n_utterances)
+        utterance_starts: np.ndarray = utterance_ends - n_utterances
+        self.n_utterances: np.ndarray = n_utterances
+        self.offsets: np.ndarray = utterance_starts - np.repeat(
+            utterance_starts[self.starts], counts
         )
 
+    def __len__(self) -> int:
+        return len(self.protocol_names)
+
+    def __contains__(self, protocol_name: str) -> bool:
+        return self.find(protocol_name) is not None
+
+    def find(self, protocol_name: str) -> slice | None:
+        """Returns row range of protocol's speeches (None if protocol is unknown)"""
+        i: int = int(np.searchsorted(self.protocol_names, protocol_name))
+        if i < len(self.protocol_names) and self.protocol_names[i] == protocol_name:
+            return slice(self.starts[i], self.ends[i])
+        return None
+
+    def utterance_range(self, protocol_name: str, n: int) -> tuple[int, int]:
+        """Returns range of n:th (zero-based) speech's utterances within protocol"""
+        rows: slice | None = self.find(protocol_name)
+        if rows is None or not 0 <= n < rows.stop - rows.start:
+            raise IndexError(f"speech {n} not found in {protocol_name}")
+        start: int = int(self.offsets[rows.start + n])
+        return start, start + int(self.n_utterances[rows.start + n])
+
+    def get(self, protocol_name: str, default: list[dict] = None) -> list[dict] | None:
+        """Returns properties of protocol's speeches as a list of dicts"""
+        rows: slice | None = self.find(protocol_name)
+        if rows is None:
+            return default
+        return [
+            dict(zip(self.columns, values))
+            for values in zip(*(self.data[column][rows] for column in self.columns))
+        ]
+
+
+class SpeechTextService:
+    """Reconstitute text using information stored in the document (speech) index"""
+
+    def __init__(self, document_index: pd.DataFrame):
         """Name of speaker note reference was changed from v0.4.3 (speaker_hash => speaker_note_id)"""
         self.id_name = (
             "speaker_note_id"
-            if "speaker_note_id" in self.speech_index.columns
+            if "speaker_note_id" in document_index.columns
             else "speaker_hash"
         )
+        speech_index_name: str = (
+            "speech_index"
+            if "speech_index" in document_index.columns
+            else "speach_index"
+        )
 
-    @cached_property
-    def name2info(self) -> dict[str, dict]:
-        """Create a map protcol name to list of dict of relevant properties"""
-        si: pd.DataFrame = self.speech_index.set_index("protocol_name", drop=True)[
-            ["u_id", "speech_index", self.id_name, "n_utterances"]
-        ]
-        return (
-            si.assign(data=si.to_dict("records"))
-            .groupby(si.index)
-            .agg(list)["data"]
-            .to_dict()
+        """Own frame of needed columns, the document index is shared and must not be modified"""
+        self.speech_index: pd.DataFrame = pd.DataFrame(
+            {
+                "protocol_name": get_protocol_names(document_index),
+                "u_id": document_index["u_id"].values,
+                "speech_index": document_index[speech_index_name].values,
+                self.id_name: document_index[self.id_name].values,
+                "n_utterances": document_index["n_utterances"].values,
+            },
+            index=document_index.index,
+        )
+        self.name2info: ProtocolSpeechIndex = ProtocolSpeechIndex(
+            self.speech_index, ["u_id", "speech_index", self.id_name, "n_utterances"]
         )
 
     def speeches(self, *, metadata: dict, utterances: list[dict]) -> list[dict]:
         """Create list of speeches for all speeches in protocol"""
-        speech_infos: dict = self.name2info.get(metadata.get("name"))
-        speech_lengths: np.ndarray = np.array(
-            [s.get("n_utterances", 0) for s in speech_infos]
-        )
-        speech_starts: np.ndarray = np.append([0], np.cumsum(speech_lengths))
-        speeches = [
-            self._create_speech(
-                metadata=metadata,
-                utterances=utterances[speech_starts[i] : speech_starts[i + 1]],
-            )
-            for i in range(0, len(speech_infos))
+        protocol_name: str = metadata.get("name")
+        rows: slice | None = self.name2info.find(protocol_name)
+        if rows is None:
+            raise KeyError(f"protocol {protocol_name} not found in index")
+        return [
+            self.nth(metadata=metadata, utterances=utterances, n=n)
+            for n in range(0, rows.stop - rows.start)
         ]
-        return speeches
 
     def nth(self, *, metadata: dict, utterances: list[dict], n: int) -> dict:
-        # speech_infos: dict = self.name2info.get(metadata.get("name"))
-        # u_idx: int = [u['u_id'] for u in utterances].index(speech_infos['u_id'])
-        # self._create_speech(metadata, utterances[u_idx:u_idx+speech_infos['n_utterances']])
-        return self.speeches(metadata=metadata, utterances=utterances)[n]
+        """Create n:th speech in protocol (only the speech's utterances are processed)"""
+        start, end = self.name2info.utterance_range(metadata.get("name"), n)
+        return self._create_speech(metadata=metadata, utterances=utterances[start:end])
+
+    def speech(self, *, metadata: dict, utterances: list[dict]) -> dict:
+        """Create speech from the speech's own utterances"""
+        return self._create_speech(metadata=metadata, utterances=utterances)
 
     def _create_speech(self, *, metadata: dict, utterances: list[dict]) -> dict:
         return (
@@ -125,6 +189,10 @@ class Loader(abc.ABC):
     def load(self, protocol_name: str) -> tuple[dict, list[dict]]:
         ...
 
+    def load_speech(self, document_id: int) -> tuple[dict, list[dict]] | None:
+        """Loads protocol metadata and utterances of a single speech (None if not supported)"""
+        return None
+
 
 class ZipLoader(Loader):
     def __init__(self, folder: str):
@@ -164,6 +232,8 @@ class SpeechTextRepository:
         document_index: pd.DataFrame,
         template: Template = None,
         service: SpeechTextService = None,
+        protocol_cache_size: int = 64,
+        release_tag_cache: ReleaseTagCache = None,
     ):
         self.template: Template = template or default_template
         self.source: Loader = (
@@ -171,8 +241,11 @@ class SpeechTextRepository:
         )
         self.person_codecs: md.PersonCodecs = person_codecs
         self.document_index: pd.DataFrame = document_index
+        self.protocol_cache: LRUCache[tuple[dict, list[dict]]] = LRUCache(
+            max_items=protocol_cache_size
+        )
         self.subst_puncts = re.compile(r'\s([,?.!"%\';:`](?:\s|$))')
-        self.release_tags: list[str] = self.get_github_tags()
+        self.release_tag_cache: ReleaseTagCache = release_tag_cache or ReleaseTagCache()
         self.service: SpeechTextService = service or SpeechTextService(
             self.document_index
         )
@@ -183,10 +256,13 @@ class SpeechTextRepository:
         )
 
     def load_protocol(self, protocol_name: str) -> tuple[dict, list[dict]]:
-        return self.source.load(protocol_name)
+        """Loads protocol's metadata and utterances (most recently used protocols are cached)"""
+        return self.protocol_cache.get_or_create(
+            protocol_name, lambda: self.source.load(protocol_name)
+        )
 
     def speeches(self, protocol_name: str) -> Iterable[dict]:
-        metadata, utterances = self.source.load(protocol_name)
+        metadata, utterances = self.load_protocol(protocol_name)
         return self.service.speeches(utterances=utterances, metadata=metadata)
 
     def _get_speech_info(self, speech_id: int | str) -> dict:
@@ -214,37 +290,75 @@ class SpeechTextRepository:
 
         speech_info.update(name=speaker_name)
 
-        speech_info["speaker_note"] = self.speaker_note_id2note.get(
-            speech_info.get(self.service.id_name), "(introductory note not found)"
+        speech_info["speaker_note"] = self.get_speaker_note(
+            speech_info.get(self.service.id_name)
         )
 
         return speech_info
 
     @cached_property
-    def speaker_note_id2note(self) -> dict:
-        try:
-            if not self.person_codecs.source_filename:
-                return {}
-            with sqlite3.connect(database=self.person_codecs.source_filename) as db:
-                speaker_notes: pd.DataFrame = read_sql_table("speaker_notes", db)
-                speaker_notes.set_index(self.service.id_name, inplace=True)
-                return speaker_notes["speaker_note"].to_dict()
-        except Exception as ex:
-            logger.error(f"unable to read speaker_notes: {ex}")
-            return {}
+    def speaker_notes(self) -> SpeakerNoteService | None:
+        if not self.person_codecs.source_filename:
+            return None
+        return SpeakerNoteService(
+            self.person_codecs.source_filename, id_name=self.service.id_name
+        )
+
+    def get_speaker_note(
+        self, speaker_note_id: str, default: str = SPEAKER_NOTE_NOT_FOUND
+    ) -> str:
+        if self.speaker_notes is None:
+            return default
+        return self.speaker_notes.get(speaker_note_id, default)
+
+    def get_speaker_notes(
+        self, speech_names: list[str], default: str = SPEAKER_NOTE_NOT_FOUND
+    ) -> dict[str, str]:
+        """Returns speaker notes for a list of speeches (e.g. for exports), keyed by speech name"""
+        document_ids: list[int | None] = [
+            self.document_name2id.get(name) for name in speech_names
+        ]
+        """Speeches not found in the index get the default note"""
+        speaker_note_ids: dict[int, str] = self.document_index.loc[
+            [x for x in document_ids if x is not None], self.service.id_name
+        ].to_dict()
+        notes: dict[str, str | None] = (
+            self.speaker_notes.get_many(speaker_note_ids.values())
+            if self.speaker_notes is not None
+            else {}
+        )
+        return {
+            name: notes.get(speaker_note_ids.get(document_id)) or default
+            for name, document_id in zip(speech_names, document_ids)
+        }
 
     def speech(
         self, speech_name: str, mode: Literal["dict", "text", "html"]
     ) -> dict | str:
+        return self.format_speech(self.create_speech(speech_name), mode)
+
+    def create_speech(
+        self,
+        speech_name: str,
+        load_protocol: Callable[[str], tuple[dict, list[dict]]] = None,
+    ) -> dict:
+        """Creates speech (as a dict), protocols are loaded with `load_protocol` (default cached)"""
         try:
             """Load speech data from speech corpus"""
-            protocol_name: str = speech_name.split("_")[0]
-            speech_nr: int = int(speech_name.split("_")[1])
+            protocol_name, speech_nr = split_speech_name(speech_name)
 
-            metadata, utterances = self.source.load(protocol_name)
-            speech: dict = self.service.nth(
-                metadata=metadata, utterances=utterances, n=speech_nr - 1
+            data: tuple[dict, list[dict]] | None = self.source.load_speech(
+                self.document_name2id.get(speech_name, -1)
             )
+            if data is not None:
+                speech: dict = self.service.speech(metadata=data[0], utterances=data[1])
+            else:
+                metadata, utterances = (load_protocol or self.load_protocol)(
+                    protocol_name
+                )
+                speech: dict = self.service.nth(
+                    metadata=metadata, utterances=utterances, n=speech_nr - 1
+                )
 
             speech_info: dict = self._get_speech_info(speech_name)
             speech.update(**speech_info)
@@ -266,6 +380,11 @@ class SpeechTextRepository:
         except Exception as ex:  # pylint: disable=bare-except
             speech = {"name": "speech not found", "error": str(ex)}
 
+        return speech
+
+    def format_speech(
+        self, speech: dict, mode: Literal["dict", "text", "html"]
+    ) -> dict | str:
         if mode == "html":
             return self.to_html(speech)
 
@@ -274,6 +393,57 @@ class SpeechTextRepository:
 
         return speech
 
+    def speeches_by_name(
+        self,
+        speech_names: Iterable[str],
+        mode: Literal["dict", "text", "html"] = "text",
+        max_workers: int = 4,
+    ) -> Iterator[tuple[str, dict | str]]:
+        """Yields (name, speech) for each speech in `speech_names`, grouped by protocol.
+
+        Each protocol is loaded once (bypassing the protocol cache) in a thread pool. Protocols are
+        yielded in order of first occurrence, and at most `2 * max_workers` protocols are loaded and
+        not yet consumed at any time, so memory use doesn't grow with the number of speeches.
+        """
+        groups: dict[str, list[str]] = {}
+        for speech_name in speech_names:
+            groups.setdefault(to_protocol_name(speech_name), []).append(speech_name)
+
+        def create_speeches(names: list[str]) -> list[tuple[str, dict | str]]:
+            load_protocol = functools.lru_cache(maxsize=1)(self.source.load)
+            return [
+                (
+                    name,
+                    self.format_speech(self.create_speech(name, load_protocol), mode),
+                )
+                for name in names
+            ]
+
+        executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="speech-batch"
+        )
+        try:
+            pending: deque[Future] = deque()
+            for names in groups.values():
+                pending.append(executor.submit(create_speeches, names))
+                if len(pending) >= 2 * max_workers:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def write_speeches(
+        self, speech_names: Iterable[str], target: str | IO[bytes]
+    ) -> int:
+        """Writes speech texts to a zip archive (one `<speech name>.txt` per speech), returns number of speeches"""
+        n_speeches: int = 0
+        with zipfile.ZipFile(target, "w", compression=zipfile.ZIP_DEFLATED) as fp:
+            for speech_name, text in self.speeches_by_name(speech_names, mode="text"):
+                fp.writestr(f"{speech_name}.txt", text)
+                n_speeches += 1
+        return n_speeches
+
     def to_text(self, speech: dict) -> str:
         paragraphs: list[str] = speech.get("paragraphs", [])
         text: str = self.fix_whitespace("\n".join(paragraphs))
@@ -324,25 +494,16 @@ class SpeechTextRepository:
 
         return f'<a href="{url}" target="_blank" style="font-weight: bold;color: blue;">KB</a>&nbsp;'
 
+    @property
+    def release_tags(self) -> list[str]:
+        """Corpus release tags (from local cache, refreshed in background when stale)"""
+        return self.release_tag_cache.tags
+
     def get_github_tags(self, github_access_token: str = None) -> list[str]:
-        release_tags: list[str] = ["main", "dev"]
+        """Fetches release tags from GitHub (blocking, bypasses cache)"""
+        release_tags: list[str] = list(DEFAULT_RELEASE_TAGS)
         try:
-            access_token: str = github_access_token or os.environ.get(
-                "GITHUB_ACCESS_TOKEN", None
-            )
-
-            # if access_token is None:
-            #    logger.info("GITHUB_ACCESS_TOKEN not set")
-
-            github: gh.Github = gh.Github(access_token)
-
-            riksdagen_corpus = github.get_repo(
-                "welfare-state-analytics/riksdagen-corpus"
-            )
-            release_tags = release_tags + [
-                x.title for x in riksdagen_corpus.get_releases()
-            ]
-
+            release_tags = release_tags + fetch_github_release_tags(github_access_token)
         except:  # pylint: disable=bare-except
             ...
         return release_tags
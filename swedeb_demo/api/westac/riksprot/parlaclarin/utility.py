@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import os
 import sqlite3
-from typing import Any, Mapping, Type
+from typing import Any, Mapping, Sequence, Type
 
 import numpy as np
 import pandas as pd
@@ -119,6 +119,41 @@ def slim_table_types(
                     table[column_name] = table[column_name].astype(dt)
 
 
+def to_protocol_name(speech_name: str) -> str:
+    """Returns protocol name of speech, e.g. `prot-1960--ak--01_003` => `prot-1960--ak--01`"""
+    return speech_name.partition("_")[0]
+
+
+def split_speech_name(speech_name: str) -> tuple[str, int]:
+    """Splits speech name into protocol name and (one-based) speech number"""
+    protocol_name, _, speech_nr = speech_name.partition("_")
+    return protocol_name, int(speech_nr)
+
+
+def to_protocol_names(speech_names: Sequence[str] | pd.Series) -> pd.Categorical:
+    """Returns protocol names of speeches as a categorical (sorted categories, one string per protocol).
+
+    Vectorized: characters from the first `_` are zeroed in a fixed-width (UCS4) array of the names,
+    and numpy strips trailing null characters when the array is viewed as strings again.
+    """
+    names: np.ndarray = np.asarray(speech_names, dtype=str)
+    chars: np.ndarray = names.view(np.uint32).reshape(len(names), names.itemsize // 4)
+    chars = np.where(
+        np.logical_or.accumulate(chars == ord("_"), axis=1), np.uint32(0), chars
+    )
+    codes, categories = pd.factorize(
+        chars.view(names.dtype).ravel().astype(object), sort=True
+    )
+    return pd.Categorical.from_codes(codes, categories)
+
+
+def get_protocol_names(document_index: pd.DataFrame) -> pd.Categorical:
+    """Returns the document index's `protocol_name` column (derived from `document_name` if missing)"""
+    if "protocol_name" in document_index.columns:
+        return document_index["protocol_name"].values
+    return to_protocol_names(document_index["document_name"])
+
+
 def group_to_list_of_records2(
     df: pd.DataFrame, key: str
 ) -> dict[str | int, list[dict]]:
@@ -19,6 +19,7 @@ kwic_table_type = "kwic"
 
 # KWIC download filename
 kwic_filename = "kwic.csv"
+kwic_prepare_download = "Förbered nedladdning av alla träffar"
 
 # KWIC table display
 kwic_labels = ["Vänster", "Träff", "Höger", "Parti", "År", "Talare", "Kön"]
@@ -40,6 +41,16 @@ kwic_text_input = "Skriv sökterm:"
 # KWIC show speeches
 kwic_show_speeches = "Visa anföranden"
 
+# search term suggestions
+unknown_word_suggestions = "Sökordet `{}` finns inte i korpusen. Menade du:"
+unknown_word_no_suggestions = "Sökordet `{}` finns inte i korpusen."
+kwic_unknown_word_suggestions = (
+    "Sökordet `{}` finns inte i ordlistan, sökningen görs ändå. Menade du:"
+)
+kwic_unknown_word_no_suggestions = (
+    "Sökordet `{}` finns inte i ordlistan, sökningen görs ändå."
+)
+
 ###############################
 # WORD TRENDs display texts   #
 ###############################
@@ -112,6 +123,9 @@ sp_search_button = "Visa anföranden"
 
 # speeches download filename
 sp_filename = "anforanden.csv"
+sp_texts_filename = "anforanden_text.zip"
+sp_prepare_texts_download = "Förbered nedladdning av anförandenas text"
+sp_texts_download = "Ladda ner text som zip"
 
 ###############################
 # Main page display texts     #
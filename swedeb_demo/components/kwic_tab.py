@@ -1,15 +1,19 @@
-from typing import Any, List
+import re
+from typing import List
 
-import pandas as pd
 import streamlit as st
 
 import swedeb_demo.components.component_texts as ct
 from swedeb_demo.api.dummy_api import ADummyApi  # type: ignore
+from swedeb_demo.api.parlaclarin.kwic_result import KwicResult
+from swedeb_demo.api.parlaclarin.search_query import SearchQuery
 from swedeb_demo.components.meta_data_display import MetaDataDisplay  # type: ignore
 from swedeb_demo.components.speech_display_mixin import ExpandedSpeechDisplay
 from swedeb_demo.components.table_results import TableDisplay
 from swedeb_demo.components.tool_tab import ToolTab
 
+PLAIN_WORD: re.Pattern = re.compile(r"[\w\-]+")
+
 
 class KWICDisplay(ExpandedSpeechDisplay, ToolTab):
     def __init__(
@@ -31,6 +35,7 @@ class KWICDisplay(ExpandedSpeechDisplay, ToolTab):
         self.N_WORDS_BEFORE = f"n_words_before_{self.TAB_KEY}"
         self.N_WORDS_AFTER = f"n_words_after_{self.TAB_KEY}"
         self.LEMMA_WORD_TOGGLE = f"lemma_word_toggle_{self.TAB_KEY}"
+        self.DOWNLOAD_REQUESTED = f"download_requested_{self.TAB_KEY}"
 
         if self.has_and_is(self.EXPANDED_SPEECH):
             self.display_expanded_speech(
@@ -61,6 +66,11 @@ class KWICDisplay(ExpandedSpeechDisplay, ToolTab):
             if self.has_and_is(self.SEARCH_PERFORMED):
                 button_name = ct.kwic_update_button
             st.form_submit_button(button_name, on_click=self.handle_button_click)
+        self.draw_suggestions(
+            separator=" ",
+            suggestions_text=ct.kwic_unknown_word_suggestions,
+            no_suggestions_text=ct.kwic_unknown_word_no_suggestions,
+        )
         self.draw_line()
 
     def get_st_dict_when_button_clicked(self) -> dict:
@@ -68,6 +78,7 @@ class KWICDisplay(ExpandedSpeechDisplay, ToolTab):
             self.SEARCH_PERFORMED: True,
             self.CURRENT_PAGE: 0,
             self.EXPANDED_SPEECH: False,
+            self.DOWNLOAD_REQUESTED: False,
         }
 
     def add_containers(self):
@@ -92,8 +103,18 @@ class KWICDisplay(ExpandedSpeechDisplay, ToolTab):
             st.session_state[self.SEARCH_PERFORMED] = False
             st.write()  # hack to stay in kwic tab
         else:
+            """Terms are checked against the DTM vocabulary, not the CWB lexicon that is searched,
+            so unknown terms only give suggestions and the query is run anyway"""
+            self.check_search_terms(self.get_lemma_search_terms())
             self.handle_search_click(self.get_st_dict_when_button_clicked())
 
+    def get_lemma_search_terms(self) -> List[str]:
+        """Returns plain (non-pattern) search terms that can be checked against the vocabulary"""
+        if self.get_lemma_word_toggle():
+            return []
+        terms = [h.strip().lower() for h in self.get_search_box().split(" ")]
+        return [term for term in terms if PLAIN_WORD.fullmatch(term)]
+
     def add_window_size(self) -> None:
         cols_before, cols_after, _ = st.columns([2, 2, 2])
         with cols_before:
@@ -129,6 +150,7 @@ class KWICDisplay(ExpandedSpeechDisplay, ToolTab):
             self.N_WORDS_BEFORE: self.get_n_words_before(),
             self.N_WORDS_AFTER: self.get_n_words_after(),
             self.EXPANDED_SPEECH: False,
+            self.DOWNLOAD_REQUESTED: self.has_and_is(self.DOWNLOAD_REQUESTED),
         }
 
     def get_lemma_word_toggle(self):
@@ -157,14 +179,17 @@ class KWICDisplay(ExpandedSpeechDisplay, ToolTab):
             self.display_settings_info_no_hits()
 
     def show_hit(self, hits: List[str]) -> None:
-        selections = self.search_display.get_selections()
+        slider = self.search_display.get_slider()
         data = self.get_data(
-            hits,
-            self.search_display.get_slider(),
-            selections=selections,
-            words_before=st.session_state[self.N_WORDS_BEFORE],
-            words_after=st.session_state[self.N_WORDS_AFTER],
-            lemmatized=not st.session_state[self.LEMMA_WORD_TOGGLE],
+            SearchQuery.create(
+                terms=hits,
+                from_year=slider[0],
+                to_year=slider[1],
+                selections=self.search_display.get_selections(),
+                words_before=st.session_state[self.N_WORDS_BEFORE],
+                words_after=st.session_state[self.N_WORDS_AFTER],
+                lemmatized=not st.session_state[self.LEMMA_WORD_TOGGLE],
+            )
         )
 
         if data.empty:
@@ -172,7 +197,7 @@ class KWICDisplay(ExpandedSpeechDisplay, ToolTab):
         else:
             st.session_state[self.DATA_KEY] = data
             with self.n_hits_container:
-                self.add_download_button(data, ct.kwic_filename)
+                self.add_kwic_download_button(data)
             with self.result_desc_container:
                 self.display_settings_info(n_hits=len(data))
             with self.result_container:
@@ -189,25 +214,31 @@ class KWICDisplay(ExpandedSpeechDisplay, ToolTab):
                     )
                 self.table_display.write_table()
 
-    @st.cache_data
-    def get_data(
-        _self,
-        hits: List[str],
-        slider: Any,
-        selections: dict,
-        words_before: int,
-        words_after: int,
-        lemmatized: bool = True,
-    ) -> pd.DataFrame:
+    def add_kwic_download_button(self, data: KwicResult) -> None:
+        """All concordance lines are only materialized when download is requested"""
+        if data.is_materialized or self.has_and_is(self.DOWNLOAD_REQUESTED):
+            self.add_download_button(data.to_frame(), ct.kwic_filename)
+        else:
+            st.button(
+                ct.kwic_prepare_download,
+                key=f"prepare_download_{self.TAB_KEY}",
+                on_click=self.request_download,
+            )
+
+    def request_download(self) -> None:
+        st.session_state[self.DOWNLOAD_REQUESTED] = True
+
+    @st.cache_resource(max_entries=16)
+    def get_data(_self, query: SearchQuery) -> KwicResult:
         st.write()
-        data = _self.api.get_kwic_results_for_search_hits(
-            hits,
-            from_year=slider[0],
-            to_year=slider[1],
-            selections=selections,
-            words_before=words_before,
-            words_after=words_after,
-            lemmatized=lemmatized,
+        data = _self.api.get_paged_kwic_results(
+            list(query.terms),
+            from_year=query.from_year,
+            to_year=query.to_year,
+            selections=query.selections_dict,
+            words_before=query.words_before,
+            words_after=query.words_after,
+            lemmatized=query.lemmatized,
         )
         st.write()
         return data
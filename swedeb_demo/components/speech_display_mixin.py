@@ -1,6 +1,7 @@
 import streamlit as st
 
 from swedeb_demo.api.dummy_api import ADummyApi  # type: ignore
+from swedeb_demo.api.westac.riksprot.parlaclarin.utility import to_protocol_name
 
 
 class ExpandedSpeechDisplay:
@@ -25,7 +26,7 @@ class ExpandedSpeechDisplay:
                 simplified_protocol = (
                     selected_protocol.split("-")[1]
                     + ":"
-                    + selected_protocol.split("-")[5].split("_")[0]
+                    + to_protocol_name(selected_protocol).split("-")[5]
                 )
             else:
                 chamber = ""
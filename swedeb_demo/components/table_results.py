@@ -4,6 +4,9 @@ from typing import Any
 import pandas as pd
 import streamlit as st
 
+from swedeb_demo.api.parlaclarin.kwic_result import KwicResult
+from swedeb_demo.api.westac.riksprot.parlaclarin.utility import to_protocol_name
+
 
 class TableDisplay:
     def __init__(
@@ -55,10 +58,14 @@ class TableDisplay:
             self.add_buttons(current_page, max_pages)
 
     def get_current_df(self, current_page):
-        return st.session_state[self.data_key].iloc[
-            current_page
-            * self.hits_per_page : ((current_page + 1) * self.hits_per_page)
-        ]
+        data = st.session_state[self.data_key]
+        start, stop = (
+            current_page * self.hits_per_page,
+            (current_page + 1) * self.hits_per_page,
+        )
+        if isinstance(data, KwicResult):
+            return data.rows(start, stop)
+        return data.iloc[start:stop]
 
     def get_current_page(self, n_rows):
         current_page = st.session_state[self.current_page_name]
@@ -241,7 +248,7 @@ class TableDisplay:
             chamber = chamber.replace("ak", "Andra kammaren")
             chamber = chamber.replace("fk", "Första kammaren")
             year = split[1]
-            return f"{chamber} {year}:{split[5].split('_')[0]}"
+            return f"{chamber} {year}:{to_protocol_name(split[5])}"
         else:
             year_and_number = split[1]
         return f"{year_and_number[0:4]}:{year_and_number[4:]} "
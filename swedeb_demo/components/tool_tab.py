@@ -3,7 +3,9 @@ from typing import Any
 import pandas as pd
 import streamlit as st
 
+import swedeb_demo.components.component_texts as ct
 from swedeb_demo.api.dummy_api import ADummyApi  # type: ignore
+from swedeb_demo.api.westac.riksprot.parlaclarin.utility import to_protocol_names
 from swedeb_demo.components.meta_data_display import MetaDataDisplay  # type: ignore
 
 
@@ -15,6 +17,7 @@ class ToolTab:
         self.search_display = shared_meta
         self.TAB_KEY = tab_key
         self.HITS_PER_PAGE = f"{self.TAB_KEY}_hits_per_page"
+        self.SUGGESTIONS = f"suggestions_{self.TAB_KEY}"
 
     def init_session_state(self, session_dict: dict) -> None:
         for k, v in session_dict.items():
@@ -26,6 +29,40 @@ class ToolTab:
             return ""
         return st.session_state[f"search_box_{self.TAB_KEY}"]
 
+    def check_search_terms(self, search_terms: list[str]) -> bool:
+        """Stores suggestions for search terms not found in the corpus, returns True if all are found"""
+        unknown_words: dict[str, list[str]] = self.api.get_unknown_words(search_terms)
+        st.session_state[self.SUGGESTIONS] = unknown_words
+        return not unknown_words
+
+    def draw_suggestions(
+        self,
+        separator: str,
+        suggestions_text: str = ct.unknown_word_suggestions,
+        no_suggestions_text: str = ct.unknown_word_no_suggestions,
+    ) -> None:
+        """Shows suggestions for unknown search terms, clicking one replaces the term in the search box"""
+        for term, words in st.session_state.get(self.SUGGESTIONS, {}).items():
+            if not words:
+                st.warning(no_suggestions_text.format(term))
+                continue
+            st.warning(suggestions_text.format(term))
+            for column, word in zip(st.columns(len(words)), words):
+                column.button(
+                    word,
+                    key=f"suggestion_{self.TAB_KEY}_{term}_{word}",
+                    on_click=self.replace_search_term,
+                    args=(term, word, separator),
+                )
+
+    def replace_search_term(self, term: str, word: str, separator: str) -> None:
+        terms: list[str] = [
+            word if x.strip().lower() == term else x.strip()
+            for x in self.get_search_box().split(separator)
+        ]
+        st.session_state[f"search_box_{self.TAB_KEY}"] = separator.join(terms)
+        st.session_state[self.SUGGESTIONS].pop(term, None)
+
     def handle_search_click(self, st_dict_when_button_clicked: dict) -> bool:
         for k, v in st_dict_when_button_clicked.items():
             st.session_state[k] = v
@@ -83,7 +120,7 @@ class ToolTab:
         df_down = df.copy()
         if "Protokoll" in df_down.columns:
             # remove number from protocoll string
-            df_down["Protokoll"] = df_down["Protokoll"].apply(lambda x: x.split("_")[0])
+            df_down["Protokoll"] = to_protocol_names(df_down["Protokoll"])
         return df_down.to_csv(index=index).encode("utf-8")
 
     def add_download_button(
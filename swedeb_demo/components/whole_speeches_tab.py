@@ -1,9 +1,11 @@
+import tempfile
 from typing import Any
 
 import pandas as pd
 import streamlit as st
 
 from swedeb_demo.api.dummy_api import ADummyApi  # type: ignore
+from swedeb_demo.api.parlaclarin.search_query import SearchQuery
 from swedeb_demo.components import component_texts as ct
 from swedeb_demo.components.meta_data_display import MetaDataDisplay  # type: ignore
 from swedeb_demo.components.speech_display_mixin import ExpandedSpeechDisplay
@@ -25,6 +27,7 @@ class FullSpeechDisplay(ExpandedSpeechDisplay, ToolTab):
         self.DATA_KEY = f"data_{self.TAB_KEY}"
         self.SORT_KEY = f"sort_key_{self.TAB_KEY}"
         self.ASCENDING_KEY = f"ascending_{self.TAB_KEY}"
+        self.TEXTS_REQUESTED = f"texts_requested_{self.TAB_KEY}"
 
         if self.has_and_is(self.EXPANDED_SPEECH):
             reset_dict = {self.EXPANDED_SPEECH: False}
@@ -41,6 +44,7 @@ class FullSpeechDisplay(ExpandedSpeechDisplay, ToolTab):
                 self.CURRENT_PAGE: 0,
                 self.SEARCH_PERFORMED: True,
                 self.EXPANDED_SPEECH: False,
+                self.TEXTS_REQUESTED: False,
             }
 
             st.caption(ct.sp_desc)
@@ -70,26 +74,54 @@ class FullSpeechDisplay(ExpandedSpeechDisplay, ToolTab):
             st.session_state[k] = v
 
     @st.cache_data
-    def get_anforanden(
-        _self, _another_api: Any, from_year: int, to_year: int, selections: dict
-    ) -> pd.DataFrame:
-        data = _another_api.get_anforanden(from_year, to_year, selections)
+    def get_anforanden(_self, _another_api: Any, query: SearchQuery) -> pd.DataFrame:
+        data = _another_api.get_anforanden(
+            query.from_year, query.to_year, query.selections_dict
+        )
         return data
 
+    @st.cache_data(max_entries=4)
+    def get_speech_texts_archive(_self, _another_api: Any, query: SearchQuery) -> bytes:
+        """Zip archive with texts of all speeches matching `query` (built once per query)"""
+        anforanden = _self.get_anforanden(_another_api, query)
+        with tempfile.TemporaryFile() as fp:
+            _another_api.write_speech_texts(anforanden["Protokoll"], fp)
+            fp.seek(0)
+            return fp.read()
+
     def show_display(self) -> None:
         start_year, end_year = self.search_display.get_slider()
 
-        anforanden = self.get_anforanden(
-            self.api,
-            start_year,
-            end_year,
+        self.query = SearchQuery.create(
+            from_year=start_year,
+            to_year=end_year,
             selections=self.search_display.get_selections(),
         )
+        anforanden = self.get_anforanden(self.api, self.query)
         if len(anforanden) == 0:
             self.display_settings_info_no_hits(with_search_hits=False)
         else:
             self.display_results(anforanden)
 
+    def add_texts_download_button(self) -> None:
+        """Speech texts are only fetched (as a zip archive) when download is requested"""
+        if not self.has_and_is(self.TEXTS_REQUESTED):
+            st.button(
+                ct.sp_prepare_texts_download,
+                key=f"prepare_texts_download_{self.TAB_KEY}",
+                on_click=self.request_texts,
+            )
+            return
+        st.download_button(
+            label=ct.sp_texts_download,
+            data=self.get_speech_texts_archive(self.api, self.query),
+            file_name=ct.sp_texts_filename,
+            mime="application/zip",
+        )
+
+    def request_texts(self) -> None:
+        st.session_state[self.TEXTS_REQUESTED] = True
+
     def display_results(self, anforanden: pd.DataFrame) -> None:
         with self.bottom_container:
             self.display_settings_info(n_hits=len(anforanden), with_search_hits=False)
@@ -97,6 +129,7 @@ class FullSpeechDisplay(ExpandedSpeechDisplay, ToolTab):
 
             with col_right:
                 self.add_download_button(anforanden, ct.sp_filename)
+                self.add_texts_download_button()
             self.draw_line()
 
             columns = self.table_display.get_columns()
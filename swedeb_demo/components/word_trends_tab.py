@@ -1,11 +1,10 @@
-from typing import List
-
 import pandas as pd
 import plotly.graph_objects as go  # type: ignore
 import streamlit as st
 
 import swedeb_demo.components.component_texts as ct
 from swedeb_demo.api.dummy_api import ADummyApi  # type: ignore
+from swedeb_demo.api.parlaclarin.search_query import SearchQuery
 from swedeb_demo.components.meta_data_display import MetaDataDisplay  # type: ignore
 from swedeb_demo.components.speech_display_mixin import ExpandedSpeechDisplay
 from swedeb_demo.components.table_results import TableDisplay
@@ -80,6 +79,7 @@ class WordTrendsDisplay(ExpandedSpeechDisplay, ToolTab):
             st.form_submit_button(
                 ct.wt_search_button, on_click=self.handle_button_click
             )
+        self.draw_suggestions(separator=",")
         self.draw_line()
 
     def get_initial_values(self):
@@ -118,6 +118,10 @@ class WordTrendsDisplay(ExpandedSpeechDisplay, ToolTab):
         if self.get_search_box().strip() == "":
             st.warning("Fyll i en sökterm")
             st.session_state[self.SEARCH_PERFORMED] = False
+        elif not self.check_search_terms(
+            [term.strip().lower() for term in self.get_search_box().split(",")]
+        ):
+            st.session_state[self.SEARCH_PERFORMED] = False
         else:
             self.handle_search_click(self.st_dict_when_button_clicked)
 
@@ -140,19 +144,13 @@ class WordTrendsDisplay(ExpandedSpeechDisplay, ToolTab):
         )
 
     @st.cache_data
-    def get_data(
-        _self,
-        search_words: List[str],
-        start_year: int,
-        end_year: int,
-        selections: dict,
-    ) -> pd.DataFrame:
-        st.session_state["word_trend_selections"] = selections
+    def get_data(_self, query: SearchQuery) -> pd.DataFrame:
+        st.session_state["word_trend_selections"] = query.selections_dict
         df = _self.api.get_word_trend_results(
-            search_words,
-            filter_opts=selections,
-            start_year=start_year,
-            end_year=end_year,
+            list(query.terms),
+            filter_opts=query.selections_dict,
+            start_year=query.from_year,
+            end_year=query.to_year,
         )
         total = 0
         if len(df.columns) == 1:
@@ -167,18 +165,12 @@ class WordTrendsDisplay(ExpandedSpeechDisplay, ToolTab):
         return df, total
 
     @st.cache_data
-    def get_anforanden(
-        _self,
-        search_words: List[str],
-        start_year: int,
-        end_year: int,
-        selections: dict,
-    ) -> pd.DataFrame:
+    def get_anforanden(_self, query: SearchQuery) -> pd.DataFrame:
         return _self.api.get_anforanden_for_word_trends(
-            search_words,
-            filter_opts=selections,
-            start_year=start_year,
-            end_year=end_year,
+            list(query.terms),
+            filter_opts=query.selections_dict,
+            start_year=query.from_year,
+            end_year=query.to_year,
         )
 
     def normalize_word_per_year(self, data: pd.DataFrame) -> pd.DataFrame:
@@ -199,10 +191,12 @@ class WordTrendsDisplay(ExpandedSpeechDisplay, ToolTab):
                     label=ct.wt_hit_selector, options=search_terms, default=search_terms
                 )
                 data, total = self.get_data(
-                    self.get_selected_hits(),
-                    slider[0],
-                    slider[1],
-                    selections,
+                    SearchQuery.create(
+                        terms=self.get_selected_hits(),
+                        from_year=slider[0],
+                        to_year=slider[1],
+                        selections=selections,
+                    )
                 )
 
             with self.top_result_container:
@@ -261,12 +255,8 @@ class WordTrendsDisplay(ExpandedSpeechDisplay, ToolTab):
         hits = []
         if len(search_terms) > 0:
             for term in search_terms:
-                current_hits = self.api.get_word_hits(term, n_hits=10)
-                for hit in current_hits:
-                    hits.append(hit)
-                hits.extend(current_hits)
-        hits = list(set(hits))
-        return hits
+                hits.extend(self.api.get_word_hits(term, n_hits=10))
+        return list(dict.fromkeys(hits))
 
     def normalize(self, data, normalization_key):
         self.radio_normalize(normalization_key)
@@ -288,10 +278,12 @@ class WordTrendsDisplay(ExpandedSpeechDisplay, ToolTab):
 
             else:
                 kwic_like_data = self.get_anforanden(
-                    st.session_state[self.HIT_SELECTOR],
-                    self.search_display.get_slider()[0],
-                    self.search_display.get_slider()[1],
-                    self.search_display.get_selections(),
+                    SearchQuery.create(
+                        terms=st.session_state[self.HIT_SELECTOR],
+                        from_year=self.search_display.get_slider()[0],
+                        to_year=self.search_display.get_slider()[1],
+                        selections=self.search_display.get_selections(),
+                    )
                 )
                 self.add_anforande_display(kwic_like_data)
 
@@ -7,6 +7,7 @@ import click
 import streamlit as st
 
 from swedeb_demo.api.dummy_api import ADummyApi  # type: ignore
+from swedeb_demo.api.registry import get_api, registry
 from swedeb_demo.components import component_texts as ct
 from swedeb_demo.components.kwic_tab import KWICDisplay  # type: ignore
 from swedeb_demo.components.meta_data_display import MetaDataDisplay  # type: ignore
@@ -112,6 +113,11 @@ def add_tabs(meta_search: Any, api: ADummyApi, debug: bool) -> None:
         with tab_debug:
             st.caption("Session state:")
             st.write(st.session_state)
+            st.caption("Memory usage (bytes):")
+            st.write(registry.memory_usage())
+            if api.kwic_cache is not None:
+                st.caption("KWIC result cache:")
+                st.write(api.kwic_cache.stats)
             st.text_input("Protokollsök", key="speech_finder")
             st.button(
                 "visa protokoll",
@@ -129,7 +135,7 @@ def do_render(env_file: str, debug: bool, corpus_dir, corpus_name) -> None:
         dummy_api = st.session_state[API_SESSION_KEY]
     else:
         # with st.spinner('Laddar data...'):
-        dummy_api = ADummyApi(env_file, corpus_dir, corpus_name)
+        dummy_api = get_api(env_file, corpus_dir, corpus_name)
         st.session_state[API_SESSION_KEY] = dummy_api
     meta_search = add_meta_sidebar(dummy_api, sidebar_container)
     add_tabs(meta_search, dummy_api, debug)
@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+import pytest
+import scipy.sparse as sp
+from penelope.corpus import VectorizedCorpus
+
+
+@pytest.fixture
+def corpus() -> VectorizedCorpus:
+    """Six speeches (1960-1962) by four speakers, with a three word vocabulary"""
+    document_index = pd.DataFrame(
+        {
+            "document_id": range(6),
+            "document_name": [f"prot-1960--ak--01_{i:03d}" for i in range(1, 7)],
+            "filename": [f"prot-1960--ak--01_{i:03d}.csv" for i in range(1, 7)],
+            "year": [1960, 1960, 1961, 1961, 1961, 1962],
+            "who": ["Q1", "Q2", "Q1", "Q3", "unknown", "Q2"],
+            "gender_id": np.array([1, 2, 1, 1, 0, 2], dtype=np.int8),
+            "party_id": np.array([1, 3, 1, 5, 0, 3], dtype=np.int8),
+        }
+    )
+    dtm = sp.csr_matrix(
+        np.array([[1, 0, 2], [0, 0, 1], [3, 1, 0], [0, 0, 4], [1, 2, 1], [0, 5, 0]])
+    )
+    return VectorizedCorpus(
+        dtm, token2id={"a": 0, "b": 1, "c": 2}, document_index=document_index
+    )
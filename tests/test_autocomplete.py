@@ -0,0 +1,27 @@
+import pytest
+
+from swedeb_demo.api.parlaclarin.autocomplete import Autocompleter
+from swedeb_demo.api.parlaclarin.vocabulary import VocabularyIndex
+
+WORDS = ["skola", "skolan", "skolor", "sko", "skatt", "ko", "kor", "arbete"]
+FREQUENCIES = [50, 20, 20, 7, 30, 3, 1, 9]
+
+
+@pytest.fixture
+def autocompleter() -> Autocompleter:
+    return Autocompleter(VocabularyIndex(WORDS, FREQUENCIES), cached_length=2)
+
+
+@pytest.mark.parametrize("prefix", ["s", "sk", "sko", "skol", "k", "x"])
+def test_complete_equals_ranked_prefix_matches(autocompleter, prefix):
+    expected = sorted(
+        (w for w in WORDS if w.startswith(prefix)),
+        key=lambda w: (-FREQUENCIES[WORDS.index(w)], w),
+    )
+    assert autocompleter.complete(prefix, n=3) == expected[:3]
+
+
+def test_suggest_backs_off_to_longest_known_prefix(autocompleter):
+    assert autocompleter.suggest("skolna", n=2) == ["skola", "skolan"]
+    assert autocompleter.suggest("xyz") == []
+    assert autocompleter.complete("") == []
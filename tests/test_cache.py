@@ -0,0 +1,27 @@
+from swedeb_demo.api.cache import LRUCache
+
+
+def test_lru_cache_evicts_least_recently_used_item_by_size():
+    cache: LRUCache[str] = LRUCache(max_bytes=10, sizeof=len)
+
+    cache.put("a", "xxxx")
+    cache.put("b", "xxxx")
+    assert cache.get("a") == "xxxx"
+
+    cache.put("c", "xxxx")
+
+    assert "b" not in cache
+    assert "a" in cache and "c" in cache
+    assert cache.get("b") is None
+    assert cache.stats == dict(hits=1, misses=1, evictions=1, items=2, nbytes=8)
+
+
+def test_lru_cache_get_or_create_only_creates_once():
+    cache: LRUCache[int] = LRUCache(max_items=2)
+    calls: list[int] = []
+
+    for _ in range(3):
+        assert cache.get_or_create("key", lambda: calls.append(1) or 42) == 42
+
+    assert len(calls) == 1
+    assert cache.hits == 2
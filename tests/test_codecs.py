@@ -0,0 +1,67 @@
+import pandas as pd
+
+from swedeb_demo.api.westac.riksprot.parlaclarin.codecs import Codec, PersonCodecs
+
+
+def create_codecs() -> PersonCodecs:
+    person_codecs = PersonCodecs()
+    person_codecs.gender = pd.DataFrame(
+        {"gender": ["unknown", "man", "woman"]},
+        index=pd.Index([0, 1, 2], name="gender_id"),
+    )
+    person_codecs.party = pd.DataFrame(
+        {"party_abbrev": ["?", "S", "M", "C"]},
+        index=pd.Index([0, 1, 2, 3], name="party_id"),
+    )
+    person_codecs.office_type = pd.DataFrame(
+        {"office": ["unknown"]}, index=pd.Index([0], name="office_type_id")
+    )
+    person_codecs.sub_office_type = pd.DataFrame(
+        {"description": ["unknown"]}, index=pd.Index([0], name="sub_office_type_id")
+    )
+    person_codecs.persons_of_interest = pd.DataFrame(
+        {"pid": [0, 1], "name": ["Anna", "Bertil"]},
+        index=pd.Index(["Q1", "Q2"], name="person_id"),
+    )
+    return person_codecs
+
+
+def test_decode_is_equivalent_to_dict_lookup():
+    person_codecs = create_codecs()
+    df = pd.DataFrame(
+        {
+            "person_id": ["Q2", "Q1", "Q9", "Q2"],
+            "gender_id": [2, 1, 1, 7],
+            "party_id": [3, 1, 1, -1],
+        }
+    )
+
+    decoded = person_codecs.decode(df.copy(), drop=False)
+
+    for column, (from_column, fx) in {
+        "name": ("person_id", person_codecs.person_id2name.get),
+        "gender": ("gender_id", person_codecs.gender2name.get),
+        "party_abbrev": ("party_id", person_codecs.party_abbrev2name.get),
+    }.items():
+        assert isinstance(decoded[column].dtype, pd.CategoricalDtype)
+        expected = df[from_column].apply(fx)
+        assert decoded[column].astype(object).where(
+            decoded[column].notna(), None
+        ).tolist() == (expected.tolist())
+
+    assert decoded["gender"].cat.categories.tolist() == ["man", "woman"]
+
+
+def test_decode_fills_in_default_and_falls_back_to_apply():
+    person_codecs = create_codecs()
+    person_codecs.extra_codecs = [
+        Codec("decode", "chamber_id", "chamber", {1: "ak", 2: "fk"}.get, default="?"),
+        Codec("decode", "year", "decade", lambda x: x - x % 10),
+    ]
+    df = pd.DataFrame({"chamber_id": [1, 3, 2], "year": [1961, 1975, 1980]})
+
+    decoded = person_codecs.decode(df, drop=True)
+
+    assert decoded["chamber"].tolist() == ["ak", "?", "fk"]
+    assert decoded["decade"].tolist() == [1960, 1970, 1980]
+    assert "chamber_id" not in decoded.columns
@@ -0,0 +1,36 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from swedeb_demo.api.westac.riksprot.parlaclarin.codecs import PersonCodecs
+from swedeb_demo.api.westac.riksprot.parlaclarin.codecs_snapshot import (
+    is_valid_snapshot,
+    snapshot_folder,
+    store_snapshot,
+)
+from tests.test_codecs import create_codecs
+
+
+def test_snapshot_roundtrip_is_used_while_database_is_unchanged(tmp_path):
+    source: str = str(tmp_path / "metadata.db")
+    with open(source, "wb") as fp:
+        fp.write(b"not a database, must not be opened")
+
+    person_codecs = create_codecs()
+    person_codecs.persons_of_interest["gender_id"] = np.array([1, 2], dtype=np.int8)
+    person_codecs.persons_of_interest.loc["Q2", "name"] = None
+    tables = {name: getattr(person_codecs, name) for name in person_codecs.tablenames()}
+    store_snapshot(tables, snapshot_folder(source), source=source)
+
+    loaded = PersonCodecs().load(source=source)
+
+    for name, table in tables.items():
+        pd.testing.assert_frame_equal(getattr(loaded, name), table)
+    assert isinstance(loaded.persons_of_interest["gender_id"].values, np.memmap)
+    assert loaded.person_id2name == {"Q1": "Anna", "Q2": None}
+
+    with open(source, "ab") as fp:
+        fp.write(b"changed")
+    assert not is_valid_snapshot(snapshot_folder(source), source, list(tables))
+    assert os.path.isdir(snapshot_folder(source))
@@ -0,0 +1,35 @@
+from swedeb_demo.api.parlaclarin.corpus_filter import CorpusFilter
+
+
+def test_mask_combines_all_selections(corpus):
+    corpus_filter = CorpusFilter(corpus)
+
+    mask = corpus_filter.mask({"gender_id": [1, 2], "party_id": [1, 3]})
+    assert mask.tolist() == [True, True, True, False, False, True]
+
+    mask = corpus_filter.mask({"who": ["Q2", "Q9"], "gender_id": [2]})
+    assert mask.tolist() == [False, True, False, False, False, True]
+
+    assert corpus_filter.mask({}).all()
+    assert corpus_filter.mask(None).all()
+
+
+def test_filter_is_equivalent_to_row_wise_filter(corpus):
+    selections = {"gender_id": [1], "who": ["Q1", "Q3"]}
+
+    expected = corpus
+    for key, values in selections.items():
+        expected = expected.filter(lambda row: row[key] in values)
+
+    filtered = CorpusFilter(corpus).filter(selections)
+
+    assert (filtered.data != expected.data).nnz == 0
+    assert filtered.document_index.document_name.tolist() == (
+        expected.document_index.document_name.tolist()
+    )
+    assert filtered.document_index.document_id.tolist() == [0, 1, 2]
+
+
+def test_filter_without_selections_returns_same_corpus(corpus):
+    assert CorpusFilter(corpus).filter({}) is corpus
+    assert CorpusFilter(corpus).filter({"year": [1960, 1961, 1962]}) is corpus
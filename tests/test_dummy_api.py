@@ -0,0 +1,124 @@
+import types
+
+import pandas as pd
+import pytest
+from loguru import logger
+
+pytest.importorskip("ccc")
+
+from swedeb_demo.api.dummy_api import ADummyApi  # noqa: E402
+from swedeb_demo.api.parlaclarin.kwic_result import KwicResult  # noqa: E402
+
+
+@pytest.fixture
+def api() -> ADummyApi:
+    """API without corpus data (only for methods that don't use the corpus)"""
+    return ADummyApi.__new__(ADummyApi)
+
+
+@pytest.fixture
+def sharded_api(api: ADummyApi) -> ADummyApi:
+    """API over a corpus of years 1921-1955, with a recording stub of the KWIC query"""
+    api.corpus = types.SimpleNamespace(
+        document_index=pd.DataFrame({"year": [1921, 1930, 1948, 1955]})
+    )
+    api.kwic_shard_years = 10
+    api.kwic_max_workers = 4
+    api.queried_years = []
+
+    def query_kwic_corpus(search_hits, from_year, to_year, *args):
+        api.queried_years.append((from_year, to_year))
+        return (from_year, to_year)
+
+    api.query_kwic_corpus = query_kwic_corpus
+    return api
+
+
+def test_get_links_handles_missing_person_ids(api: ADummyApi):
+    person_ids = pd.Series(["Q1", None, "Q2", "Q1", None], index=[5, 6, 7, 8, 9])
+    names = pd.Series(["A", "", "B", "A", ""], index=person_ids.index)
+
+    links = api.get_links(person_ids, names)
+
+    assert links.index.tolist() == [5, 6, 7, 8, 9]
+    assert links.tolist() == [
+        "[A](https://www.wikidata.org/wiki/Q1)",
+        "Okänd",
+        "[B](https://www.wikidata.org/wiki/Q2)",
+        "[A](https://www.wikidata.org/wiki/Q1)",
+        "Okänd",
+    ]
+
+
+@pytest.mark.parametrize(
+    "from_year, to_year, expected",
+    [
+        (1930, 1949, [(1930, 1939), (1940, 1949)]),
+        (1925, 1944, [(1925, 1929), (1930, 1939), (1940, 1944)]),
+        (1935, 1937, [(1935, 1937)]),
+        (1900, 1935, [(1921, 1929), (1930, 1935)]),
+        (1950, 2020, [(1950, 1955)]),
+        (1800, 1850, [(1800, 1850)]),
+        (1960, 1970, [(1960, 1970)]),
+        (1940, 1930, [(1940, 1930)]),
+    ],
+)
+def test_get_year_shards(sharded_api: ADummyApi, from_year, to_year, expected):
+    assert sharded_api.get_year_shards(from_year, to_year) == expected
+
+
+def test_get_year_shards_without_sharding(sharded_api: ADummyApi):
+    sharded_api.kwic_shard_years = 0
+
+    assert sharded_api.get_year_shards(1900, 1949) == [(1921, 1949)]
+
+
+def test_query_kwic_shards_queries_shards_in_year_order(sharded_api: ADummyApi):
+    sharded_api.kwic_s_attributes = {"speech_date", "speech_who"}
+
+    subcorpora = sharded_api.query_kwic_shards(["skola"], 1925, 1944, {}, 2, 2, False)
+
+    assert subcorpora == [(1925, 1929), (1930, 1939), (1940, 1944)]
+
+
+def test_query_kwic_shards_runs_single_query_without_year_attributes(
+    sharded_api: ADummyApi,
+):
+    sharded_api.kwic_s_attributes = {"speech_who"}
+
+    subcorpora = sharded_api.query_kwic_shards(["skola"], 1925, 1944, {}, 2, 2, False)
+
+    assert subcorpora == [(1925, 1944)]
+    assert sharded_api.queried_years == [(1925, 1944)]
+
+
+def test_kwic_results_use_result_cache_without_sharding(api: ADummyApi):
+    data = pd.DataFrame({"Sökord": ["skola"]})
+    api.kwic_shard_years = 0
+    api.kwic_cache = object()
+    api.get_paged_kwic_results = lambda *args: KwicResult.from_frame(data)
+
+    results = api.get_kwic_results_for_search_hits(
+        ["skola"], 1960, 1961, {}, 2, 2, True
+    )
+
+    pd.testing.assert_frame_equal(results, data)
+
+
+def test_timed_logs_failed_load_as_failure():
+    messages = []
+    handler_id = logger.add(messages.append, format="{level} {message}")
+
+    def fail():
+        raise ValueError("no corpus")
+
+    try:
+        assert ADummyApi.timed("corpus", lambda x: x + 1, 1) == 2
+        with pytest.raises(ValueError):
+            ADummyApi.timed("metadata", fail)
+    finally:
+        logger.remove(handler_id)
+
+    assert messages[0].startswith("INFO ADummyApi: corpus loaded in")
+    assert messages[1].startswith("ERROR ADummyApi: loading metadata failed after")
+    assert len(messages) == 2
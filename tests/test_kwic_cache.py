@@ -0,0 +1,26 @@
+import pandas as pd
+
+from swedeb_demo.api.parlaclarin.kwic_cache import KwicResultCache
+
+
+def test_cached_result_roundtrip_and_eviction(tmp_path):
+    cache = KwicResultCache(str(tmp_path / "kwic"))
+    data = pd.DataFrame(
+        {
+            "Sökord": ["a", "b", None],
+            "Parti": pd.Categorical(["S", "M", "S"]),
+            "År": [1960, 1961, 1962],
+        }
+    )
+    key = KwicResultCache.key(query='[lemma="a"]', years=[1960, 1962])
+
+    assert cache.get(key) is None
+    cache.put(key, data)
+
+    pd.testing.assert_frame_equal(cache.get(key), data)
+    assert key != KwicResultCache.key(query='[lemma="a"]', years=[1960, 1961])
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 1
+
+    cache.max_bytes = 0
+    cache.put(KwicResultCache.key(query="b"), data)
+    assert cache.stats["evictions"] == 2 and cache.get(key) is None
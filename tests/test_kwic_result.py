@@ -0,0 +1,25 @@
+import pandas as pd
+
+from swedeb_demo.api.parlaclarin.kwic_result import KwicResult
+
+
+def test_kwic_result_fetches_pages_lazily():
+    data = pd.DataFrame({"Sökord": [f"w{i}" for i in range(25)], "År": range(25)})
+    calls = []
+
+    def fetch(start: int, stop: int) -> pd.DataFrame:
+        calls.append((start, stop))
+        return data.iloc[start:stop]
+
+    result = KwicResult(n_hits=len(data), fetch=fetch)
+
+    assert len(result) == 25 and not result.empty
+    assert result.rows(20, 30)["År"].tolist() == list(range(20, 25))
+    assert result.rows(20, 30)["År"].tolist() == list(range(20, 25))
+    assert calls == [(20, 25)]
+    assert not result.is_materialized
+
+    ordered = result.sort_values("År", ascending=False)
+    assert ordered.rows(0, 3)["År"].tolist() == [24, 23, 22]
+    assert result.sort_values("År", ascending=False) is ordered
+    assert result.is_materialized and calls == [(20, 25), (0, 25)]
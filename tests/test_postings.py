@@ -0,0 +1,39 @@
+import numpy as np
+
+from swedeb_demo.api.parlaclarin.postings import PostingsIndex
+
+
+def test_documents_are_sorted_postings_of_word(corpus):
+    postings = PostingsIndex.compute(corpus)
+
+    assert postings.documents("a").tolist() == [0, 2, 4]
+    assert postings.documents("c").tolist() == [0, 1, 3, 4]
+    assert postings.documents("nope").tolist() == []
+    assert postings.document_frequency("b") == 3
+
+
+def test_union_and_intersection(corpus):
+    postings = PostingsIndex.compute(corpus)
+
+    assert postings.union(["a", "b"]).tolist() == [0, 2, 4, 5]
+    assert postings.union(["b", "c"]).tolist() == [0, 1, 2, 3, 4, 5]
+    assert postings.intersection(["a", "c"]).tolist() == [0, 4]
+    assert postings.intersection(["a", "nope"]).tolist() == []
+    assert postings.intersection([]).tolist() == []
+
+
+def test_stored_postings_is_valid_only_for_unchanged_corpus(corpus, tmp_path):
+    corpus.dump(tag="dummy", folder=str(tmp_path))
+    PostingsIndex.build(folder=str(tmp_path), tag="dummy", corpus=corpus)
+
+    postings = PostingsIndex.load_if_valid(
+        folder=str(tmp_path), tag="dummy", corpus=corpus
+    )
+    assert postings is not None
+    assert isinstance(postings.document_ids, np.memmap)
+    assert postings.documents("c").tolist() == [0, 1, 3, 4]
+
+    assert (
+        PostingsIndex.load_if_valid(folder=str(tmp_path), tag="other", corpus=corpus)
+        is None
+    )
@@ -0,0 +1,105 @@
+import threading
+import time
+import types
+
+import numpy as np
+import pandas as pd
+import pytest
+import scipy.sparse as sp
+
+pytest.importorskip("ccc")
+
+from penelope.corpus import VectorizedCorpus  # noqa: E402
+
+from swedeb_demo.api.registry import (  # noqa: E402
+    ApiRegistry,
+    corpus_nbytes,
+    resident_memory,
+)
+
+
+def create_corpus() -> VectorizedCorpus:
+    document_index = pd.DataFrame(
+        {
+            "document_id": range(3),
+            "document_name": ["d_1", "d_2", "d_3"],
+            "filename": ["d_1.csv", "d_2.csv", "d_3.csv"],
+            "year": [1960, 1961, 1962],
+        }
+    )
+    return VectorizedCorpus(
+        sp.csr_matrix(np.arange(6).reshape(3, 2)),
+        token2id={"a": 0, "b": 1},
+        document_index=document_index,
+    )
+
+
+class CountingFactory:
+    """Creates fake APIs (slowly), the first `n_failures` calls raise"""
+
+    def __init__(self, n_failures: int = 0, delay: float = 0.05):
+        self.n_failures: int = n_failures
+        self.delay: float = delay
+        self.calls: list[tuple[str, str, str]] = []
+        self.lock: threading.Lock = threading.Lock()
+
+    def __call__(self, env_file: str, corpus_dir: str, corpus_name: str):
+        with self.lock:
+            self.calls.append((env_file, corpus_dir, corpus_name))
+            n_calls: int = len(self.calls)
+        time.sleep(self.delay)
+        if n_calls <= self.n_failures:
+            raise RuntimeError(f"load {n_calls} failed")
+        return types.SimpleNamespace(corpus=create_corpus(), n_calls=n_calls)
+
+
+def test_concurrent_gets_for_same_key_create_api_once():
+    factory = CountingFactory()
+    registry = ApiRegistry(factory=factory)
+    start = threading.Barrier(8)
+    apis: list = []
+
+    def get():
+        start.wait()
+        apis.append(registry.get(".env", "registry", "CORPUS"))
+
+    threads = [threading.Thread(target=get) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(factory.calls) == 1
+    assert len(apis) == 8 and all(api is apis[0] for api in apis)
+    assert registry.get(".env", "registry", "OTHER") is not apis[0]
+    assert len(factory.calls) == 2
+
+
+def test_failed_load_is_retried_on_next_get():
+    factory = CountingFactory(n_failures=1, delay=0)
+    registry = ApiRegistry(factory=factory)
+
+    with pytest.raises(RuntimeError, match="load 1 failed"):
+        registry.get(".env", "registry", "CORPUS")
+    assert registry.memory_usage()["apis"] == {}
+
+    api = registry.get(".env", "registry", "CORPUS")
+
+    assert api.n_calls == 2
+    assert registry.get(".env", "registry", "CORPUS") is api
+    assert len(factory.calls) == 2
+
+
+def test_memory_usage_reports_process_and_corpus_sizes():
+    registry = ApiRegistry(factory=CountingFactory(delay=0))
+    registry.get(".env", "registry", "CORPUS")
+    corpus = create_corpus()
+
+    usage = registry.memory_usage()
+
+    assert 0 < resident_memory() < 1024**4
+    assert usage["rss"] > 0
+    assert list(usage["apis"].values()) == [corpus_nbytes(corpus)]
+    assert corpus_nbytes(corpus) >= corpus.bag_term_matrix.data.nbytes + len(
+        corpus.document_index
+    )
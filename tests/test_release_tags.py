@@ -0,0 +1,53 @@
+import json
+import threading
+import time
+
+from swedeb_demo.api.westac.riksprot.parlaclarin.release_tags import ReleaseTagCache
+
+
+def test_release_tags_are_resolved_from_cache_file(tmp_path):
+    filename = str(tmp_path / "releases.json")
+    with open(filename, "w", encoding="utf-8") as fp:
+        json.dump({"fetched_at": int(time.time()), "tags": ["v0.9.0", "v0.8.0"]}, fp)
+
+    def fetcher():
+        raise AssertionError("should not be called")
+
+    cache = ReleaseTagCache(filename=filename, fetcher=fetcher)
+
+    assert cache.tags == ["main", "dev", "v0.9.0", "v0.8.0"]
+    assert cache.refresh_thread is None
+
+
+def test_stale_cache_is_refreshed_in_background(tmp_path):
+    filename = str(tmp_path / "releases.json")
+    fetch_allowed = threading.Event()
+
+    def fetcher():
+        fetch_allowed.wait()
+        return ["v1.0.0"]
+
+    cache = ReleaseTagCache(filename=filename, fetcher=fetcher)
+
+    assert cache.tags == ["main", "dev"]
+
+    fetch_allowed.set()
+    cache.refresh_thread.join()
+    assert cache.tags == ["main", "dev", "v1.0.0"]
+    assert ReleaseTagCache(filename=filename).load()["tags"] == ["v1.0.0"]
+
+
+def test_failed_refresh_keeps_cached_tags(tmp_path):
+    filename = str(tmp_path / "releases.json")
+    with open(filename, "w", encoding="utf-8") as fp:
+        json.dump({"fetched_at": 0, "tags": ["v0.9.0"]}, fp)
+
+    def fetcher():
+        raise ConnectionError("offline")
+
+    cache = ReleaseTagCache(
+        filename=filename, fetcher=fetcher, background_refresh=False
+    )
+
+    assert cache.refresh() == ["v0.9.0"]
+    assert not cache.is_stale
@@ -0,0 +1,31 @@
+import numpy as np
+
+from swedeb_demo.api.parlaclarin.search_query import SearchQuery
+
+
+def test_equivalent_queries_are_equal_and_not_mutated():
+    selections = {"party_id": [3, 1, 3], "gender_id": [np.int64(2)]}
+    query = SearchQuery.create(
+        terms=[" Information", "om"],
+        from_year=1960,
+        to_year=1970,
+        selections=selections,
+    )
+    other = SearchQuery.create(
+        terms=["information", "om"],
+        from_year=np.int64(1960),
+        to_year=1970,
+        selections={"gender_id": [2], "party_id": [1, 3]},
+    )
+
+    assert query == other and hash(query) == hash(other)
+    assert query.terms == ("information", "om")
+    assert list(query.selections_dict) == ["gender_id", "party_id"]
+    assert query.selections_dict == {"gender_id": [2], "party_id": [1, 3]}
+
+    query.selections_dict["party_id"].append(9)
+    assert query.selections_dict["party_id"] == [1, 3]
+    assert selections == {"party_id": [3, 1, 3], "gender_id": [2]}
+    assert query != SearchQuery.create(
+        terms=["om", "information"], selections=selections
+    )
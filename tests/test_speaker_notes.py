@@ -0,0 +1,34 @@
+import sqlite3
+
+from swedeb_demo.api.westac.riksprot.parlaclarin.speaker_notes import (
+    SpeakerNoteService,
+)
+
+
+def test_speaker_notes_are_queried_by_id_and_cached(tmp_path):
+    filename = str(tmp_path / "metadata.db")
+    with sqlite3.connect(filename) as db:
+        db.execute(
+            "create table speaker_notes (speaker_note_id text, speaker_note text)"
+        )
+        db.executemany(
+            "insert into speaker_notes values (?, ?)",
+            [(f"i-{i}", f"note {i}") for i in range(10)],
+        )
+
+    service = SpeakerNoteService(filename, cache_size=5, chunk_size=3)
+
+    assert service.get("i-1") == "note 1"
+    assert service.get("i-99", "not found") == "not found"
+    assert service.get_many(["i-2", "i-1", "i-7", "i-99", "i-2"]) == {
+        "i-2": "note 2",
+        "i-1": "note 1",
+        "i-7": "note 7",
+        "i-99": None,
+    }
+    assert service.notes.hits == 2
+
+    service.close()
+    assert service.get("i-3") == "note 3"
+
+    assert SpeakerNoteService(str(tmp_path / "missing.db")).get("i-1") is None
@@ -0,0 +1,94 @@
+import pandas as pd
+
+from swedeb_demo.api.parlaclarin.trends_cube import corpus_fingerprint
+from swedeb_demo.api.westac.riksprot.parlaclarin.speech_store import (
+    PackedLoader,
+    create_loader,
+    pack_speeches,
+)
+from swedeb_demo.api.westac.riksprot.parlaclarin.speech_text import Loader, ZipLoader
+
+
+class DictLoader(Loader):
+    def __init__(self, protocols: dict):
+        self.protocols: dict = protocols
+
+    def load(self, protocol_name: str) -> tuple[dict, list[dict]]:
+        if protocol_name not in self.protocols:
+            raise FileNotFoundError(protocol_name)
+        return self.protocols[protocol_name]
+
+
+PROTOCOLS = {
+    "prot-1960--ak--01": (
+        {"name": "prot-1960--ak--01", "date": "1960-01-11"},
+        [{"u_id": f"u{i}", "paragraphs": [f"text {i}"]} for i in range(5)],
+    ),
+    "prot-1961--fk--02": (
+        {"name": "prot-1961--fk--02", "date": "1961-02-01"},
+        [{"u_id": "u9", "paragraphs": ["last"]}],
+    ),
+}
+
+
+def create_document_index() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "document_id": [0, 1, 2, 3],
+            "document_name": [
+                "prot-1960--ak--01_001",
+                "prot-1960--ak--01_002",
+                "prot-1961--fk--02_001",
+                "prot-1962--ak--03_001",
+            ],
+            "n_utterances": [2, 3, 1, 1],
+        }
+    )
+
+
+def test_packed_loader_returns_same_protocols_and_speeches(tmp_path):
+    protocols = PROTOCOLS
+    document_index = create_document_index()
+    filename = str(tmp_path / "speeches.bin")
+
+    pack_speeches(
+        source=DictLoader(protocols),
+        document_index=document_index,
+        target_filename=filename,
+    )
+    loader = create_loader(filename)
+
+    assert isinstance(loader, PackedLoader)
+    for protocol_name, data in protocols.items():
+        assert loader.load(protocol_name) == data
+
+    metadata, utterances = loader.load_speech(1)
+    assert metadata["name"] == "prot-1960--ak--01"
+    assert [u["u_id"] for u in utterances] == ["u2", "u3", "u4"]
+
+    assert loader.load_speech(3) is None
+    assert loader.load_speech(99) is None
+
+
+def test_stale_packed_store_is_not_used(tmp_path):
+    folder, tag = str(tmp_path), "test"
+    (tmp_path / f"{tag}_vector_data.npz").write_bytes(b"dtm")
+    document_index = create_document_index()
+    filename = str(tmp_path / "speeches.bin")
+    pack_speeches(
+        source=DictLoader(PROTOCOLS),
+        document_index=document_index,
+        target_filename=filename,
+        metadata={"tag": tag, "fingerprint": corpus_fingerprint(folder, tag)},
+    )
+
+    def create(n_documents: int = len(document_index)) -> Loader:
+        return create_loader(filename, folder=folder, tag=tag, n_documents=n_documents)
+
+    assert isinstance(create(), PackedLoader)
+    assert isinstance(create(n_documents=5), ZipLoader)
+    assert isinstance(create_loader(filename, folder=folder, tag="other"), ZipLoader)
+
+    (tmp_path / f"{tag}_vector_data.npz").write_bytes(b"rebuilt dtm")
+
+    assert isinstance(create(), ZipLoader)
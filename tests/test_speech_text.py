@@ -0,0 +1,225 @@
+import io
+import sqlite3
+import types
+import zipfile
+
+import pandas as pd
+import pytest
+
+from swedeb_demo.api.westac.riksprot.parlaclarin.speech_text import (
+    SPEAKER_NOTE_NOT_FOUND,
+    Loader,
+    SpeechTextRepository,
+    SpeechTextService,
+)
+from swedeb_demo.api.westac.riksprot.parlaclarin.utility import (
+    get_protocol_names,
+    split_speech_name,
+    to_protocol_names,
+)
+
+
+def test_protocol_speech_index_finds_speeches_and_utterance_ranges():
+    document_index = pd.DataFrame(
+        {
+            "document_name": ["p-2_001", "p-1_001", "p-2_002", "p-1_002", "p-2_003"],
+            "u_id": ["a", "b", "c", "d", "e"],
+            "speech_index": [1, 1, 2, 2, 3],
+            "speaker_note_id": ["n1", "n2", "n3", "n4", "n5"],
+            "n_utterances": [2, 1, 3, 4, 1],
+        }
+    )
+    index = SpeechTextService(document_index).name2info
+
+    assert len(index) == 2 and "p-1" in index and "p-3" not in index
+    assert [x["u_id"] for x in index.get("p-2")] == ["a", "c", "e"]
+    assert index.get("p-3") is None
+    assert [index.utterance_range("p-2", n) for n in range(3)] == [
+        (0, 2),
+        (2, 5),
+        (5, 6),
+    ]
+    assert index.utterance_range("p-1", 1) == (1, 5)
+    with pytest.raises(IndexError):
+        index.utterance_range("p-1", 2)
+
+
+def test_protocol_speech_index_handles_unknown_and_single_speech_protocols():
+    document_index = pd.DataFrame(
+        {
+            "document_name": ["p-2_001", "p-4_001", "p-2_002"],
+            "u_id": ["a", "b", "c"],
+            "speech_index": [1, 1, 2],
+            "speaker_note_id": ["n1", "n2", "n3"],
+            "n_utterances": [2, 3, 1],
+        }
+    )
+    index = SpeechTextService(document_index).name2info
+
+    for protocol_name in ["p-1", "p-3", "p-5", ""]:
+        assert index.find(protocol_name) is None
+        with pytest.raises(IndexError):
+            index.utterance_range(protocol_name, 0)
+
+    assert index.find("p-4") == slice(2, 3)
+    assert index.utterance_range("p-4", 0) == (0, 3)
+    for n in [-1, 1]:
+        with pytest.raises(IndexError):
+            index.utterance_range("p-4", n)
+
+
+def test_protocol_names_are_parsed_from_speech_names():
+    names = ["prot-1960--ak--01_003", "prot-1933--fk--02_010", "prot-1960--ak--01_001"]
+
+    protocol_names = to_protocol_names(names)
+
+    assert protocol_names.tolist() == [
+        "prot-1960--ak--01",
+        "prot-1933--fk--02",
+        "prot-1960--ak--01",
+    ]
+    assert protocol_names.categories.tolist() == [
+        "prot-1933--fk--02",
+        "prot-1960--ak--01",
+    ]
+    assert split_speech_name(names[1]) == ("prot-1933--fk--02", 10)
+    assert to_protocol_names(pd.Series(["p-1_1_2", "p-2", "ö_1"])).tolist() == [
+        "p-1",
+        "p-2",
+        "ö",
+    ]
+    assert len(to_protocol_names([])) == 0
+
+
+def test_protocol_names_are_read_from_document_index_column():
+    document_index = pd.DataFrame(
+        {"document_name": ["p-1_001"], "protocol_name": pd.Categorical(["p-9"])}
+    )
+
+    assert get_protocol_names(document_index).tolist() == ["p-9"]
+    assert get_protocol_names(document_index[["document_name"]]).tolist() == ["p-1"]
+
+
+def test_speech_text_service_does_not_modify_document_index():
+    document_index = pd.DataFrame(
+        {
+            "document_name": ["p-1_001", "p-1_002"],
+            "u_id": ["a", "b"],
+            "speach_index": [1, 2],
+            "speaker_hash": ["n1", "n2"],
+            "n_utterances": [1, 1],
+        }
+    )
+    columns = document_index.columns.tolist()
+
+    service = SpeechTextService(document_index)
+
+    assert document_index.columns.tolist() == columns
+    assert service.id_name == "speaker_hash"
+    assert [x["speech_index"] for x in service.name2info.get("p-1")] == [1, 2]
+
+
+class CountingLoader(Loader):
+    """Protocols with one single-paragraph utterance per speech (`<protocol> <n>`)"""
+
+    def __init__(self, n_speeches: dict[str, int]):
+        self.n_speeches: dict[str, int] = n_speeches
+        self.loaded: list[str] = []
+
+    def load(self, protocol_name: str) -> tuple[dict, list[dict]]:
+        self.loaded.append(protocol_name)
+        utterances: list[dict] = [
+            {
+                "u_id": f"{protocol_name}-{n}",
+                "who": "Q1",
+                "speaker_note_id": "missing",
+                "paragraphs": [f"{protocol_name} {n}"],
+                "num_tokens": 2,
+                "num_words": 2,
+                "page_number": "1",
+            }
+            for n in range(1, self.n_speeches[protocol_name] + 1)
+        ]
+        return {"name": protocol_name, "date": "1960-01-01"}, utterances
+
+
+def create_repository(
+    loader: Loader, source_filename: str = None
+) -> SpeechTextRepository:
+    names: list[str] = [
+        f"{protocol_name}_{n:03}"
+        for protocol_name, n_speeches in loader.n_speeches.items()
+        for n in range(1, n_speeches + 1)
+    ]
+    document_index = pd.DataFrame(
+        {
+            "document_name": names,
+            "u_id": [name.replace("_", "-") for name in names],
+            "speech_index": [int(name[-3:]) for name in names],
+            "speaker_note_id": [f"i-{name}" for name in names],
+            "n_utterances": 1,
+            "who": "Q1",
+            "office_type_id": 1,
+            "sub_office_type_id": 1,
+            "gender_id": 1,
+            "party_id": 1,
+        },
+        index=pd.Index(range(len(names)), name="document_id"),
+    )
+    person_codecs = types.SimpleNamespace(
+        person=pd.DataFrame({"name": ["Kalle"]}, index=["Q1"]),
+        source_filename=source_filename,
+        office_type2name={},
+        sub_office_type2name={},
+        gender2name={},
+        party_abbrev2name={},
+    )
+    return SpeechTextRepository(
+        source=loader, person_codecs=person_codecs, document_index=document_index
+    )
+
+
+def test_speeches_by_name_loads_each_protocol_once_and_keeps_protocol_order():
+    loader = CountingLoader({"p-1": 3, "p-2": 2, "p-3": 1})
+    repository = create_repository(loader)
+    names = ["p-2_002", "p-1_003", "p-2_001", "p-1_001"]
+
+    speeches = list(repository.speeches_by_name(names, mode="text", max_workers=2))
+
+    assert sorted(loader.loaded) == ["p-1", "p-2"]
+    assert speeches == [
+        ("p-2_002", "p-2 2"),
+        ("p-2_001", "p-2 1"),
+        ("p-1_003", "p-1 3"),
+        ("p-1_001", "p-1 1"),
+    ]
+
+
+def test_write_speeches_writes_a_text_file_per_speech():
+    repository = create_repository(CountingLoader({"p-1": 2, "p-2": 1}))
+    target = io.BytesIO()
+
+    n_speeches = repository.write_speeches(["p-2_001", "p-1_002", "p-1_001"], target)
+
+    with zipfile.ZipFile(io.BytesIO(target.getvalue())) as fp:
+        assert fp.namelist() == ["p-2_001.txt", "p-1_002.txt", "p-1_001.txt"]
+        assert fp.read("p-1_002.txt").decode("utf-8") == "p-1 2"
+    assert n_speeches == 3
+
+
+def test_get_speaker_notes_returns_default_for_unknown_speeches(tmp_path):
+    filename = str(tmp_path / "metadata.db")
+    with sqlite3.connect(filename) as db:
+        db.execute(
+            "create table speaker_notes (speaker_note_id text, speaker_note text)"
+        )
+        db.execute("insert into speaker_notes values ('i-p-1_002', 'Herr talman')")
+    repository = create_repository(CountingLoader({"p-1": 2}), filename)
+
+    notes = repository.get_speaker_notes(["p-1_002", "p-9_001", "p-1_001"])
+
+    assert notes == {
+        "p-1_002": "Herr talman",
+        "p-9_001": SPEAKER_NOTE_NOT_FOUND,
+        "p-1_001": SPEAKER_NOTE_NOT_FOUND,
+    }
@@ -0,0 +1,47 @@
+from swedeb_demo.api.parlaclarin.trends_cube import TrendsCube
+
+
+def test_compute_aggregates_existing_cells(corpus):
+    trends_cube = TrendsCube.compute(corpus)
+
+    assert trends_cube.keys == ["year", "party_id", "gender_id"]
+    assert len(trends_cube.cells) == 6
+    assert trends_cube.cube.sum() == corpus.data.sum()
+
+
+def test_extract_equals_document_index_group_by(corpus):
+    trends_cube = TrendsCube.compute(corpus)
+
+    trends = trends_cube.extract(
+        token_ids=[2, 0],
+        words=["c", "a"],
+        filter_opts={"gender_id": [1, 2]},
+        pivot_keys=["gender_id"],
+    )
+
+    di = corpus.document_index.assign(
+        a=corpus.data[:, 0].toarray().ravel(), c=corpus.data[:, 2].toarray().ravel()
+    )
+    expected = (
+        di[di.gender_id.isin([1, 2])]
+        .groupby(["year", "gender_id"], as_index=False)[["c", "a"]]
+        .sum()
+    )
+    assert trends.values.tolist() == expected.values.tolist()
+    assert trends.columns.tolist() == ["year", "gender_id", "c", "a"]
+
+
+def test_stored_cube_is_valid_only_for_unchanged_corpus(corpus, tmp_path):
+    corpus.dump(tag="dummy", folder=str(tmp_path))
+    TrendsCube.build(folder=str(tmp_path), tag="dummy", corpus=corpus)
+
+    trends_cube = TrendsCube.load_if_valid(
+        folder=str(tmp_path), tag="dummy", corpus=corpus
+    )
+    assert trends_cube is not None
+    assert trends_cube.cube.shape == (6, 3)
+
+    assert (
+        TrendsCube.load_if_valid(folder=str(tmp_path), tag="other", corpus=corpus)
+        is None
+    )
@@ -0,0 +1,58 @@
+import fnmatch
+
+import numpy as np
+import pytest
+
+from swedeb_demo.api.parlaclarin.vocabulary import VocabularyIndex
+
+WORDS = [
+    "skola",
+    "skolan",
+    "förskola",
+    "skolor",
+    "sko",
+    "ko",
+    "kor",
+    "skolkurator",
+    "ö",
+    "?",
+]
+FREQUENCIES = [50, 20, 5, 20, 7, 3, 1, 2, 9, 4]
+
+
+@pytest.fixture
+def vocabulary() -> VocabularyIndex:
+    return VocabularyIndex(WORDS, FREQUENCIES)
+
+
+def test_exact_and_prefix_matches_are_ranked_by_frequency(vocabulary):
+    assert vocabulary.find("skola") == ["skola"]
+    assert vocabulary.find("skol") == []
+    assert vocabulary.find("skol*", n=3) == ["skola", "skolan", "skolor"]
+    assert vocabulary.find("ko*", n=10) == ["ko", "kor"]
+    assert "sko" in vocabulary and "skol" not in vocabulary
+
+
+@pytest.mark.parametrize(
+    "pattern", ["*skola", "*kol*", "*ol?r", "f*sk*", "s[kx]o*", "*o*", "*kurator"]
+)
+def test_wildcard_matches_equals_fnmatch(vocabulary, pattern):
+    expected = sorted(
+        fnmatch.filter(WORDS, pattern),
+        key=lambda w: (-FREQUENCIES[WORDS.index(w)], w),
+    )
+    assert vocabulary.find(pattern, n=100) == expected
+
+
+def test_only_star_patterns_are_expanded(vocabulary):
+    assert vocabulary.find("?", n=100) == ["?"]
+    assert vocabulary.find("sk?la") == []
+    assert vocabulary.find("s[kx]ola") == []
+    assert vocabulary.find("sk?la*", n=3) == ["skola", "skolan"]
+
+
+def test_regexp_and_create_from_token2id():
+    vocabulary = VocabularyIndex.create(
+        {"ab": 0, "abc": 1, "b": 2}, np.array([[1, 5, 3]])
+    )
+    assert vocabulary.find("|ab.*|") == ["abc", "ab"]
@@ -0,0 +1,47 @@
+import scipy.sparse as sp
+
+from swedeb_demo.api.parlaclarin.word_vectors import WordVectors
+
+
+def test_vectors_are_sparse_columns_in_word_order(corpus):
+    vectors = WordVectors(corpus).vectors(["c", "nope", "a"])
+
+    assert sp.issparse(vectors)
+    assert vectors.shape == (6, 3)
+    assert vectors.toarray().tolist() == [
+        [2, 0, 1],
+        [1, 0, 0],
+        [0, 0, 3],
+        [4, 0, 0],
+        [1, 0, 1],
+        [0, 0, 0],
+    ]
+
+
+def test_aggregate_equals_document_index_group_by(corpus):
+    word_vectors = WordVectors(corpus)
+    mask = corpus.document_index.year.values > 1960
+
+    counts = word_vectors.aggregate(["c", "a"], keys=["year", "party_id"], mask=mask)
+
+    assert counts.columns.tolist() == ["year", "party_id", "c", "a"]
+    assert counts.values.tolist() == [
+        [1961, 0, 1, 1],
+        [1961, 1, 0, 3],
+        [1961, 5, 4, 0],
+        [1962, 3, 0, 0],
+    ]
+
+
+def test_aggregate_reuses_cached_grouping_for_other_words(corpus):
+    word_vectors = WordVectors(corpus)
+    mask = corpus.document_index.year.values > 1960
+
+    counts = word_vectors.aggregate(["c"], keys=["year"], mask=mask, cache_key="y>1960")
+    other = word_vectors.aggregate(["a"], keys=["year"], mask=mask, cache_key="y>1960")
+    word_vectors.aggregate(["a"], keys=["year", "party_id"], cache_key="all")
+
+    assert counts.values.tolist() == [[1961, 5], [1962, 0]]
+    assert other.values.tolist() == [[1961, 4], [1962, 0]]
+    assert word_vectors.groupings.hits == 1 and word_vectors.groupings.misses == 2
+    assert word_vectors.groupings.nbytes > 0